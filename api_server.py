@@ -0,0 +1,42 @@
+"""Serve contract analysis, templates and compliance checks as a JSON HTTP API.
+
+    python api_server.py --port 8000 --workers 4
+
+Each worker process preloads its own models; GET /ready returns 200 once
+they are loaded. Point the Streamlit UI at it with ANALYSIS_SERVICE_URL.
+With more than one worker, /metrics sums every worker's metrics through
+files in METRICS_DIR (a fresh temporary directory unless set).
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=os.environ.get('SERVICE_HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('SERVICE_PORT', 8000)))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('SERVICE_WORKERS', 2)),
+                        help='server processes, each holding its own copy of the models')
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        # Read by utils.metrics when each worker process imports it
+        os.environ.setdefault('METRICS_DIR', tempfile.mkdtemp(prefix='legal-assistant-metrics-'))
+    if os.environ.get('METRICS_DIR'):
+        sys.path.append(SRC)
+        from utils.metrics import clear_directory
+        os.makedirs(os.environ['METRICS_DIR'], exist_ok=True)
+        clear_directory(os.environ['METRICS_DIR'])
+
+    import uvicorn
+    # An import string rather than an app object so uvicorn can start separate worker processes
+    uvicorn.run('core.service:create_default_app', factory=True, app_dir=SRC,
+                host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,11 +4,55 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from core.analyzer import ContractAnalyzer
+from core.batch import analyze_bytes
+from core.incremental import IncrementalAnalyzer
+from core.jobs import DONE, FAILED, JobQueue
 from core.templates import TemplateManager
+from utils.cache import AnalysisCache
 from utils.file_handler import FileHandler
+from utils.service_client import AnalysisServiceClient, ServiceError
 import pandas as pd
+import time
 from datetime import datetime
 
+@st.cache_resource
+def get_analyzer():
+    # Models come from the process-wide registry; the analyzer itself holds no
+    # per-upload state so one instance is shared by every session
+    return ContractAnalyzer()
+
+@st.cache_resource
+def get_analysis_cache():
+    return AnalysisCache.from_env()
+
+@st.cache_resource
+def get_service_client():
+    # With ANALYSIS_SERVICE_URL set the UI is a thin client of api_server.py;
+    # otherwise analysis runs in this process
+    url = os.environ.get('ANALYSIS_SERVICE_URL')
+    return AnalysisServiceClient(url) if url else None
+
+@st.cache_resource
+def get_job_queue():
+    # With ANALYSIS_JOBS=1 uploads become queued jobs run by job_worker.py and the page polls for them
+    return JobQueue.from_env() if os.environ.get('ANALYSIS_JOBS', '0') == '1' else None
+
+def analyze_upload(uploaded_file):
+    """Extract and analyze an upload, reusing any cached result for the same bytes"""
+    client = get_service_client()
+    if client:
+        return client.analyze(uploaded_file.getvalue(), uploaded_file.name, uploaded_file.type)
+    return analyze_bytes(get_analyzer(), uploaded_file.getvalue(), uploaded_file.type, get_analysis_cache())
+
+def analyze_revision(uploaded_file):
+    """Analyze an upload as the next version of the last one, redoing detection only on changed sentences"""
+    text = FileHandler().extract_bytes(uploaded_file.getvalue(), uploaded_file.type)
+    if not text:
+        return None
+    results, st.session_state.revision_snapshot = IncrementalAnalyzer(get_analyzer()).analyze(
+        text, st.session_state.get('revision_snapshot'))
+    return results
+
 def main():
     st.set_page_config(page_title="Legal Assistant", page_icon="⚖️", layout="wide")
     
@@ -20,6 +64,11 @@ def main():
         st.header("Templates")
         if st.button("📋 Templates"):
             st.session_state.show_templates = True
+        
+        if not get_service_client() and not get_job_queue():
+            st.header("Revisions")
+            st.checkbox("Compare with previous version", key='compare_revisions',
+                        help="Treat each upload as a revision of the last one and show which risks changed")
     
     # Main content
     if st.session_state.get('show_templates'):
@@ -40,14 +89,33 @@ def show_analyzer():
             help="Supported formats: PDF, DOCX, TXT (Max 200MB)"
         )
         
-        if uploaded_file:
-            analyzer = ContractAnalyzer()
-            file_handler = FileHandler()
-            
+        queue = get_job_queue()
+        if queue:
+            if uploaded_file and st.session_state.get('job_file') != uploaded_file.file_id:
+                st.session_state.job_file = uploaded_file.file_id
+                # Kept in the URL so a browser refresh picks the same job back up
+                st.query_params['job'] = queue.submit(uploaded_file.getvalue(), uploaded_file.type, uploaded_file.name)
+                st.session_state.pop('results', None)
+            if st.query_params.get('job'):
+                show_job_progress(queue, st.query_params['job'])
+        elif uploaded_file and st.session_state.get('compare_revisions'):
+            # Only a new upload counts as a revision; reruns keep showing the last comparison
+            if st.session_state.get('revision_file') != uploaded_file.file_id:
+                st.session_state.revision_file = uploaded_file.file_id
+                with st.spinner("🔍 Analyzing changes since the previous version..."):
+                    results = analyze_revision(uploaded_file)
+                if results:
+                    st.session_state.results = results
+                else:
+                    st.error("❌ Could not extract text from file. Please try another file.")
+        elif uploaded_file:
             with st.spinner("🔍 Analyzing your contract... Please wait"):
-                text = file_handler.extract_text(uploaded_file)
-                if text:
-                    results = analyzer.analyze_contract(text)
+                try:
+                    results = analyze_upload(uploaded_file)
+                except ServiceError as e:
+                    st.error(f"❌ {e}")
+                    return
+                if results:
                     st.session_state.results = results
                     st.success("✅ Analysis completed successfully!")
                 else:
@@ -59,7 +127,47 @@ def show_analyzer():
         st.header("📊 Analysis Results")
         display_results(st.session_state.results)
 
+def show_job_progress(queue, job_id):
+    job = queue.get(job_id)
+    if job is None:
+        st.error("❌ Analysis job not found. Please upload the file again.")
+        return
+    if job['status'] == DONE:
+        if 'results' not in st.session_state:
+            st.session_state.results = job['result']
+            st.success("✅ Analysis completed successfully!")
+        return
+    if job['status'] == FAILED:
+        st.error(f"❌ {job['error']}. Please try another file.")
+        return
+    
+    stage = (job['stage'] or 'waiting for a worker').replace('_', ' ')
+    st.progress(job['progress'], text=f"🔍 Analyzing {job['filename'] or 'contract'}... ({stage})")
+    time.sleep(1)
+    st.rerun()
+
+def show_revision_changes(revision):
+    sentences = revision['sentences']
+    score = revision['composite_risk_score']
+    with st.expander(f"🔄 Changes since previous version ({sentences['reanalyzed']} of {sentences['total']} sentences changed)", expanded=True):
+        if score['before'] != score['after']:
+            st.write(f"**Composite risk:** {score['before']} → {score['after']}")
+        risks = revision['risks']
+        for risk_type, data in risks['added'].items():
+            st.write(f"🆕 **{risk_type.replace('_', ' ').title()}** ({data['level']})")
+        for risk_type, data in risks['removed'].items():
+            st.write(f"✅ **{risk_type.replace('_', ' ').title()}** no longer present (was {data['level']})")
+        for risk_type, change in risks['changed'].items():
+            st.write(f"✏️ **{risk_type.replace('_', ' ').title()}**: {change['before']['level']} → {change['after']['level']}")
+        for clause_type, change in revision['clause_risk_scores'].items():
+            st.write(f"📄 **{clause_type.replace('_', ' ').title()} clauses**: {change['before'] or 'absent'} → {change['after'] or 'absent'}")
+        if not (risks['added'] or risks['removed'] or risks['changed'] or revision['clause_risk_scores']):
+            st.write("No change in identified risks.")
+
 def display_results(results):
+    if results.get('skipped_pages'):
+        st.warning(f"⚠️ Pages {', '.join(results['skipped_pages'])} could not be read and were left out of the analysis")
+    
     # Enhanced metrics
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -73,6 +181,9 @@ def display_results(results):
         similarity = results.get('template_similarity', {}).get('similarity_score', 0)
         st.markdown(f"**Template Match**<br><span style='font-size: 14px;'>{similarity}%</span>", unsafe_allow_html=True)
     
+    if results.get('revision'):
+        show_revision_changes(results['revision'])
+    
     # Enhanced tabs
     tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs([
         "📋 Summary", "📄 Clauses", "⚖️ Legal Analysis", 
@@ -253,14 +364,18 @@ def display_results(results):
 
 def show_templates():
     st.header("📋 Contract Templates")
-    template_mgr = TemplateManager()
+    client = get_service_client()
     
     template_type = st.selectbox(
         "Select Template",
         ["service_agreement", "employment", "vendor"]
     )
     
-    template = template_mgr.get_template(template_type)
+    try:
+        template = client.template(template_type) if client else TemplateManager().get_template(template_type)
+    except ServiceError as e:
+        st.error(f"❌ {e}")
+        return
     if template:
         st.markdown(f"## {template['title']}")
         for section, content in template['sections'].items():
@@ -0,0 +1,107 @@
+"""Compare DOCX extraction time and peak memory: python-docx object model vs
+the streaming iterparse extractor used by FileHandler.
+
+    python benchmarks/bench_docx.py --paragraphs 20000
+    python benchmarks/bench_docx.py --docx path/to/contract.docx
+"""
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from docx import Document
+from synthetic import make_docx
+from utils.docx_stream import iter_docx
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_contract.txt')
+
+
+def python_docx_text(data: bytes) -> int:
+    doc = Document(io.BytesIO(data))
+    return sum(len(paragraph.text) + 1 for paragraph in doc.paragraphs)
+
+
+def streaming_text(data: bytes) -> int:
+    # Consume as a streaming caller would, without holding the joined text
+    return sum(len(text) for text, _ in iter_docx(io.BytesIO(data)))
+
+
+EXTRACTORS = {'python-docx': python_docx_text, 'streaming': streaming_text}
+
+
+def proc_status_kb(field: str) -> int:
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+    return 0
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's high-water mark so import-time spikes are not counted (Linux only)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def run_child(name: str, path: str):
+    """Run one extractor in this fresh process and report its time and peak RSS.
+
+    A separate process per extractor keeps the measurement honest: lxml
+    allocations are invisible to tracemalloc and RSS never shrinks back.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    # Without /proc the peak also counts import-time allocations, so it is an upper bound
+    exact = reset_peak_rss()
+    baseline = proc_status_kb('VmRSS') if exact else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    chars = EXTRACTORS[name](data)
+    elapsed = time.perf_counter() - start
+    peak = (proc_status_kb('VmHWM') if exact else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss) - baseline
+    print(json.dumps({'chars': chars, 'seconds': elapsed, 'peak_kb': peak}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docx', help="benchmark this DOCX instead of a synthetic one")
+    parser.add_argument('--paragraphs', type=int, default=20000)
+    parser.add_argument('--child', choices=EXTRACTORS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return run_child(args.child, args.docx)
+
+    if args.docx:
+        with open(args.docx, 'rb') as f:
+            data = f.read()
+    else:
+        with open(SAMPLE, encoding='utf-8') as f:
+            lines = [line for line in f.read().splitlines() if line.strip()]
+        data = make_docx([lines[index % len(lines)] for index in range(args.paragraphs)])
+
+    with tempfile.NamedTemporaryFile(suffix='.docx', delete=False) as f:
+        f.write(data)
+    try:
+        print(f"DOCX: {len(data) / 1024:.0f} KB")
+        for name in EXTRACTORS:
+            output = subprocess.run([sys.executable, __file__, '--child', name, '--docx', f.name],
+                                    capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{name:12s} {result['seconds']:8.2f}s  peak RSS +{result['peak_kb'] / 1024:8.1f} MB  "
+                  f"{result['chars']:>12,} chars")
+    finally:
+        os.remove(f.name)
+
+
+if __name__ == '__main__':
+    main()
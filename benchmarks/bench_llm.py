@@ -0,0 +1,145 @@
+"""Compare SimpleLLM inference backends on CPU: eager fp32 against dynamic int8.
+
+Prompts are the ones ContractAnalyzer issues for the sample contract and the
+bundled templates. Each backend runs in its own process so RSS is not shared.
+
+    python benchmarks/bench_llm.py --backends eager int8 --threads 4
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+SAMPLE = os.path.join(ROOT, 'data', 'sample_contract.txt')
+TEMPLATES = os.path.join(ROOT, 'templates')
+
+
+def proc_status_kb(field: str) -> int:
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+    return 0
+
+
+def analyzer_prompts():
+    """(prompt, max_length) pairs ContractAnalyzer would send for the bundled documents"""
+    os.environ['LLM_BACKEND'] = 'none'
+    from core.analyzer import ContractAnalyzer
+    analyzer = ContractAnalyzer()
+
+    paths = [SAMPLE] + sorted(os.path.join(TEMPLATES, name) for name in os.listdir(TEMPLATES))
+    prompts = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            result = analyzer.analyze_contract(f.read())
+        contract_type = result['type']
+        prompts.append(analyzer._llm_summary_prompt(contract_type))
+        prompts.append(analyzer._llm_suggestions_prompt(result['risks'], contract_type))
+    return prompts
+
+
+def generate(llm, prompt: str, max_new_tokens: int) -> int:
+    """Decode exactly max_new_tokens with SimpleLLM's sampling settings; return the count"""
+    import torch
+    inputs = llm.tokenizer([prompt], return_tensors="pt", truncation=True, max_length=50)
+    with torch.no_grad():
+        output = llm.model.generate(
+            **inputs,
+            max_new_tokens=max_new_tokens,
+            min_new_tokens=max_new_tokens,
+            temperature=0.7,
+            do_sample=True,
+            pad_token_id=llm.tokenizer.eos_token_id
+        )
+    return output.shape[1] - inputs["input_ids"].shape[1]
+
+
+def run_child(backend: str, threads: int, prompts_path: str, repeats: int):
+    from core.simple_llm import SimpleLLM
+
+    with open(prompts_path, encoding='utf-8') as f:
+        prompts = json.load(f)
+
+    baseline = proc_status_kb('VmRSS')
+    start = time.perf_counter()
+    llm = SimpleLLM(backend=backend, threads=threads)
+    load_seconds = time.perf_counter() - start
+    if llm.model is None:
+        print(json.dumps({'error': f"{backend} backend failed to load"}))
+        return
+    loaded_rss = proc_status_kb('VmRSS')
+
+    # Warm-up so one-off allocation and kernel selection are not timed
+    generate(llm, prompts[0][0], 4)
+
+    first_token, tokens, seconds = [], 0, 0.0
+    for _ in range(repeats):
+        for prompt, max_length in prompts:
+            started = time.perf_counter()
+            generate(llm, prompt, 1)
+            first_token.append(time.perf_counter() - started)
+
+            prompt_length = len(llm.tokenizer(prompt, truncation=True, max_length=50)["input_ids"])
+            started = time.perf_counter()
+            tokens += generate(llm, prompt, max(max_length - prompt_length, 1))
+            seconds += time.perf_counter() - started
+
+    first_token.sort()
+    print(json.dumps({
+        'load_seconds': load_seconds,
+        'tokens_per_second': tokens / seconds if seconds else 0.0,
+        'first_token_ms_p50': first_token[len(first_token) // 2] * 1000,
+        'first_token_ms_max': first_token[-1] * 1000,
+        'model_rss_mb': (loaded_rss - baseline) / 1024,
+        'peak_rss_mb': proc_status_kb('VmHWM') / 1024
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--backends', nargs='+', default=['eager', 'int8'])
+    parser.add_argument('--threads', type=int, default=0, help='torch threads, 0 for the torch default')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--output', help='also write the results to this JSON file')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--prompts', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return run_child(args.child, args.threads, args.prompts, args.repeats)
+
+    prompts = analyzer_prompts()
+    print(f"{len(prompts)} prompts from ContractAnalyzer, {args.repeats} repeats, threads={args.threads or 'default'}")
+
+    prompts_path = os.path.join(ROOT, '.cache', 'bench_llm_prompts.json')
+    os.makedirs(os.path.dirname(prompts_path), exist_ok=True)
+    with open(prompts_path, 'w', encoding='utf-8') as f:
+        json.dump(prompts, f)
+
+    results = {}
+    for backend in args.backends:
+        output = subprocess.run([sys.executable, __file__, '--child', backend, '--prompts', prompts_path,
+                                 '--threads', str(args.threads), '--repeats', str(args.repeats)],
+                                capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        results[backend] = result
+        if 'error' in result:
+            print(f"{backend:6s} {result['error']}")
+            continue
+        print(f"{backend:6s} {result['tokens_per_second']:8.1f} tok/s  "
+              f"first token p50 {result['first_token_ms_p50']:7.1f} ms (max {result['first_token_ms_max']:.1f})  "
+              f"model RSS {result['model_rss_mb']:7.1f} MB  peak {result['peak_rss_mb']:7.1f} MB  "
+              f"load {result['load_seconds']:.1f}s")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
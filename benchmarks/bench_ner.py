@@ -0,0 +1,68 @@
+"""Compare NER throughput: full en_core_web_sm on one nlp(text) call (the old
+path) against the trimmed pipeline fed in sentence-aligned chunks via nlp.pipe,
+with and without the candidate-sentence prefilter.
+
+    python benchmarks/bench_ner.py --copies 50 --batch-size 16 --n-process 1
+"""
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import spacy
+from core.document import ParsedDocument
+from core.ner import NER_UNUSED_COMPONENTS, EntityExtractor, EntityPrefilter
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_contract.txt')
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--model', default='en_core_web_sm')
+    parser.add_argument('--copies', type=int, default=50, help='sample contract repetitions')
+    parser.add_argument('--chunk-chars', type=int, default=20000)
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--n-process', type=int, default=1)
+    parser.add_argument('--prefilter-context', type=int, default=1, help='recall safety margin in sentences')
+    args = parser.parse_args()
+
+    with open(SAMPLE, encoding='utf-8') as f:
+        text = (f.read() + '\n') * args.copies
+    doc = ParsedDocument(text)
+    print(f"Contract: {len(text):,} chars, {len(doc.sentences):,} sentences")
+
+    full = spacy.load(args.model)
+    full.max_length = max(full.max_length, len(text) + 1)
+    full_doc, full_seconds = timed(lambda: full(doc.text))
+
+    trimmed = spacy.load(args.model, exclude=NER_UNUSED_COMPONENTS)
+    extractor = EntityExtractor(trimmed, args.chunk_chars, args.batch_size, args.n_process)
+    entities, trimmed_seconds = timed(lambda: extractor.extract(doc))
+
+    prefiltered = EntityExtractor(trimmed, args.chunk_chars, args.batch_size, args.n_process,
+                                  prefilter=EntityPrefilter(args.prefilter_context))
+    filtered_entities, filtered_seconds = timed(lambda: prefiltered.extract(doc))
+
+    full_entities = {(ent.label_, ent.start_char, ent.end_char) for ent in full_doc.ents}
+
+    def agreement(found):
+        found = {(ent.label, ent.start, ent.end) for ent in found}
+        return len(full_entities & found) / max(len(full_entities), 1)
+
+    print(f"full pipeline:       {full_seconds:8.2f}s  {len(text) / full_seconds / 1000:10.1f} kchars/s  pipes={full.pipe_names}")
+    print(f"trimmed, chunked:    {trimmed_seconds:8.2f}s  {len(text) / trimmed_seconds / 1000:10.1f} kchars/s  "
+          f"speedup={full_seconds / trimmed_seconds:.2f}x  agreement={agreement(entities):.1%}")
+    print(f"+ sentence prefilter:{filtered_seconds:8.2f}s  {len(text) / filtered_seconds / 1000:10.1f} kchars/s  "
+          f"speedup={full_seconds / filtered_seconds:.2f}x  agreement={agreement(filtered_entities):.1%}  "
+          f"skipped={prefiltered.skipped_fraction:.1%}")
+
+
+if __name__ == '__main__':
+    main()
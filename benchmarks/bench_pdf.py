@@ -0,0 +1,55 @@
+"""Time PDF text extraction for every installed backend, serial and across a process pool.
+
+    python benchmarks/bench_pdf.py --pages 300 --workers 1 2 4
+    python benchmarks/bench_pdf.py --pdf path/to/contract.pdf
+"""
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from synthetic import make_pdf
+from utils.pdf_extraction import ParallelPdfExtractor, available_backends, get_backend
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_contract.txt')
+
+
+def serial_extract(backend_name: str, data: bytes) -> str:
+    backend = get_backend(backend_name)
+    document = backend.open(data)
+    return "".join(backend.extract_page(document, index) or "" for index in range(backend.page_count(document)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pdf', help="benchmark this PDF instead of a synthetic one")
+    parser.add_argument('--pages', type=int, default=300, help="synthetic page count")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--pages-per-task', type=int, default=8)
+    args = parser.parse_args()
+
+    if args.pdf:
+        with open(args.pdf, 'rb') as f:
+            data = f.read()
+    else:
+        with open(SAMPLE, encoding='utf-8') as f:
+            page = f.read()
+        data = make_pdf([page] * args.pages)
+
+    print(f"PDF: {len(data) / 1024:.0f} KB, backends installed: {', '.join(available_backends())}")
+    for backend_name in available_backends():
+        for workers in args.workers:
+            start = time.perf_counter()
+            if workers == 1:
+                text = serial_extract(backend_name, data)
+                failed = 0
+            else:
+                extraction = ParallelPdfExtractor(backend_name, workers, pages_per_task=args.pages_per_task).extract(data)
+                text, failed = extraction.text, len(extraction.failed_pages)
+            elapsed = time.perf_counter() - start
+            print(f"{backend_name:10s} workers={workers:<3d} {elapsed:8.2f}s  {len(text):>10,} chars  failed pages={failed}")
+
+
+if __name__ == '__main__':
+    main()
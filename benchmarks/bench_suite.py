@@ -0,0 +1,197 @@
+"""Time every ContractAnalyzer stage, FileHandler extraction per format and the
+multilingual processors on synthetic contracts from 1 KB to 10 MB, and save the
+numbers as JSON so runs on different commits can be compared.
+
+    python benchmarks/bench_suite.py --output results/base.json
+    python benchmarks/bench_suite.py --sizes 1K 100K --compare results/base.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from synthetic import make_contract, make_docx, make_pdf
+
+DEFAULT_SIZES = ['1K', '10K', '100K', '1M', '10M']
+UNITS = {'K': 1024, 'M': 1024 * 1024}
+PDF_PAGE_CHARS = 3000
+
+
+def parse_size(size: str) -> int:
+    size = size.upper()
+    return int(float(size[:-1]) * UNITS[size[-1]]) if size[-1] in UNITS else int(size)
+
+
+def timed(fn, repeats: int):
+    """Return (last result, median seconds) over ``repeats`` runs"""
+    times, result = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, statistics.median(times)
+
+
+def bench_stages(analyzer, text: str, repeats: int) -> dict:
+    """Seconds per analyze_contract stage, run in pipeline order on one parsed document"""
+    timings = {}
+    doc, timings['parse'] = timed(lambda: analyzer.parse(text), repeats)
+    contract_type, timings['type'] = timed(lambda: analyzer._classify_type(doc), repeats)
+
+    def entities():
+        # Entities are cached on the document; time the extraction itself, not the cache
+        doc._entities = None
+        return analyzer._extract_advanced_entities(doc)
+
+    _, timings['entities'] = timed(entities, repeats)
+    clauses, timings['clauses'] = timed(lambda: analyzer._extract_clauses_with_subclauses(doc), repeats)
+    _, timings['obligations'] = timed(lambda: analyzer._identify_obligations_rights_prohibitions(doc), repeats)
+    risks, timings['risks'] = timed(lambda: analyzer._assess_comprehensive_risks(doc), repeats)
+    _, timings['ambiguities'] = timed(lambda: analyzer._detect_ambiguities(doc), repeats)
+    _, timings['template_similarity'] = timed(lambda: analyzer._match_template_similarity(doc, clauses, contract_type), repeats)
+    clause_risk_scores, timings['clause_risk_scores'] = timed(lambda: analyzer._calculate_clause_level_risks(clauses), repeats)
+    _, timings['summary'] = timed(lambda: analyzer._generate_llm_summary(doc, contract_type), repeats)
+    _, timings['suggestions'] = timed(lambda: analyzer._generate_llm_suggestions(risks, contract_type), repeats)
+    _, timings['composite_risk_score'] = timed(
+        lambda: analyzer._calculate_composite_risk_score(risks, clause_risk_scores), repeats)
+    _, timings['analyze_contract'] = timed(lambda: analyzer.analyze_contract(text), repeats)
+    return timings
+
+
+def bench_clause_classifier(analyzer, text: str, repeats: int) -> dict:
+    """Sentences per second for the centroid clause classifier and the keyword fallback"""
+    doc = analyzer.parse(text)
+    sentences = [sentence for sentence in doc.sentences if len(sentence.text.strip()) > 30]
+    classifier = analyzer.clause_classifier
+    timings = {}
+    try:
+        analyzer.clause_classifier = None
+        _, timings['keywords'] = timed(lambda: analyzer._extract_clauses_with_subclauses(doc), repeats)
+    finally:
+        analyzer.clause_classifier = classifier
+    if classifier is not None:
+        _, timings['centroid'] = timed(lambda: analyzer._extract_clauses_with_subclauses(doc), repeats)
+    return {name: {'seconds': seconds, 'sentences': len(sentences),
+                   'sentences_per_second': len(sentences) / seconds if seconds else 0.0}
+            for name, seconds in timings.items()}
+
+
+def bench_extraction(text: str, repeats: int) -> dict:
+    """Seconds for FileHandler to extract the same contract from TXT, DOCX and PDF"""
+    from utils.file_handler import FileHandler
+
+    documents = {
+        'text/plain': text.encode('utf-8'),
+        FileHandler.MIME_TYPES['.docx']: make_docx(text.splitlines(), table_every=0),
+        'application/pdf': make_pdf([text[start:start + PDF_PAGE_CHARS] for start in range(0, len(text), PDF_PAGE_CHARS)])
+    }
+    names = {mime_type: extension[1:] for extension, mime_type in FileHandler.MIME_TYPES.items()}
+    timings = {}
+    for mime_type, data in documents.items():
+        extracted, seconds = timed(lambda: FileHandler().extract_bytes(data, mime_type), repeats)
+        timings[names[mime_type]] = {'seconds': seconds, 'bytes': len(data), 'chars': len(extracted or '')}
+    return timings
+
+
+def bench_multilingual(text: str, repeats: int) -> dict:
+    from core.multilingual import MultilingualProcessor as CoreProcessor
+    from multilingual_processor import MultilingualProcessor
+
+    core, legacy = CoreProcessor(), MultilingualProcessor()
+    return {
+        'core.process_contract': timed(lambda: core.process_contract(text), repeats)[1],
+        'process_multilingual_contract': timed(lambda: legacy.process_multilingual_contract(text), repeats)[1]
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(current: dict, baseline: dict):
+    """Print seconds per measurement against a previous run, flagging >10% changes"""
+    def flatten(results, prefix=''):
+        for key, value in results.items():
+            if isinstance(value, dict):
+                if 'seconds' in value:
+                    yield prefix + key, value['seconds']
+                else:
+                    yield from flatten(value, f"{prefix}{key}.")
+            elif isinstance(value, float):
+                yield prefix + key, value
+
+    old = dict(flatten(baseline['results']))
+    print(f"\nAgainst {baseline['commit']}:")
+    for name, seconds in flatten(current['results']):
+        if name in old and old[name] > 0:
+            change = (seconds - old[name]) / old[name] * 100
+            flag = '  <-- slower' if change > 10 else '  <-- faster' if change < -10 else ''
+            print(f"  {name:55s} {old[name]:9.4f}s -> {seconds:9.4f}s  {change:+6.1f}%{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES, help='contract sizes such as 1K 10K 1M')
+    parser.add_argument('--repeats', type=int, default=3, help='runs per measurement; the median is kept')
+    parser.add_argument('--max-file-size', default='1M',
+                        help='skip FileHandler formats above this size; DOCX/PDF generation is slow past 1M')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='JSON file for the results (default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='previous results JSON to compare against')
+    args = parser.parse_args()
+
+    from core.analyzer import ContractAnalyzer
+    analyzer = ContractAnalyzer()
+    max_file_size = parse_size(args.max_file_size)
+
+    report = {
+        'commit': git_commit(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'fingerprint': analyzer.fingerprint(),
+        'repeats': args.repeats,
+        'results': {}
+    }
+    for size in args.sizes:
+        text = make_contract(parse_size(size), seed=args.seed)
+        print(f"{size}: {len(text.encode('utf-8')):,} bytes")
+        entry = {'stages': bench_stages(analyzer, text, args.repeats),
+                 'clause_classifier': bench_clause_classifier(analyzer, text, args.repeats),
+                 'multilingual': bench_multilingual(text, args.repeats)}
+        if parse_size(size) <= max_file_size:
+            entry['extraction'] = bench_extraction(text, args.repeats)
+        report['results'][size] = entry
+
+        for name, seconds in entry['stages'].items():
+            print(f"  {name:22s} {seconds:9.4f}s")
+        for name, result in entry['clause_classifier'].items():
+            print(f"  clauses {name:14s} {result['seconds']:9.4f}s  ({result['sentences_per_second']:,.0f} sentences/sec)")
+        for name, result in entry.get('extraction', {}).items():
+            print(f"  extract {name:14s} {result['seconds']:9.4f}s  ({result['bytes']:,} bytes)")
+        for name, seconds in entry['multilingual'].items():
+            print(f"  {name:30s} {seconds:9.4f}s")
+
+    output = args.output or os.path.join(os.path.dirname(__file__), 'results', f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(report, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""Synthetic contract documents for the benchmarks."""
+import glob
+import os
+import random
+import re
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'src'))
+
+PLACEHOLDER = re.compile(r'\[([A-Z_]+)\]')
+
+PLACEHOLDER_VALUES = {
+    'AMOUNT': ['5,00,000', '1,20,000', '75,000'], 'DAYS': ['15', '30', '45'], 'NOTICE_PERIOD': ['30', '60', '90'],
+    'MONTHS': ['3', '6'], 'DURATION': ['12 months', '2 years'], 'START_DATE': ['January 15, 2024'],
+    'END_DATE': ['December 31, 2024'], 'GEOGRAPHY': ['Karnataka', 'Maharashtra', 'Delhi']
+}
+PARTIES = ['ABC Technologies Pvt. Ltd.', 'XYZ Consulting Services', 'Mehta Traders', 'Priya Sharma']
+# Riskier language the templates avoid, so the risk and ambiguity stages have work at every size
+RISK_SENTENCES = [
+    "The Vendor shall indemnify and hold harmless the Client against all claims.",
+    "The Client may terminate at will and at its sole discretion without notice.",
+    "This agreement shall automatically renew for successive one-year terms.",
+    "Liquidated damages of Rs. 10,000 per day apply to delays, with unlimited liability for breach.",
+    "Disputes shall be settled by arbitration in Mumbai under the Arbitration and Conciliation Act, 1996.",
+    "The Employee shall not engage in competing business; this non-compete survives for two years.",
+    "Deliverables must be of satisfactory quality and provided from time to time as needed."
+]
+
+
+def template_clauses():
+    """(heading, text) pairs from TemplateManager, ContractTemplates and templates/*.md"""
+    from contract_templates import ContractTemplates
+    from core.templates import TemplateManager
+
+    clauses = []
+    for manager in (TemplateManager(), ContractTemplates()):
+        for template in manager.get_all_templates().values():
+            clauses.extend((section.replace('_', ' ').upper(), text) for section, text in template['sections'].items())
+
+    for path in sorted(glob.glob(os.path.join(ROOT, 'templates', '*.md'))):
+        with open(path, encoding='utf-8') as f:
+            for block in re.split(r'^## ', f.read(), flags=re.MULTILINE)[1:]:
+                heading, _, body = block.partition('\n')
+                if body.strip():
+                    clauses.append((heading.strip().upper(), body.strip()))
+    return clauses
+
+
+def make_contract(size_bytes: int, seed: int = 0, hindi_every: int = 20) -> str:
+    """A contract of roughly ``size_bytes`` UTF-8 bytes built by expanding the bundled templates.
+
+    Clauses are numbered, placeholders filled with plausible values and risky
+    sentences mixed in; every ``hindi_every``-th clause adds a Hindi line so
+    the multilingual path is exercised. The same seed gives the same text.
+    """
+    from multilingual_processor import HINDI_CONTRACT_CLAUSES
+
+    rng = random.Random(seed)
+    clauses = template_clauses()
+    hindi = [line for lines in HINDI_CONTRACT_CLAUSES.values() for line in lines]
+
+    def fill(match):
+        return rng.choice(PLACEHOLDER_VALUES.get(match.group(1), PARTIES))
+
+    parts = [f"MASTER AGREEMENT\n\nThis Agreement is entered into between {PARTIES[0]} and {PARTIES[1]}.\n"]
+    size = len(parts[0].encode('utf-8'))
+    number = 0
+    while size < size_bytes:
+        number += 1
+        heading, text = rng.choice(clauses)
+        body = PLACEHOLDER.sub(fill, text)
+        if rng.random() < 0.3:
+            body += " " + rng.choice(RISK_SENTENCES)
+        if hindi_every and number % hindi_every == 0:
+            body += "\n" + rng.choice(hindi) + " ₹" + rng.choice(PLACEHOLDER_VALUES['AMOUNT'])
+        part = f"\n{number}. {heading}:\n{body}\n"
+        parts.append(part)
+        size += len(part.encode('utf-8'))
+    return "".join(parts)
+
+
+def make_pdf(pages) -> bytes:
+    """Minimal uncompressed PDF, one page per string, each line drawn as Helvetica text"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        lines = [line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') for line in text.splitlines()]
+        stream = "BT /F1 10 Tf 12 TL 50 760 Td " + " ".join(f"({line}) '" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(stream.encode('latin-1', 'replace'))} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1", "replace")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+
+def make_docx(paragraphs, table_every: int = 50) -> bytes:
+    """DOCX with the given paragraphs and a small payment table every ``table_every`` paragraphs"""
+    import io
+    from docx import Document
+
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Synthetic Agreement"
+    for index, text in enumerate(paragraphs, 1):
+        doc.add_paragraph(text)
+        if table_every and index % table_every == 0:
+            table = doc.add_table(rows=2, cols=2)
+            table.cell(0, 0).text = "Milestone"
+            table.cell(0, 1).text = "Amount"
+            table.cell(1, 0).text = f"Milestone {index // table_every}"
+            table.cell(1, 1).text = "Rs. 1,00,000"
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,26 @@
+"""Run analysis workers that drain the persistent job queue.
+
+    python job_worker.py --processes 4
+
+Every worker pointed at the same ANALYSIS_JOBS_DB (or --db) shares one queue.
+A SQLite file must be on a local disk, so its workers run on that host; a
+postgresql:// URL lets workers on any number of hosts share the queue.
+"""
+import argparse
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.jobs import run_workers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, default=2)
+    parser.add_argument('--db', help='SQLite path or postgresql:// URL, defaults to ANALYSIS_JOBS_DB or .cache/jobs.db')
+    args = parser.parse_args()
+    run_workers(args.processes, args.db)
+
+
+if __name__ == '__main__':
+    main()
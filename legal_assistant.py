@@ -5,11 +5,17 @@ import nltk
 from docx import Document
 import PyPDF2
 import json
+import os
 import re
+import sys
 from datetime import datetime
 import pandas as pd
 from typing import Dict, List, Tuple
 import io
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.map_reduce import ChatClient, MapReduceAnalyzer
+from core.type_classifier import ContractTypeClassifier
 
 # Initialize NLP models
 @st.cache_resource
@@ -28,10 +34,28 @@ def load_nlp_models():
     
     return nlp
 
+AI_ANALYSIS_FALLBACK = {
+    "summary": "AI analysis unavailable",
+    "obligations": "Please review manually",
+    "risks": "Manual review required",
+    "suggestions": "Consult legal expert",
+    "risk_score": "Medium"
+}
+
 class LegalAssistant:
     def __init__(self, api_key: str):
         openai.api_key = api_key
         self.nlp = load_nlp_models()
+        self.map_reduce = MapReduceAnalyzer(
+            ChatClient(api_key),
+            max_workers=int(os.environ.get('OPENAI_MAX_PARALLEL', 4)),
+            max_retries=int(os.environ.get('OPENAI_MAX_RETRIES', 3)),
+            chunk_tokens=int(os.environ.get('OPENAI_CHUNK_TOKENS', 1500))
+        )
+        
+        # Same trained model as ContractAnalyzer; the keyword patterns below are the fallback
+        self.type_classifier = ContractTypeClassifier.load()
+        self.type_min_confidence = float(os.environ.get('CONTRACT_TYPE_MIN_CONFIDENCE', 0.5))
         
         # Contract type patterns
         self.contract_types = {
@@ -74,7 +98,12 @@ class LegalAssistant:
         return ""
 
     def classify_contract_type(self, text: str) -> str:
-        """Classify contract type based on keywords"""
+        """Classify contract type with the trained model, or keywords when it is unavailable or unsure"""
+        if self.type_classifier:
+            contract_type, confidence = self.type_classifier.predict(text)
+            if confidence >= self.type_min_confidence:
+                return contract_type
+        
         text_lower = text.lower()
         scores = {}
         
@@ -126,8 +155,19 @@ class LegalAssistant:
         
         return risks
 
-    def get_ai_analysis(self, text: str, contract_type: str) -> Dict:
-        """Get AI analysis using OpenAI"""
+    def get_ai_analysis(self, text: str, contract_type: str, full_contract: bool = False) -> Dict:
+        """Get AI analysis using OpenAI.
+
+        By default only the first 3000 characters are sent in one request;
+        ``full_contract`` analyzes every clause-aligned chunk concurrently and
+        merges the results.
+        """
+        if full_contract:
+            try:
+                return self.map_reduce.analyze(text, contract_type)
+            except Exception:
+                return dict(AI_ANALYSIS_FALLBACK)
+        
         try:
             prompt = f"""
             Analyze this {contract_type} contract and provide:
@@ -152,13 +192,7 @@ class LegalAssistant:
             
             return json.loads(response.choices[0].message.content)
         except Exception as e:
-            return {
-                "summary": "AI analysis unavailable",
-                "obligations": "Please review manually",
-                "risks": "Manual review required",
-                "suggestions": "Consult legal expert",
-                "risk_score": "Medium"
-            }
+            return dict(AI_ANALYSIS_FALLBACK)
 
     def generate_report(self, analysis_results: Dict) -> str:
         """Generate comprehensive analysis report"""
@@ -211,6 +245,11 @@ def main():
         
         if not api_key:
             st.warning("Please enter your OpenAI API key to use AI analysis features")
+        
+        full_contract = st.checkbox(
+            "Analyze full contract",
+            help="Split long contracts on clause boundaries and analyze every part, instead of only the first pages"
+        )
     
     # Main interface
     col1, col2 = st.columns([1, 1])
@@ -235,7 +274,7 @@ def main():
                     contract_type = assistant.classify_contract_type(text)
                     entities = assistant.extract_entities(text)
                     risks = assistant.assess_risk_level(text)
-                    ai_analysis = assistant.get_ai_analysis(text, contract_type)
+                    ai_analysis = assistant.get_ai_analysis(text, contract_type, full_contract)
                     
                     # Store results
                     analysis_results = {
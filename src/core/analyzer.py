@@ -1,15 +1,54 @@
 import spacy
 import nltk
 import json
+import hashlib
+import os
 import re
-from typing import Dict, List
-from .simple_llm import SimpleLLM
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from .document import ParsedDocument, Sentence
+from .matcher import PatternHit, PatternMatcher
+from .models import registry
+from .clause_classifier import ClauseClassifier
+from .ner import EntityExtractor, EntityPrefilter
+from .orchestration import StageOrchestrator, parse_timeouts
+from .profiling import ANALYSES, StageTimer, profile_mode, run_profiled
+from .similarity import TemplateSimilarity
+from .type_classifier import ContractTypeClassifier
 import streamlit as st
 
+# Bump whenever a change alters analysis output so cached results are invalidated
+ANALYZER_VERSION = "8"
+
+# Stage names as they appear in the result dict, reported to progress callbacks as each finishes
+ANALYSIS_STAGES = [
+    'type', 'entities', 'clauses', 'obligations', 'risks', 'ambiguities',
+    'template_similarity', 'clause_risk_scores', 'summary', 'suggestions', 'composite_risk_score'
+]
+
+# Summary sentence for each (high-risk terms found, protective terms found) combination
+SUMMARY_RISK_CONTEXT = {
+    (True, False): "The contract contains some terms that may require careful review for potential risks.",
+    (False, True): "The agreement includes several protective clauses that help balance the interests of both parties.",
+    (True, True): "The contract has a mix of standard protective clauses and some terms that warrant closer examination.",
+    (False, False): "The contract appears to follow standard commercial practices with typical terms and conditions."
+}
+
 class ContractAnalyzer:
     def __init__(self):
         self.nlp = self._load_nlp()
-        self.llm = SimpleLLM()
+        self.llm = registry.get('llm')
+        self.ner = EntityExtractor(
+            self.nlp,
+            chunk_chars=int(os.environ.get('NER_CHUNK_CHARS', 20000)),
+            batch_size=int(os.environ.get('NER_BATCH_SIZE', 16)),
+            n_process=int(os.environ.get('NER_N_PROCESS', 1)),
+            prefilter=self._load_prefilter()
+        ) if self.nlp else None
+        self.orchestrator = self._load_orchestrator()
+        self.template_similarity = TemplateSimilarity.from_env()
+        self.clause_classifier = self._load_clause_classifier()
+        self.type_classifier = self._load_type_classifier()
+        self.type_min_confidence = float(os.environ.get('CONTRACT_TYPE_MIN_CONFIDENCE', 0.5))
         
         self.contract_patterns = {
             'employment': ['employment', 'salary', 'employee', 'job', 'position', 'work'],
@@ -43,28 +82,152 @@ class ContractAnalyzer:
         }
         
         self.ambiguity_flags = ['reasonable', 'appropriate', 'satisfactory', 'as needed', 'from time to time']
+        
+        self.clause_risk_terms = {
+            'High': ['unlimited', 'sole discretion', 'irrevocable', 'perpetual'],
+            'Medium': ['penalty', 'damages', 'terminate', 'breach']
+        }
+        
+        self.summary_terms = {
+            'payment': ['payment', 'salary', 'fee', 'amount', 'compensation'],
+            'termination': ['terminate', 'end', 'cancel', 'expiry'],
+            'liability': ['liable', 'liability', 'damages', 'responsible'],
+            'confidentiality': ['confidential', 'non-disclosure', 'proprietary'],
+            'ip': ['copyright', 'patent', 'intellectual property', 'trademark'],
+            'dispute': ['arbitration', 'mediation', 'court', 'dispute']
+        }
+        
+        self.summary_risk_terms = {
+            'high_risk': ['unlimited liability', 'sole discretion', 'irrevocable', 'automatic renewal'],
+            'protective': ['limited liability', 'mutual termination', 'reasonable notice', 'force majeure']
+        }
+        
+        # Every keyword dictionary above compiled into one automaton so a contract
+        # is scanned once per analysis instead of once per keyword
+        self.matcher = PatternMatcher({
+            'contract': self.contract_patterns,
+            'clause': self.clause_patterns,
+            'modality': {
+                'obligation': self.obligation_patterns,
+                'right': self.right_patterns,
+                'prohibition': self.prohibition_patterns
+            },
+            'risk': self.specific_risks,
+            'ambiguity': {flag: [flag] for flag in self.ambiguity_flags},
+            'clause_risk': self.clause_risk_terms,
+            'summary': self.summary_terms,
+            'summary_risk': self.summary_risk_terms
+        })
     
     def _load_nlp(self):
-        try:
-            import spacy
-            return spacy.load("en_core_web_sm")
-        except Exception as e:
-            print(f"spaCy loading failed: {e}")
+        return registry.get('spacy')
+    
+    def _load_prefilter(self) -> Optional[EntityPrefilter]:
+        if os.environ.get('NER_PREFILTER', '1') == '0':
             return None
+        return EntityPrefilter(context_sentences=int(os.environ.get('NER_PREFILTER_CONTEXT', 1)))
     
-    def analyze_contract(self, text: str) -> Dict:
-        contract_type = self._classify_type(text)
-        entities = self._extract_advanced_entities(text)
-        clauses = self._extract_clauses_with_subclauses(text)
-        obligations = self._identify_obligations_rights_prohibitions(text)
-        risks = self._assess_comprehensive_risks(text)
-        ambiguities = self._detect_ambiguities(text)
-        template_similarity = self._match_template_similarity(clauses, contract_type)
-        clause_risk_scores = self._calculate_clause_level_risks(clauses)
-        
-        summary = self._generate_llm_summary(text, contract_type)
-        suggestions = self._generate_llm_suggestions(risks, contract_type)
-        composite_risk_score = self._calculate_composite_risk_score(risks, clause_risk_scores)
+    def _load_clause_classifier(self) -> Optional[ClauseClassifier]:
+        """CLAUSE_CLASSIFIER=keywords falls back to keyword matching"""
+        if os.environ.get('CLAUSE_CLASSIFIER', 'centroid') == 'keywords':
+            return None
+        return ClauseClassifier.from_env()
+    
+    def _load_type_classifier(self) -> Optional[ContractTypeClassifier]:
+        """CONTRACT_TYPE_CLASSIFIER=keywords falls back to keyword counts"""
+        if os.environ.get('CONTRACT_TYPE_CLASSIFIER', 'model') == 'keywords':
+            return None
+        return ContractTypeClassifier.load()
+    
+    def fingerprint(self) -> str:
+        """Identify the rules and models producing results, for cache keys"""
+        rules = [
+            self.contract_patterns, self.clause_patterns, self.obligation_patterns,
+            self.right_patterns, self.prohibition_patterns, self.specific_risks,
+            self.ambiguity_flags, self.clause_risk_terms, self.summary_terms, self.summary_risk_terms
+        ]
+        nlp_meta = getattr(self.nlp, 'meta', {}) if self.nlp else {}
+        models = {
+            'spacy': f"{nlp_meta.get('name')}-{nlp_meta.get('version')}" if self.nlp else None,
+            'llm': getattr(self.llm, 'model_id', None) if getattr(self.llm, 'model', None) else None
+        }
+        payload = json.dumps({'version': ANALYZER_VERSION, 'rules': rules, 'models': models,
+                              'templates': self.template_similarity.fingerprint(),
+                              'clause_classifier': self.clause_classifier.fingerprint() if self.clause_classifier else None,
+                              'type_classifier': self.type_classifier.fingerprint() if self.type_classifier else None,
+                              'type_min_confidence': self.type_min_confidence},
+                             sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+    
+    def _load_orchestrator(self) -> Optional[StageOrchestrator]:
+        """ANALYZER_CONCURRENCY=threads runs independent stages concurrently"""
+        if os.environ.get('ANALYZER_CONCURRENCY', 'sequential') != 'threads':
+            return None
+        spec = os.environ.get('ANALYZER_STAGE_TIMEOUTS')
+        return StageOrchestrator(
+            self,
+            max_workers=int(os.environ.get('ANALYZER_STAGE_WORKERS', 6)),
+            timeouts=parse_timeouts(spec) if spec is not None else None
+        )
+    
+    def analyze_many(self, items: Iterable, workers: Optional[int] = None, chunksize: int = 4) -> Iterator[Dict]:
+        """Analyze many contract texts or file paths, yielding results in input order"""
+        from .batch import analyze_many
+        return analyze_many(items, workers=workers, chunksize=chunksize, analyzer=self)
+    
+    def parse(self, text: str) -> ParsedDocument:
+        return ParsedDocument(text, self.matcher)
+    
+    def analyze_contract(self, text: str, progress: Optional[Callable[[str], None]] = None,
+                         profile: Optional[str] = None) -> Dict:
+        """Run every analysis stage; ``progress`` is called with each stage name from ANALYSIS_STAGES as it finishes.
+        
+        ``profile`` ('off', 'timings' or 'cprofile'; default ANALYZER_PROFILE)
+        adds a 'profile' section with seconds per stage. 'cprofile' also dumps
+        a cProfile of this call to ANALYZER_PROFILE_DIR, running the stages
+        sequentially so the profiler sees all of them.
+        """
+        mode = profile_mode(profile)
+        timer = StageTimer()
+        if mode == 'cprofile':
+            result, path = run_profiled(self._parse_and_run, text, timer, progress, False)
+        else:
+            result, path = self._parse_and_run(text, timer, progress, self.orchestrator is not None), None
+        ANALYSES.inc()
+        
+        if mode != 'off':
+            result['profile'] = timer.report()
+            if path:
+                result['profile']['cprofile'] = path
+        return result
+    
+    def _parse_and_run(self, text: str, timer: StageTimer, progress: Optional[Callable[[str], None]],
+                       concurrent: bool) -> Dict:
+        return self._run_stages(timer.run('parse', self.parse, text), timer, progress, concurrent)
+    
+    def _run_stages(self, doc: ParsedDocument, timer: StageTimer, progress: Optional[Callable[[str], None]],
+                    concurrent: bool = False) -> Dict:
+        if concurrent:
+            return self.orchestrator.run(doc, progress, timer)
+        
+        def stage(name: str, fn: Callable, *args):
+            value = timer.run(name, fn, *args)
+            if progress:
+                progress(name)
+            return value
+        
+        contract_type = stage('type', self._classify_type, doc)
+        entities = stage('entities', self._extract_advanced_entities, doc)
+        clauses = stage('clauses', self._extract_clauses_with_subclauses, doc)
+        obligations = stage('obligations', self._identify_obligations_rights_prohibitions, doc)
+        risks = stage('risks', self._assess_comprehensive_risks, doc)
+        ambiguities = stage('ambiguities', self._detect_ambiguities, doc)
+        template_similarity = stage('template_similarity', self._match_template_similarity, doc, clauses, contract_type)
+        clause_risk_scores = stage('clause_risk_scores', self._calculate_clause_level_risks, clauses)
+        
+        summary = stage('summary', self._generate_llm_summary, doc, contract_type)
+        suggestions = stage('suggestions', self._generate_llm_suggestions, risks, contract_type)
+        composite_risk_score = stage('composite_risk_score', self._calculate_composite_risk_score, risks, clause_risk_scores)
         
         return {
             'type': contract_type,
@@ -80,56 +243,94 @@ class ContractAnalyzer:
             'suggestions': suggestions
         }
     
-    def _classify_type(self, text: str) -> str:
-        text_lower = text.lower()
+    def _classify_type(self, doc: ParsedDocument) -> str:
+        if self.type_classifier is None:
+            return self._classify_type_by_keywords(doc)
+        contract_type, confidence = self.type_classifier.predict(doc.text)
+        if confidence < self.type_min_confidence:
+            return self._classify_type_by_keywords(doc)
+        return contract_type
+    
+    def classify_types(self, texts: List[str]) -> List[Tuple[str, Optional[float]]]:
+        """(contract type, confidence) for many documents at once.
+
+        Confidence is None where keyword counts decided: with no model, or
+        when the model's best type scores below CONTRACT_TYPE_MIN_CONFIDENCE
+        (NDAs, licences and loans fit none of the trained types).
+        """
+        if self.type_classifier is None:
+            return [(self._classify_type_by_keywords(self.parse(text)), None) for text in texts]
+        return [
+            prediction if prediction[1] >= self.type_min_confidence
+            else (self._classify_type_by_keywords(self.parse(text)), None)
+            for text, prediction in zip(texts, self.type_classifier.predict_batch(texts))
+        ]
+    
+    def _classify_type_by_keywords(self, doc: ParsedDocument) -> str:
+        found = {(hit.category, hit.pattern) for hit in doc.hits if hit.group == 'contract'}
         scores = {}
         
         for contract_type, keywords in self.contract_patterns.items():
-            score = sum(1 for keyword in keywords if keyword in text_lower)
+            score = sum(1 for keyword in keywords if (contract_type, keyword) in found)
             scores[contract_type] = score
         
         return max(scores, key=scores.get) if scores else "general"
     
-    def _extract_advanced_entities(self, text: str) -> Dict:
+    def _extract_advanced_entities(self, doc: ParsedDocument) -> Dict:
         entities = {'parties': [], 'dates': [], 'amounts': [], 'jurisdictions': [], 'liabilities': []}
         
-        if self.nlp:
-            doc = self.nlp(text)
-            for ent in doc.ents:
-                if ent.label_ in ["PERSON", "ORG"]:
+        if self.ner:
+            for ent in doc.entities(self.ner):
+                if ent.label in ["PERSON", "ORG"]:
                     entities['parties'].append(ent.text)
-                elif ent.label_ == "DATE":
+                elif ent.label == "DATE":
                     entities['dates'].append(ent.text)
-                elif ent.label_ == "MONEY":
+                elif ent.label == "MONEY":
                     entities['amounts'].append(ent.text)
-                elif ent.label_ in ["GPE", "LOC"]:
+                elif ent.label in ["GPE", "LOC"]:
                     entities['jurisdictions'].append(ent.text)
         
         return entities
     
-    def _extract_clauses_with_subclauses(self, text: str) -> Dict:
+    def _extract_clauses_with_subclauses(self, doc: ParsedDocument) -> Dict:
+        if self.clause_classifier is None:
+            return self._extract_clauses_by_keywords(doc)
+        
+        sections = [section for section in doc.sentences if len(section.text.strip()) > 30]
+        classified = self.clause_classifier.classify([section.text.strip() for section in sections])
+        return {
+            clause_type: [self._clause_data(sections[index], clause_type) for index, _ in matches]
+            for clause_type, matches in classified.items()
+        }
+    
+    def _extract_clauses_by_keywords(self, doc: ParsedDocument) -> Dict:
         clauses = {}
-        sections = text.split('.')
         
-        for clause_type, keywords in self.clause_patterns.items():
+        for clause_type in self.clause_patterns:
             matching_clauses = []
             
-            for section in sections:
-                section_lower = section.lower().strip()
-                if any(keyword in section_lower for keyword in keywords) and len(section_lower) > 30:
-                    clause_data = {
-                        'text': section.strip(),
-                        'subclauses': [],
-                        'explanation': self._explain_clause(section.strip(), clause_type),
-                        'risk_level': self._assess_clause_risk(section.strip())
-                    }
-                    matching_clauses.append(clause_data)
+            for section in doc.sentences:
+                if len(section.text.strip()) <= 30:
+                    continue
+                if any(hit.group == 'clause' and hit.category == clause_type for hit in section.hits):
+                    matching_clauses.append(self._clause_data(section, clause_type))
+                    if len(matching_clauses) == 2:
+                        break
             
             if matching_clauses:
                 clauses[clause_type] = matching_clauses[:2]
         
         return clauses
     
+    def _clause_data(self, section: Sentence, clause_type: str) -> Dict:
+        clause_text = section.text.strip()
+        return {
+            'text': clause_text,
+            'subclauses': [],
+            'explanation': self._explain_clause(clause_text, clause_type),
+            'risk_level': self._assess_clause_risk(clause_text, section.hits)
+        }
+    
     def _explain_clause(self, clause_text: str, clause_type: str) -> str:
         explanations = {
             'payment': 'This clause defines when and how payments must be made.',
@@ -143,54 +344,51 @@ class ContractAnalyzer:
         }
         return explanations.get(clause_type, 'This clause contains important contract terms.')
     
-    def _assess_clause_risk(self, clause_text: str) -> str:
-        clause_lower = clause_text.lower()
+    def _assess_clause_risk(self, clause_text: str, hits: Optional[List[PatternHit]] = None) -> str:
+        hits = self.matcher.scan(clause_text.lower()) if hits is None else hits
+        levels = {hit.category for hit in hits if hit.group == 'clause_risk'}
         
-        high_risk_terms = ['unlimited', 'sole discretion', 'irrevocable', 'perpetual']
-        medium_risk_terms = ['penalty', 'damages', 'terminate', 'breach']
-        
-        if any(term in clause_lower for term in high_risk_terms):
+        if 'High' in levels:
             return 'High'
-        elif any(term in clause_lower for term in medium_risk_terms):
+        elif 'Medium' in levels:
             return 'Medium'
         return 'Low'
     
-    def _identify_obligations_rights_prohibitions(self, text: str) -> Dict:
-        sentences = text.split('.')
+    def _identify_obligations_rights_prohibitions(self, doc: ParsedDocument) -> Dict:
         categorized = {'obligations': [], 'rights': [], 'prohibitions': []}
         
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) < 20:
+        for sentence in doc.sentences:
+            sentence_text = sentence.text.strip()
+            if len(sentence_text) < 20:
                 continue
-                
-            sentence_lower = sentence.lower()
             
-            if any(pattern in sentence_lower for pattern in self.obligation_patterns):
-                categorized['obligations'].append(sentence)
-            elif any(pattern in sentence_lower for pattern in self.right_patterns):
-                categorized['rights'].append(sentence)
-            elif any(pattern in sentence_lower for pattern in self.prohibition_patterns):
-                categorized['prohibitions'].append(sentence)
+            modalities = {hit.category for hit in sentence.hits if hit.group == 'modality'}
+            
+            if 'obligation' in modalities:
+                categorized['obligations'].append(sentence_text)
+            elif 'right' in modalities:
+                categorized['rights'].append(sentence_text)
+            elif 'prohibition' in modalities:
+                categorized['prohibitions'].append(sentence_text)
         
         for key in categorized:
             categorized[key] = categorized[key][:3]
         
         return categorized
     
-    def _assess_comprehensive_risks(self, text: str) -> Dict:
-        text_lower = text.lower()
+    def _assess_comprehensive_risks(self, doc: ParsedDocument) -> Dict:
         risks = {}
         
+        # First sentence containing each risk pattern
+        first_sentence = {}
+        for sentence in doc.sentences:
+            for hit in sentence.hits:
+                if hit.group == 'risk':
+                    first_sentence.setdefault((hit.category, hit.pattern), sentence.text.strip())
+        
         for risk_type, patterns in self.specific_risks.items():
-            matches = []
-            for pattern in patterns:
-                if pattern in text_lower:
-                    sentences = text.split('.')
-                    for sentence in sentences:
-                        if pattern in sentence.lower():
-                            matches.append(sentence.strip())
-                            break
+            matches = [first_sentence[(risk_type, pattern)] for pattern in patterns
+                       if (risk_type, pattern) in first_sentence]
             
             if matches:
                 risks[risk_type] = {
@@ -200,49 +398,28 @@ class ContractAnalyzer:
         
         return risks
     
-    def _detect_ambiguities(self, text: str) -> List[Dict]:
+    def _detect_ambiguities(self, doc: ParsedDocument) -> List[Dict]:
         ambiguities = []
-        sentences = text.split('.')
         
-        for sentence in sentences:
-            sentence_lower = sentence.lower().strip()
+        for sentence in doc.sentences:
+            context = sentence.text.strip()
+            if len(context) <= 20:
+                continue
+            flags = {hit.category for hit in sentence.hits if hit.group == 'ambiguity'}
             for flag in self.ambiguity_flags:
-                if flag in sentence_lower and len(sentence.strip()) > 20:
+                if flag in flags:
                     ambiguities.append({
                         'term': flag,
-                        'context': sentence.strip(),
+                        'context': context,
                         'issue': f"'{flag}' is subjective and may cause disputes",
                         'suggestion': f"Define specific criteria for '{flag}'"
                     })
         
         return ambiguities[:5]
     
-    def _match_template_similarity(self, clauses: Dict, contract_type: str) -> Dict:
-        try:
-            from .templates import TemplateManager
-            template_mgr = TemplateManager()
-            template = template_mgr.get_template(contract_type)
-        except:
-            template = None
-        
-        if not template:
-            return {'similarity_score': 0, 'missing_clauses': [], 'extra_clauses': []}
-        
-        template_clauses = set(template.get('sections', {}).keys())
-        contract_clauses = set(clauses.keys())
-        
-        missing = list(template_clauses - contract_clauses)
-        extra = list(contract_clauses - template_clauses)
-        common = len(template_clauses & contract_clauses)
-        total = len(template_clauses | contract_clauses)
-        
-        similarity_score = (common / total * 100) if total > 0 else 0
-        
-        return {
-            'similarity_score': round(similarity_score, 1),
-            'missing_clauses': missing,
-            'extra_clauses': extra
-        }
+    def _match_template_similarity(self, doc: ParsedDocument, clauses: Dict, contract_type: str) -> Dict:
+        sentences = [sentence.text.strip() for sentence in doc.sentences if sentence.text.strip()]
+        return self.template_similarity.score(sentences, clauses, contract_type)
     
     def _calculate_clause_level_risks(self, clauses: Dict) -> Dict:
         clause_risks = {}
@@ -292,45 +469,51 @@ class ContractAnalyzer:
             return 'Medium'
         return 'Low'
     
-    def _generate_llm_summary(self, text: str, contract_type: str) -> str:
+    def _llm_summary_prompt(self, contract_type: str) -> Tuple[str, int]:
+        return f"This {contract_type} contract summary:", 80
+    
+    def _llm_suggestions_prompt(self, risks: Dict, contract_type: str) -> Tuple[str, int]:
+        risk_text = f"with {', '.join(risks.keys())}" if risks else "appears balanced"
+        return f"Legal advice for {contract_type} {risk_text}:", 100
+    
+    def _generate_llm_summary(self, doc: ParsedDocument, contract_type: str) -> str:
         try:
-            prompt = f"This {contract_type} contract summary:"
-            llm_output = self.llm.generate_text(prompt, max_length=80)
+            prompt, max_length = self._llm_summary_prompt(contract_type)
+            llm_output = self.llm.generate_text(prompt, max_length=max_length)
             if llm_output and llm_output != "LLM not available":
                 return f"This {contract_type} contract {llm_output}"
         except:
             pass
-        return self._generate_summary(text, contract_type)
+        return self._generate_summary(doc, contract_type)
     
     def _generate_llm_suggestions(self, risks: Dict, contract_type: str) -> str:
         try:
-            risk_text = f"with {', '.join(risks.keys())}" if risks else "appears balanced"
-            prompt = f"Legal advice for {contract_type} {risk_text}:"
-            llm_output = self.llm.generate_text(prompt, max_length=100)
+            prompt, max_length = self._llm_suggestions_prompt(risks, contract_type)
+            llm_output = self.llm.generate_text(prompt, max_length=max_length)
             if llm_output and llm_output != "LLM not available":
                 return llm_output + ". Always consult legal counsel."
         except:
             pass
         return self._generate_suggestions(risks, contract_type)
     
-    def _generate_summary(self, text: str, contract_type: str) -> str:
+    def _generate_summary(self, doc: ParsedDocument, contract_type: str) -> str:
         """Generate detailed, easy-to-understand summary"""
-        text_lower = text.lower()
+        summary_hits = {hit.category for hit in doc.hits if hit.group == 'summary'}
         
         # Extract comprehensive information
-        entities = self._extract_advanced_entities(text)
+        entities = self._extract_advanced_entities(doc)
         parties = entities.get('parties', [])
         dates = entities.get('dates', [])
         amounts = entities.get('amounts', [])
         jurisdictions = entities.get('jurisdictions', [])
         
         # Analyze contract elements
-        has_payment = any(term in text_lower for term in ['payment', 'salary', 'fee', 'amount', 'compensation'])
-        has_termination = any(term in text_lower for term in ['terminate', 'end', 'cancel', 'expiry'])
-        has_liability = any(term in text_lower for term in ['liable', 'liability', 'damages', 'responsible'])
-        has_confidentiality = any(term in text_lower for term in ['confidential', 'non-disclosure', 'proprietary'])
-        has_ip = any(term in text_lower for term in ['copyright', 'patent', 'intellectual property', 'trademark'])
-        has_dispute = any(term in text_lower for term in ['arbitration', 'mediation', 'court', 'dispute'])
+        has_payment = 'payment' in summary_hits
+        has_termination = 'termination' in summary_hits
+        has_liability = 'liability' in summary_hits
+        has_confidentiality = 'confidentiality' in summary_hits
+        has_ip = 'ip' in summary_hits
+        has_dispute = 'dispute' in summary_hits
         
         # Build comprehensive summary
         summary_parts = []
@@ -387,28 +570,16 @@ class ContractAnalyzer:
             summary_parts.append(f"The agreement specifies {' and '.join(additional_info)}.")
         
         # Risk assessment context
-        risk_context = self._get_summary_risk_context(text_lower)
+        risk_context = self._get_summary_risk_context(doc)
         if risk_context:
             summary_parts.append(risk_context)
         
         return " ".join(summary_parts)
     
-    def _get_summary_risk_context(self, text_lower: str) -> str:
+    def _get_summary_risk_context(self, doc: ParsedDocument) -> str:
         """Add risk context to summary"""
-        high_risk_indicators = ['unlimited liability', 'sole discretion', 'irrevocable', 'automatic renewal']
-        protective_clauses = ['limited liability', 'mutual termination', 'reasonable notice', 'force majeure']
-        
-        high_risks = [term for term in high_risk_indicators if term in text_lower]
-        protections = [term for term in protective_clauses if term in text_lower]
-        
-        if high_risks and not protections:
-            return "The contract contains some terms that may require careful review for potential risks."
-        elif protections and not high_risks:
-            return "The agreement includes several protective clauses that help balance the interests of both parties."
-        elif high_risks and protections:
-            return "The contract has a mix of standard protective clauses and some terms that warrant closer examination."
-        
-        return "The contract appears to follow standard commercial practices with typical terms and conditions."
+        found = {hit.category for hit in doc.hits if hit.group == 'summary_risk'}
+        return SUMMARY_RISK_CONTEXT['high_risk' in found, 'protective' in found]
     
     def _generate_suggestions(self, risks: Dict, contract_type: str) -> str:
         suggestions = []
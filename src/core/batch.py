@@ -0,0 +1,178 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Optional, Union
+from utils.file_handler import FileHandler
+from .profiling import profile_mode
+
+# One analyzer per worker process, created by the pool initializer so every
+# worker loads spaCy and the LLM exactly once
+_worker_analyzer = None
+
+
+def _init_worker():
+    global _worker_analyzer
+    from .analyzer import ContractAnalyzer
+    _worker_analyzer = ContractAnalyzer()
+
+
+def _is_path(item: Union[str, os.PathLike]) -> bool:
+    if isinstance(item, os.PathLike):
+        return True
+    if '\n' in item or len(item) > 4096:
+        return False
+    return os.path.isfile(item) or os.path.splitext(item)[1].lower() in FileHandler.MIME_TYPES
+
+
+def analyze_item(analyzer, item: Union[str, os.PathLike]) -> Dict:
+    """Analyze one text or file path; failures come back as {'error': ...}"""
+    try:
+        if not _is_path(item):
+            return analyzer.analyze_contract(item)
+        
+        file_handler = FileHandler()
+        text = file_handler.extract_path(os.fspath(item))
+        if not text:
+            return {'error': f"Could not extract text from {os.fspath(item)}"}
+        result = analyzer.analyze_contract(text)
+        if file_handler.skipped_pages:
+            result['skipped_pages'] = {str(page): reason for page, reason in file_handler.skipped_pages.items()}
+        return result
+    except Exception as e:
+        return {'error': f"{type(e).__name__}: {e}"}
+
+
+def analyze_bytes(analyzer, data: bytes, mime_type: str, cache=None,
+                  progress: Optional[Callable[[str], None]] = None, profile: Optional[str] = None) -> Optional[Dict]:
+    """Extract and analyze an uploaded file, reusing any cached result for the same bytes.
+
+    Returns None when no text could be extracted. ``progress`` receives
+    'extract' and then each analysis stage name as it finishes. A profiled
+    run (see ContractAnalyzer.analyze_contract) bypasses the cache and
+    includes extraction in its stage timings.
+    """
+    file_handler = FileHandler()
+    mode = profile_mode(profile)
+    
+    def compute():
+        start = time.perf_counter()
+        text = file_handler.extract_bytes(data, mime_type)
+        extract_seconds = time.perf_counter() - start
+        if progress:
+            progress('extract')
+        if not text:
+            return None
+        result = analyzer.analyze_contract(text, progress, mode)
+        if file_handler.skipped_pages:
+            result['skipped_pages'] = {str(page): reason for page, reason in file_handler.skipped_pages.items()}
+        if 'profile' in result:
+            result['profile']['stages'] = {'extract': round(extract_seconds, 6), **result['profile']['stages']}
+            result['profile']['total_seconds'] = round(result['profile']['total_seconds'] + extract_seconds, 6)
+        return result
+    
+    if cache is None or mode != 'off':
+        return compute()
+    return cache.get_or_compute(data, analyzer.fingerprint(), compute)
+
+
+def _analyze_in_worker(item: Union[str, os.PathLike]) -> Dict:
+    return analyze_item(_worker_analyzer, item)
+
+
+class BatchStats:
+    def __init__(self):
+        self.documents = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.documents / self.elapsed if self.elapsed else 0.0
+
+
+def analyze_many(items: Iterable[Union[str, os.PathLike]], workers: Optional[int] = None,
+                 chunksize: int = 4, analyzer=None, stats: Optional[BatchStats] = None) -> Iterator[Dict]:
+    """Analyze texts or file paths across a process pool, yielding results in input order.
+
+    ``workers=1`` runs in the calling process, reusing ``analyzer`` if given.
+    """
+    stats = stats if stats is not None else BatchStats()
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        if analyzer is None:
+            from .analyzer import ContractAnalyzer
+            analyzer = ContractAnalyzer()
+        results = (analyze_item(analyzer, item) for item in items)
+        for result in results:
+            stats.documents += 1
+            stats.errors += 'error' in result
+            yield result
+        return
+
+    # Import the heavy modules (spaCy, streamlit) before the pool forks so
+    # workers inherit them instead of each paying the import again
+    from . import analyzer  # noqa: F401
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for result in pool.map(_analyze_in_worker, items, chunksize=chunksize):
+            stats.documents += 1
+            stats.errors += 'error' in result
+            yield result
+
+
+def _read_for_triage(item: Union[str, os.PathLike]) -> Union[str, Dict]:
+    """The text to triage for one text or file path, or {'error': ...}"""
+    if not _is_path(item):
+        return item
+    try:
+        text = FileHandler().extract_path(os.fspath(item))
+        return text if text else {'error': f"Could not extract text from {os.fspath(item)}"}
+    except Exception as e:
+        return {'error': f"{type(e).__name__}: {e}"}
+
+
+def triage_many(items: Iterable[Union[str, os.PathLike]], triage=None, chunk_size: int = 1000,
+                stats: Optional[BatchStats] = None, workers: Optional[int] = 1, chunksize: int = 4) -> Iterator[Dict]:
+    """Rule-only scores (see RuleTriage) for texts or file paths, scored ``chunk_size`` at a time, in input order.
+
+    Scoring is vectorized in this process; with ``workers`` > 1 (None: CPU
+    count) the files of each chunk are read across a process pool first.
+    """
+    if triage is None:
+        from .triage import RuleTriage
+        triage = RuleTriage()
+    stats = stats if stats is not None else BatchStats()
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    
+    def flush(chunk):
+        if pool is not None:
+            # Only files go to the pool; texts are used as they are
+            paths = [item for item in chunk if _is_path(item)]
+            read = iter(pool.map(_read_for_triage, paths, chunksize=chunksize))
+            chunk = [next(read) if _is_path(item) else item for item in chunk]
+        else:
+            chunk = [_read_for_triage(item) for item in chunk]
+        scored = iter(triage.triage([text for text in chunk if not isinstance(text, dict)]))
+        for entry in chunk:
+            result = entry if isinstance(entry, dict) else next(scored)
+            stats.documents += 1
+            stats.errors += 'error' in result
+            yield result
+    
+    try:
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) == chunk_size:
+                yield from flush(chunk)
+                chunk = []
+        yield from flush(chunk)
+    finally:
+        if pool is not None:
+            pool.shutdown()
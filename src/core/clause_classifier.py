@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+from .similarity import PLACEHOLDER, ROOT, collect_template_sections
+
+EXAMPLES_PATH = os.path.join(ROOT, 'data', 'clause_examples.json')
+# Held-out labelled sentences the default threshold and margin were tuned on
+EVAL_PATH = os.path.join(ROOT, 'data', 'clause_eval.json')
+
+# Template sections whose text describes each clause type the analyzer reports
+CLAUSE_SECTIONS = {
+    'payment': ['payment', 'compensation', 'pricing'],
+    'termination': ['termination'],
+    'liability': ['liability'],
+    'confidentiality': ['confidentiality'],
+    'intellectual_property': ['ip_rights'],
+    'dispute_resolution': ['governing_law'],
+    'force_majeure': ['force_majeure'],
+    'warranty': ['warranty', 'quality']
+}
+
+# Label of the examples that are no clause type in particular. A sentence
+# closer to this centroid than to a clause type's is not reported as that type.
+BACKGROUND = 'general'
+
+# Party and role names appear in every kind of clause (and in signature and
+# address blocks), so they are ignored along with the English stop words
+PARTY_TERMS = ['agreement', 'buyer', 'client', 'company', 'consultant', 'contractor', 'employee', 'employer',
+               'parties', 'party', 'provider', 'seller', 'service', 'shall', 'supplier', 'vendor']
+
+
+def training_examples(path: str = EXAMPLES_PATH,
+                      template_sections: Optional[Dict[str, Dict[str, str]]] = None) -> Dict[str, List[str]]:
+    """Labelled sentences from ``path`` plus every sentence of the matching template sections"""
+    with open(path, encoding='utf-8') as f:
+        examples = {label: list(sentences) for label, sentences in json.load(f).items()}
+
+    template_sections = template_sections if template_sections is not None else collect_template_sections()
+    for clause_type, section_names in CLAUSE_SECTIONS.items():
+        for sections in template_sections.values():
+            for name in section_names:
+                for sentence in re.split(r'[.\n]', PLACEHOLDER.sub(' ', sections.get(name, ''))):
+                    sentence = sentence.strip(' -')
+                    if len(sentence) > 20:
+                        examples.setdefault(clause_type, []).append(sentence)
+    return examples
+
+
+class ClauseClassifier:
+    """Assign clause types to sentences by cosine similarity to per-type centroids.
+
+    Every labelled example is embedded with one TF-IDF vectorizer and each
+    label's examples are averaged into a centroid, once. Classifying a
+    contract is then a single sparse product of its sentence vectors with
+    the centroid matrix. A sentence belongs to every clause type it scores
+    at least ``threshold`` against and more than ``margin`` above the
+    background centroid, and each type keeps its ``top_k`` best sentences.
+    """
+
+    def __init__(self, examples: Optional[Dict[str, List[str]]] = None, threshold: float = 0.12,
+                 top_k: int = 2, margin: float = 0.05):
+        from scipy.sparse import csr_matrix
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, TfidfVectorizer
+        from sklearn.preprocessing import normalize
+
+        self.examples = examples if examples is not None else training_examples()
+        self.threshold = threshold
+        self.top_k = top_k
+        self.margin = margin
+        self.labels = list(self.examples)
+
+        texts, owners = [], []
+        for index, label in enumerate(self.labels):
+            texts.extend(self.examples[label])
+            owners.extend([index] * len(self.examples[label]))
+
+        # Unigrams only: bigrams spread short sentences over terms few examples share
+        self.vectorizer = TfidfVectorizer(stop_words=sorted(ENGLISH_STOP_WORDS.union(PARTY_TERMS)), sublinear_tf=True)
+        vectors = self.vectorizer.fit_transform(texts)
+        # Summing a label's unit-length example vectors and renormalizing gives the normalized mean
+        membership = csr_matrix(([1.0] * len(texts), (owners, range(len(texts)))), shape=(len(self.labels), len(texts)))
+        self.centroids = normalize(membership @ vectors).T.tocsr()
+
+    @classmethod
+    def from_env(cls) -> 'ClauseClassifier':
+        return cls(threshold=float(os.environ.get('CLAUSE_CLASSIFIER_THRESHOLD', 0.12)),
+                   top_k=int(os.environ.get('CLAUSE_CLASSIFIER_TOP_K', 2)),
+                   margin=float(os.environ.get('CLAUSE_CLASSIFIER_MARGIN', 0.05)))
+
+    def fingerprint(self) -> str:
+        payload = json.dumps([self.examples, self.threshold, self.top_k, self.margin, PARTY_TERMS], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+
+    def scores(self, sentences: Sequence[str]):
+        """(sentences x labels) cosine similarity array"""
+        import numpy as np
+
+        if not sentences:
+            return np.zeros((0, len(self.labels)))
+        return (self.vectorizer.transform(sentences) @ self.centroids).toarray()
+
+    def classify(self, sentences: Sequence[str]) -> Dict[str, List[Tuple[int, float]]]:
+        """clause type -> up to ``top_k`` (sentence index, score) pairs, best first"""
+        import numpy as np
+
+        scores = self.scores(sentences)
+        eligible = scores >= self.threshold
+        if BACKGROUND in self.labels:
+            # Strictly above, so a sentence tied with the background (e.g. both 0) is not classified
+            eligible &= scores > scores[:, [self.labels.index(BACKGROUND)]] + self.margin
+
+        classified = {}
+        for column, label in enumerate(self.labels):
+            if label == BACKGROUND:
+                continue
+            candidates = np.flatnonzero(eligible[:, column])
+            # Stable sort so equally scored sentences keep document order
+            best = candidates[np.argsort(-scores[candidates, column], kind='stable')[:self.top_k]]
+            if len(best):
+                classified[label] = [(int(index), round(float(scores[index, column]), 3)) for index in best]
+        return classified
@@ -0,0 +1,90 @@
+import threading
+from bisect import bisect_right
+from typing import Any, List, NamedTuple, Optional
+from .matcher import PatternHit, PatternMatcher
+
+
+class Sentence(NamedTuple):
+    start: int
+    end: int
+    text: str
+    lower: str
+    hits: List[PatternHit]
+
+
+class ParsedDocument:
+    """Contract text prepared once per analysis and shared by every stage.
+
+    Holds the normalized text, its lowercase form, the '.'-delimited sentence
+    boundaries as offsets and, when a matcher is given, the keyword hits
+    bucketed per sentence. Extracted entities are cached here as well so each
+    analysis runs NER at most once, even when concurrent stages ask for them
+    together. Hits found earlier (e.g. reused from a previous revision) can
+    be passed in place of a matcher, and entities seeded the same way.
+    """
+
+    def __init__(self, text: str, matcher: Optional[PatternMatcher] = None,
+                 hits: Optional[List[PatternHit]] = None):
+        self.text = self._normalize(text)
+        self.lower = self._lowercase(self.text)
+        if hits is not None:
+            self.hits = hits
+        else:
+            self.hits = matcher.scan(self.lower) if matcher else []
+        self.sentences = self._split_sentences()
+        self._entities = None
+        self._entities_lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+
+    @staticmethod
+    def _lowercase(text: str) -> str:
+        lower = text.lower()
+        if len(lower) != len(text):
+            # A few characters (e.g. 'İ') lowercase to two code points; keep
+            # the first so offsets stay valid in both forms
+            lower = ''.join(char.lower()[0] for char in text)
+        return lower
+
+    def _split_sentences(self) -> List[Sentence]:
+        boundaries = []
+        start = 0
+        while True:
+            end = self.text.find('.', start)
+            if end == -1:
+                boundaries.append((start, len(self.text)))
+                break
+            boundaries.append((start, end))
+            start = end + 1
+
+        starts = [start for start, _ in boundaries]
+        buckets = [[] for _ in boundaries]
+        for hit in self.hits:
+            buckets[bisect_right(starts, hit.start) - 1].append(hit)
+
+        return [
+            Sentence(start, end, self.text[start:end], self.lower[start:end], bucket)
+            for (start, end), bucket in zip(boundaries, buckets)
+        ]
+
+    def entities(self, extractor) -> List[Any]:
+        if self._entities is None:
+            with self._entities_lock:
+                if self._entities is None:
+                    self._entities = extractor.extract(self)
+        return self._entities
+
+    def seed_entities(self, entities: List[Any]):
+        """Use entities found earlier (e.g. carried over from a previous revision) instead of running NER"""
+        with self._entities_lock:
+            self._entities = entities
+
+    @property
+    def extracted_entities(self) -> List[Any]:
+        """Entities extracted or seeded so far, without running NER"""
+        return self._entities or []
+
+    def __len__(self) -> int:
+        return len(self.text)
@@ -0,0 +1,177 @@
+from bisect import bisect_left
+from difflib import SequenceMatcher
+from typing import Callable, Dict, List, Optional, Tuple
+from .document import ParsedDocument
+from .matcher import PatternHit
+from .ner import Entity
+from .profiling import StageTimer
+
+SNAPSHOT_VERSION = 1
+
+
+class RevisionSnapshot:
+    """What one analyzed version leaves behind for diffing the next one.
+
+    The text plus every keyword hit and entity found in it, so a later
+    revision can reuse them for the sentences it shares. Serializes to plain
+    JSON for storage in session state, a cache or a database.
+    """
+
+    def __init__(self, fingerprint: str, text: str, hits: List[PatternHit], entities: List[Entity], result: Dict):
+        self.fingerprint = fingerprint
+        self.text = text
+        self.hits = hits
+        self.entities = entities
+        self.result = result
+
+    @classmethod
+    def from_document(cls, fingerprint: str, doc: ParsedDocument, result: Dict) -> 'RevisionSnapshot':
+        return cls(fingerprint, doc.text, doc.hits, doc.extracted_entities, result)
+
+    def to_dict(self) -> Dict:
+        return {
+            'version': SNAPSHOT_VERSION,
+            'fingerprint': self.fingerprint,
+            'text': self.text,
+            'hits': [list(hit) for hit in self.hits],
+            'entities': [list(ent) for ent in self.entities],
+            'result': self.result
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RevisionSnapshot':
+        if data.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {data.get('version')}")
+        return cls(data['fingerprint'], data['text'], [PatternHit(*hit) for hit in data['hits']],
+                   [Entity(*ent) for ent in data['entities']], data['result'])
+
+
+def diff_sentences(old: List[str], new: List[str]) -> List[Tuple[str, int, int, int, int]]:
+    """difflib opcodes between two sentence lists.
+
+    The shared head and tail are matched directly first since revisions
+    usually touch a few clauses. SequenceMatcher only sees the middle, and
+    its autojunk heuristic may report a very common boilerplate sentence as
+    changed there, which costs a rescan of that sentence and nothing else.
+    """
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+
+    opcodes = [('equal', 0, prefix, 0, prefix)] if prefix else []
+    middle = SequenceMatcher(None, old[prefix:len(old) - suffix], new[prefix:len(new) - suffix])
+    for tag, old_start, old_end, new_start, new_end in middle.get_opcodes():
+        opcodes.append((tag, old_start + prefix, old_end + prefix, new_start + prefix, new_end + prefix))
+    if suffix:
+        opcodes.append(('equal', len(old) - suffix, len(old), len(new) - suffix, len(new)))
+    return opcodes
+
+
+def risk_delta(before: Dict, after: Dict) -> Dict:
+    """Which risks, clause risk levels and overall score changed between two analyses"""
+    old_risks, new_risks = before.get('risks', {}), after.get('risks', {})
+    old_clauses, new_clauses = before.get('clause_risk_scores', {}), after.get('clause_risk_scores', {})
+    return {
+        'risks': {
+            'added': {name: new_risks[name] for name in new_risks if name not in old_risks},
+            'removed': {name: old_risks[name] for name in old_risks if name not in new_risks},
+            'changed': {name: {'before': old_risks[name], 'after': new_risks[name]}
+                        for name in new_risks if name in old_risks and old_risks[name] != new_risks[name]}
+        },
+        'clause_risk_scores': {name: {'before': old_clauses.get(name), 'after': new_clauses.get(name)}
+                               for name in sorted(set(old_clauses) | set(new_clauses))
+                               if old_clauses.get(name) != new_clauses.get(name)},
+        'composite_risk_score': {'before': before.get('composite_risk_score'),
+                                 'after': after.get('composite_risk_score')}
+    }
+
+
+class IncrementalAnalyzer:
+    """Re-analyze a revised contract by redoing detection only where it changed.
+
+    The new version is split into sentences and diffed against the previous
+    snapshot. Unchanged sentences keep their keyword hits and entities; the
+    matcher and NER only run on inserted or edited sentences. The spliced
+    hits and entities then go through the analyzer's normal stages, so
+    clauses, risks and ambiguities come out exactly as a full run would
+    produce them. The one approximation is that an unchanged sentence keeps
+    the entities NER found in its old surroundings.
+
+    Only keyword matching and NER are incremental. The stages that read the
+    whole document still do so on every revision: the TF-IDF clause
+    classifier, template similarity, the contract type model and the LLM
+    summary and suggestions. With an LLM configured those dominate, and an
+    edit saves little more than the NER time.
+    """
+
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+
+    def analyze(self, text: str, previous: Optional[RevisionSnapshot] = None,
+                progress: Optional[Callable[[str], None]] = None) -> Tuple[Dict, RevisionSnapshot]:
+        """Return (result, snapshot); with ``previous`` the result gains a 'revision' section"""
+        analyzer = self.analyzer
+        fingerprint = analyzer.fingerprint()
+        timer = StageTimer()
+
+        if previous is None or previous.fingerprint != fingerprint:
+            # Rules or models changed since the snapshot, so nothing in it can be reused
+            doc = analyzer.parse(text)
+            reused = 0
+        else:
+            doc, reused = self._splice(text, previous)
+        result = analyzer._run_stages(doc, timer, progress)
+        snapshot = RevisionSnapshot.from_document(fingerprint, doc, result)
+
+        if previous is not None:
+            result['revision'] = dict(
+                risk_delta(previous.result, result),
+                sentences={'total': len(doc.sentences), 'reused': reused,
+                           'reanalyzed': len(doc.sentences) - reused}
+            )
+        return result, snapshot
+
+    def _splice(self, text: str, previous: RevisionSnapshot) -> Tuple[ParsedDocument, int]:
+        analyzer = self.analyzer
+        # Sentence boundaries only; hits come from the snapshot or a scan of the changed sentences
+        old, layout = ParsedDocument(previous.text), ParsedDocument(text)
+        hit_starts = [hit.start for hit in previous.hits]
+        entity_starts = [ent.start for ent in previous.entities]
+
+        hits, entities, changed = [], [], []
+        for tag, old_start, old_end, new_start, new_end in diff_sentences(
+                [sentence.text for sentence in old.sentences], [sentence.text for sentence in layout.sentences]):
+            if tag == 'equal':
+                # A run of unchanged sentences moves as one block, so everything in it shifts by the same amount
+                low, high = old.sentences[old_start].start, old.sentences[old_end - 1].end
+                shift = layout.sentences[new_start].start - low
+                block_hits = previous.hits[bisect_left(hit_starts, low):bisect_left(hit_starts, high)]
+                block_entities = previous.entities[bisect_left(entity_starts, low):bisect_left(entity_starts, high)]
+                if shift:
+                    block_hits = [PatternHit(group, category, pattern, start + shift)
+                                  for group, category, pattern, start in block_hits]
+                    block_entities = [Entity(ent.text, ent.label, ent.start + shift, ent.end + shift)
+                                      for ent in block_entities]
+                hits.extend(block_hits)
+                entities.extend(block_entities)
+            else:
+                for sentence in layout.sentences[new_start:new_end]:
+                    hits.extend(PatternHit(group, category, pattern, start + sentence.start)
+                                for group, category, pattern, start in analyzer.matcher.scan(sentence.lower))
+                changed.extend(range(new_start, new_end))
+
+        doc = ParsedDocument(text, hits=hits)
+        reused = len(doc.sentences) - len(changed)
+        if analyzer.ner:
+            ner = analyzer.ner
+            if ner.prefilter:
+                candidates = set(ner.prefilter.select(doc))
+                changed = [index for index in changed if index in candidates]
+            entities.extend(ner.extract_spans(doc.text, ner.chunk_spans(doc, changed)))
+            entities.sort(key=lambda ent: ent.start)
+        doc.seed_entities(entities)
+        return doc, reused
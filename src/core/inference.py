@@ -0,0 +1,129 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict, List, NamedTuple
+
+
+class InferenceRequest(NamedTuple):
+    prompt: str
+    max_length: int
+    future: Future
+    enqueued_at: float
+
+
+class BatchingInferenceWorker:
+    """Dedicated thread that runs queued prompts through the model in batches.
+
+    Callers get a Future from ``submit``. The worker blocks for the first
+    pending request, then keeps collecting for up to ``max_wait_ms`` or until
+    ``max_batch_size`` requests are waiting, and hands the batch to
+    ``generate_batch(prompts, max_length)``. Requests with different
+    ``max_length`` are run as separate sub-batches.
+    """
+
+    def __init__(self, generate_batch: Callable[[List[str], int], List[str]],
+                 max_batch_size: int = 8, max_wait_ms: float = 20.0, latency_window: int = 1000):
+        self.generate_batch = generate_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[InferenceRequest]" = queue.Queue()
+        self._stopped = threading.Event()
+
+        self._stats_lock = threading.Lock()
+        self._requests = 0
+        self._batches = 0
+        self._busy_seconds = 0.0
+        self._queue_latencies = deque(maxlen=latency_window)
+
+        self._thread = threading.Thread(target=self._run, name='inference-worker', daemon=True)
+        self._thread.start()
+
+    def submit(self, prompt: str, max_length: int = 100) -> Future:
+        future = Future()
+        if self._stopped.is_set():
+            future.set_exception(RuntimeError("Inference worker is stopped"))
+            return future
+        self._queue.put(InferenceRequest(prompt, max_length, future, time.perf_counter()))
+        return future
+
+    def stop(self, timeout: float = 5.0):
+        self._stopped.set()
+        self._thread.join(timeout)
+
+    def _collect(self) -> List[InferenceRequest]:
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stopped.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            groups: Dict[int, List[InferenceRequest]] = {}
+            for request in batch:
+                groups.setdefault(request.max_length, []).append(request)
+
+            for max_length, requests in groups.items():
+                requests = [request for request in requests if request.future.set_running_or_notify_cancel()]
+                if not requests:
+                    continue
+                try:
+                    outputs = self.generate_batch([request.prompt for request in requests], max_length)
+                    for request, output in zip(requests, outputs):
+                        request.future.set_result(output)
+                except Exception as e:
+                    for request in requests:
+                        request.future.set_exception(e)
+
+            with self._stats_lock:
+                self._requests += len(batch)
+                self._batches += 1
+                self._busy_seconds += time.perf_counter() - started
+                self._queue_latencies.extend(started - request.enqueued_at for request in batch)
+
+        # Fail anything still queued so no caller waits forever
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request.future.set_running_or_notify_cancel():
+                request.future.set_exception(RuntimeError("Inference worker is stopped"))
+
+    def stats(self) -> Dict:
+        """Throughput and queue-latency numbers since the worker started"""
+        with self._stats_lock:
+            latencies = sorted(self._queue_latencies)
+            requests, batches, busy = self._requests, self._batches, self._busy_seconds
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(int(fraction * len(latencies)), len(latencies) - 1)] * 1000
+
+        return {
+            'requests': requests,
+            'batches': batches,
+            'mean_batch_size': requests / batches if batches else 0.0,
+            'requests_per_second': requests / busy if busy else 0.0,
+            'queue_depth': self._queue.qsize(),
+            'queue_latency_ms_p50': percentile(0.5),
+            'queue_latency_ms_p95': percentile(0.95)
+        }
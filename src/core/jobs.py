@@ -0,0 +1,440 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Union
+from .analyzer import ANALYSIS_STAGES, ContractAnalyzer
+from .batch import analyze_bytes
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# Text extraction counts as one stage ahead of the analyzer's own
+JOB_STAGES = ['extract'] + ANALYSIS_STAGES
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    filename TEXT,
+    mime_type TEXT NOT NULL,
+    data BLOB,
+    stage TEXT,
+    stages_done INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, created_at);
+"""
+
+# Same table for PostgreSQL; REAL is single precision there, too coarse for epoch seconds
+POSTGRES_SCHEMA = SCHEMA.replace('BLOB', 'BYTEA').replace('REAL', 'DOUBLE PRECISION')
+
+JOB_COLUMNS = "id, status, filename, stage, stages_done, result, error, attempts, created_at, started_at, finished_at"
+
+
+class JobBackend:
+    """Storage behind JobQueue. Subclass to keep the queue in another database.
+
+    ``claim`` must hand each queued job to exactly one worker, after putting
+    running jobs whose heartbeat is older than ``lease_seconds`` back on the
+    queue (or failing them once they reach ``max_attempts``). Updates from a
+    worker only apply while that worker still holds the job.
+    """
+
+    def submit(self, job_id: str, data: bytes, mime_type: str, filename: Optional[str]):
+        raise NotImplementedError
+
+    def claim(self, worker: str, lease_seconds: float, max_attempts: int) -> Optional[Dict]:
+        """The claimed job's id, filename, mime_type and data, or None when nothing is queued"""
+        raise NotImplementedError
+
+    def heartbeat(self, job_id: str, worker: str):
+        raise NotImplementedError
+
+    def report_stage(self, job_id: str, worker: str, stage: str):
+        raise NotImplementedError
+
+    def complete(self, job_id: str, worker: str, status: str, result: Optional[str], error: Optional[str]):
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """The JOB_COLUMNS of a job, result still JSON text"""
+        raise NotImplementedError
+
+    def counts(self) -> Dict[str, int]:
+        raise NotImplementedError
+
+    def purge(self, finished_before: float) -> int:
+        raise NotImplementedError
+
+
+class SQLiteJobBackend(JobBackend):
+    """Queue in a SQLite file, shared by the worker processes of one host.
+
+    ``claim`` takes the oldest job inside an IMMEDIATE transaction. The
+    database must be on a local disk; WAL mode relies on shared memory,
+    which network filesystems (NFS, SMB) do not provide, so workers on
+    other machines cannot share the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived autocommit connection per call keeps the queue safe to share across threads
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def submit(self, job_id: str, data: bytes, mime_type: str, filename: Optional[str]):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, filename, mime_type, data, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, filename, mime_type, data, time.time())
+            )
+
+    def claim(self, worker: str, lease_seconds: float, max_attempts: int) -> Optional[Dict]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                return self._claim(conn, worker, lease_seconds, max_attempts)
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _claim(self, conn: sqlite3.Connection, worker: str, lease_seconds: float,
+               max_attempts: int) -> Optional[Dict]:
+        self._requeue_stale(conn, lease_seconds, max_attempts)
+        row = conn.execute(
+            "SELECT id, filename, mime_type, data FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+            (QUEUED,)
+        ).fetchone()
+        if row is None:
+            conn.execute("COMMIT")
+            return None
+        now = time.time()
+        conn.execute(
+            "UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, stage = NULL, stages_done = 0, "
+            "started_at = ?, heartbeat_at = ? WHERE id = ?",
+            (RUNNING, worker, now, now, row['id'])
+        )
+        conn.execute("COMMIT")
+        return dict(row)
+
+    def _requeue_stale(self, conn: sqlite3.Connection, lease_seconds: float, max_attempts: int):
+        cutoff = time.time() - lease_seconds
+        conn.execute(
+            "UPDATE jobs SET status = ?, error = 'worker stopped responding', finished_at = ?, data = NULL "
+            "WHERE status = ? AND heartbeat_at < ? AND attempts >= ?",
+            (FAILED, time.time(), RUNNING, cutoff, max_attempts)
+        )
+        conn.execute(
+            "UPDATE jobs SET status = ?, worker = NULL WHERE status = ? AND heartbeat_at < ?",
+            (QUEUED, RUNNING, cutoff)
+        )
+
+    def heartbeat(self, job_id: str, worker: str):
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND worker = ? AND status = ?",
+                         (time.time(), job_id, worker, RUNNING))
+
+    def report_stage(self, job_id: str, worker: str, stage: str):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET stage = ?, stages_done = stages_done + 1, heartbeat_at = ? "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (stage, time.time(), job_id, worker, RUNNING)
+            )
+
+    def complete(self, job_id: str, worker: str, status: str, result: Optional[str], error: Optional[str]):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, data = NULL, finished_at = ? "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (status, result, error, time.time(), job_id, worker, RUNNING)
+            )
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def purge(self, finished_before: float) -> int:
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                                  (DONE, FAILED, finished_before))
+            return cursor.rowcount
+
+
+class PostgresJobBackend(JobBackend):
+    """Queue in a PostgreSQL table, shared by workers on any number of hosts.
+
+    ``claim`` locks the oldest queued row with ``FOR UPDATE SKIP LOCKED``,
+    so concurrent workers each take a different job instead of waiting on
+    one another; stale jobs are requeued the same way. Needs the 'psycopg'
+    package (version 3).
+    """
+
+    def __init__(self, url: str):
+        try:
+            import psycopg
+        except ImportError:
+            raise ImportError("PostgresJobBackend requires the 'psycopg' package: pip install 'psycopg[binary]'")
+        self.url = url
+        self._psycopg = psycopg
+        with self._connect() as conn:
+            conn.execute(POSTGRES_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        from psycopg.rows import dict_row
+        with self._psycopg.connect(self.url, autocommit=True, row_factory=dict_row) as conn:
+            yield conn
+
+    def submit(self, job_id: str, data: bytes, mime_type: str, filename: Optional[str]):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, filename, mime_type, data, created_at) VALUES (%s, %s, %s, %s, %s, %s)",
+                (job_id, QUEUED, filename, mime_type, data, time.time())
+            )
+
+    def claim(self, worker: str, lease_seconds: float, max_attempts: int) -> Optional[Dict]:
+        with self._connect() as conn:
+            self._requeue_stale(conn, lease_seconds, max_attempts)
+            now = time.time()
+            # One statement: the subquery's row lock is held until the UPDATE commits
+            row = conn.execute(
+                "UPDATE jobs SET status = %s, worker = %s, attempts = attempts + 1, stage = NULL, stages_done = 0, "
+                "started_at = %s, heartbeat_at = %s WHERE id = ("
+                "SELECT id FROM jobs WHERE status = %s ORDER BY created_at LIMIT 1 FOR UPDATE SKIP LOCKED"
+                ") RETURNING id, filename, mime_type, data",
+                (RUNNING, worker, now, now, QUEUED)
+            ).fetchone()
+        if row is None:
+            return None
+        row['data'] = bytes(row['data'])
+        return row
+
+    def _requeue_stale(self, conn, lease_seconds: float, max_attempts: int):
+        cutoff = time.time() - lease_seconds
+        # SKIP LOCKED leaves rows another worker is already requeueing to that worker
+        conn.execute(
+            "UPDATE jobs SET status = %s, error = 'worker stopped responding', finished_at = %s, data = NULL "
+            "WHERE id IN (SELECT id FROM jobs WHERE status = %s AND heartbeat_at < %s AND attempts >= %s "
+            "FOR UPDATE SKIP LOCKED)",
+            (FAILED, time.time(), RUNNING, cutoff, max_attempts)
+        )
+        conn.execute(
+            "UPDATE jobs SET status = %s, worker = NULL "
+            "WHERE id IN (SELECT id FROM jobs WHERE status = %s AND heartbeat_at < %s FOR UPDATE SKIP LOCKED)",
+            (QUEUED, RUNNING, cutoff)
+        )
+
+    def heartbeat(self, job_id: str, worker: str):
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET heartbeat_at = %s WHERE id = %s AND worker = %s AND status = %s",
+                         (time.time(), job_id, worker, RUNNING))
+
+    def report_stage(self, job_id: str, worker: str, stage: str):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET stage = %s, stages_done = stages_done + 1, heartbeat_at = %s "
+                "WHERE id = %s AND worker = %s AND status = %s",
+                (stage, time.time(), job_id, worker, RUNNING)
+            )
+
+    def complete(self, job_id: str, worker: str, status: str, result: Optional[str], error: Optional[str]):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = %s, result = %s, error = %s, data = NULL, finished_at = %s "
+                "WHERE id = %s AND worker = %s AND status = %s",
+                (status, result, error, time.time(), job_id, worker, RUNNING)
+            )
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            return conn.execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = %s", (job_id,)).fetchone()
+
+    def counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status").fetchall()
+        return {row['status']: row['count'] for row in rows}
+
+    def purge(self, finished_before: float) -> int:
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM jobs WHERE status IN (%s, %s) AND finished_at < %s",
+                                  (DONE, FAILED, finished_before))
+            return cursor.rowcount
+
+
+def job_backend_from_url(url: str) -> JobBackend:
+    if url.startswith('postgresql://') or url.startswith('postgres://'):
+        return PostgresJobBackend(url)
+    if url.startswith('sqlite://'):
+        return SQLiteJobBackend(url[len('sqlite://'):])
+    raise ValueError(f"Unsupported job queue URL: {url}")
+
+
+class JobQueue:
+    """Persistent analysis job queue.
+
+    Any number of workers can drain the same queue; the backend hands each
+    queued job to exactly one of them. ``location`` is a JobBackend, a
+    postgresql:// or sqlite:// URL, or the path of a SQLite file (the
+    default, for workers on one host). A running job whose worker stops
+    sending heartbeats for ``lease_seconds`` is put back on the queue, up
+    to ``max_attempts`` times. The uploaded bytes are dropped once a job
+    finishes; the result stays retrievable by job id.
+    """
+
+    def __init__(self, location: Union[str, JobBackend], lease_seconds: float = 120.0, max_attempts: int = 3):
+        if isinstance(location, JobBackend):
+            self.backend = location
+        elif '://' in location:
+            self.backend = job_backend_from_url(location)
+        else:
+            self.backend = SQLiteJobBackend(location)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    @classmethod
+    def from_env(cls) -> 'JobQueue':
+        return cls(
+            os.environ.get('ANALYSIS_JOBS_DB', os.path.join('.cache', 'jobs.db')),
+            lease_seconds=float(os.environ.get('ANALYSIS_JOBS_LEASE', 120))
+        )
+
+    def submit(self, data: bytes, mime_type: str, filename: Optional[str] = None) -> str:
+        job_id = uuid.uuid4().hex
+        self.backend.submit(job_id, data, mime_type, filename)
+        return job_id
+
+    def claim(self, worker: str) -> Optional[Dict]:
+        """Take the oldest queued job for ``worker``; returns it with its data, or None"""
+        return self.backend.claim(worker, self.lease_seconds, self.max_attempts)
+
+    def heartbeat(self, job_id: str, worker: str):
+        self.backend.heartbeat(job_id, worker)
+
+    def report_stage(self, job_id: str, worker: str, stage: str):
+        self.backend.report_stage(job_id, worker, stage)
+
+    def complete(self, job_id: str, worker: str, result: Optional[Dict], error: Optional[str] = None):
+        self.backend.complete(job_id, worker, FAILED if error else DONE,
+                              json.dumps(result) if result is not None else None, error)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Status, progress and (once done) result of a job, or None for an unknown id"""
+        job = self.backend.get(job_id)
+        if job is None:
+            return None
+        stages_done = job.pop('stages_done')
+        job['progress'] = 1.0 if job['status'] == DONE else min(stages_done / len(JOB_STAGES), 1.0)
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def counts(self) -> Dict[str, int]:
+        return self.backend.counts()
+
+    def purge(self, older_than_seconds: float) -> int:
+        """Delete finished jobs older than the given age; returns how many were removed"""
+        return self.backend.purge(time.time() - older_than_seconds)
+
+
+class JobWorker:
+    """Claims jobs from a JobQueue and runs them through ContractAnalyzer"""
+
+    def __init__(self, queue: JobQueue, analyzer=None, cache=None, poll_interval: float = 0.5,
+                 worker_id: Optional[str] = None):
+        if analyzer is None:
+            analyzer = ContractAnalyzer()
+        self.queue = queue
+        self.analyzer = analyzer
+        self.cache = cache
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+    def run_once(self) -> bool:
+        """Process one job if any is queued; returns whether one was run"""
+        job = self.queue.claim(self.worker_id)
+        if job is None:
+            return False
+
+        job_id = job['id']
+        stop_heartbeat = threading.Event()
+
+        def beat():
+            # Keeps the lease alive through long single stages such as NER on a big PDF
+            while not stop_heartbeat.wait(self.queue.lease_seconds / 3):
+                self.queue.heartbeat(job_id, self.worker_id)
+
+        heartbeat = threading.Thread(target=beat, daemon=True)
+        heartbeat.start()
+        try:
+            result = analyze_bytes(self.analyzer, job['data'], job['mime_type'], self.cache,
+                                   progress=lambda stage: self.queue.report_stage(job_id, self.worker_id, stage))
+            if result is None:
+                self.queue.complete(job_id, self.worker_id, None, "Could not extract text from file")
+            else:
+                self.queue.complete(job_id, self.worker_id, result)
+        except Exception as e:
+            self.queue.complete(job_id, self.worker_id, None, f"{type(e).__name__}: {e}")
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+        return True
+
+    def run(self, stop: Optional[threading.Event] = None):
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            if not self.run_once():
+                stop.wait(self.poll_interval)
+
+
+def run_workers(processes: int, queue_location: Optional[str] = None):
+    """Start ``processes`` worker processes draining the queue (path or URL) until interrupted"""
+    import multiprocessing
+    workers: List[multiprocessing.Process] = [
+        multiprocessing.Process(target=_worker_main, args=(queue_location,), daemon=True) for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+
+
+def _worker_main(queue_location: Optional[str]):
+    from utils.cache import AnalysisCache
+    queue = JobQueue(queue_location) if queue_location else JobQueue.from_env()
+    JobWorker(queue, cache=AnalysisCache.from_env()).run()
@@ -0,0 +1,249 @@
+import json
+import os
+import re
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+# A line that opens a new clause: "12.", "3.1)", "(a)", "Section 4", "ARTICLE II" or an all-caps heading
+CLAUSE_HEADING = re.compile(
+    r'^\s*(?:\(?\d+(?:\.\d+)*[.)]\s|\([a-z]\)\s|(?i:section|article|clause|schedule)\s+[\dIVXivx]+|[A-Z][A-Z &/,-]{3,}:?\s*$)'
+)
+SENTENCE_END = re.compile(r'(?<=[.;:])\s+')
+
+ANALYSIS_KEYS = ['summary', 'obligations', 'risks', 'suggestions', 'risk_score']
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough GPT token count; English contract text averages about four characters per token"""
+    return len(text) // 4 + 1
+
+
+def max_chars(tokens: int) -> int:
+    """Longest text estimate_tokens counts as at most ``tokens``"""
+    return tokens * 4 - 1
+
+
+def split_clauses(text: str) -> List[str]:
+    """Split a contract into clauses at headings, numbered items and blank lines"""
+    clauses, current = [], []
+    for line in text.splitlines():
+        if (not line.strip() or CLAUSE_HEADING.match(line)) and any(part.strip() for part in current):
+            clauses.append("\n".join(current).strip())
+            current = []
+        if line.strip():
+            current.append(line)
+    if any(part.strip() for part in current):
+        clauses.append("\n".join(current).strip())
+    return clauses
+
+
+def _split_oversized(clause: str, max_tokens: int) -> List[str]:
+    pieces, current = [], ""
+    for sentence in SENTENCE_END.split(clause):
+        while estimate_tokens(sentence) > max_tokens:
+            cut = max_chars(max_tokens)
+            pieces.extend([current] if current else [])
+            pieces.append(sentence[:cut])
+            sentence, current = sentence[cut:], ""
+        if current and estimate_tokens(current + " " + sentence) > max_tokens:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_contract(text: str, max_tokens: int = 1500) -> List[str]:
+    """Pack whole clauses into chunks of at most ``max_tokens``.
+
+    Clauses are never split unless a single clause is over the limit, in
+    which case it is broken on sentence boundaries.
+    """
+    chunks, current = [], []
+    current_tokens = 0
+    for clause in split_clauses(text):
+        for piece in (_split_oversized(clause, max_tokens) if estimate_tokens(clause) > max_tokens else [clause]):
+            tokens = estimate_tokens(piece)
+            if current and current_tokens + tokens > max_tokens:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+class ChatAPIError(Exception):
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class ChatClient:
+    """Minimal client for an OpenAI-compatible /chat/completions endpoint.
+
+    Uses only the standard library so the map-reduce path does not depend on
+    a particular openai package version. OPENAI_API_BASE points it at a
+    proxy, an Azure-style gateway or a local stub server.
+    """
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None, model: str = "gpt-3.5-turbo",
+                 timeout: float = 60.0):
+        self.api_key = api_key
+        self.base_url = (base_url or os.environ.get('OPENAI_API_BASE', 'https://api.openai.com/v1')).rstrip('/')
+        self.model = model
+        self.timeout = timeout
+
+    def complete(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.3) -> str:
+        payload = json.dumps({
+            'model': self.model,
+            'messages': [{'role': 'user', 'content': prompt}],
+            'max_tokens': max_tokens,
+            'temperature': temperature
+        }).encode('utf-8')
+        request = urllib.request.Request(
+            f"{self.base_url}/chat/completions", data=payload, method='POST',
+            headers={'Content-Type': 'application/json', 'Authorization': f"Bearer {self.api_key}"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            # Rate limits and server errors are worth retrying; bad requests and auth failures are not
+            raise ChatAPIError(f"HTTP {e.code}: {e.reason}", retryable=e.code == 429 or e.code >= 500)
+        except (urllib.error.URLError, TimeoutError, OSError) as e:
+            raise ChatAPIError(str(e))
+        return body['choices'][0]['message']['content']
+
+
+def parse_json_reply(content: str) -> Dict:
+    """Parse a model reply as JSON, tolerating a ```json fence around it"""
+    content = content.strip()
+    fenced = re.match(r'^```(?:json)?\s*(.*?)\s*```$', content, re.DOTALL)
+    return json.loads(fenced.group(1) if fenced else content)
+
+
+def _truncate_part(part: Dict, max_tokens: int) -> Dict:
+    """Shorten a part analysis, longest field first, until its JSON fits ``max_tokens``"""
+    part = dict(part)
+    excess = estimate_tokens(json.dumps(part)) - max_tokens
+    while excess > 0:
+        key = max(part, key=lambda name: len(json.dumps(part[name])))
+        value = part[key] if isinstance(part[key], str) else json.dumps(part[key])
+        if not value:
+            break
+        part[key] = value[:max(0, len(value) - excess * 4)]
+        excess = estimate_tokens(json.dumps(part)) - max_tokens
+    return part
+
+
+class MapReduceAnalyzer:
+    """Analyze a whole contract with the chat API instead of its first 3000 characters.
+
+    Map: each clause-aligned chunk is analyzed on its own, at most
+    ``max_workers`` requests at a time, with retries and exponential backoff
+    for rate limits, server errors and malformed JSON. Reduce: one more call
+    merges the per-chunk findings into the summary/obligations/risks/
+    suggestions/risk_score JSON that LegalAssistant has always returned. When
+    the findings are too long for one reduce prompt they are merged in
+    groups first, and parts too long to share a prompt are shortened and
+    merged in adjacent pairs, so no reduce call exceeds ``reduce_tokens``.
+    """
+
+    MAP_PROMPT = """
+            This is part {index} of {total} of a {contract_type} contract.
+            From this part only, list:
+            1. What it covers, in one or two plain business sentences
+            2. Obligations of each party
+            3. Risks or unfavorable terms
+            4. Suggested improvements
+            5. Risk level of this part (Low/Medium/High)
+
+            Contract text:
+            {chunk}
+
+            Respond in JSON format with keys: summary, obligations, risks, suggestions, risk_score
+            """
+
+    REDUCE_PROMPT = """
+            Below are analyses of consecutive parts of one {contract_type} contract, in order.
+            Combine them into one analysis of the whole contract:
+            1. A brief summary in simple business language
+            2. Key obligations for each party
+            3. Potential risks or unfavorable terms
+            4. Suggestions for improvement
+            5. Overall risk score (Low/Medium/High)
+
+            Part analyses:
+            {parts}
+
+            Respond in JSON format with keys: summary, obligations, risks, suggestions, risk_score
+            """
+
+    def __init__(self, client: ChatClient, max_workers: int = 4, max_retries: int = 3,
+                 chunk_tokens: int = 1500, reduce_tokens: int = 3000, backoff_seconds: float = 1.0):
+        self.client = client
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.chunk_tokens = chunk_tokens
+        self.reduce_tokens = reduce_tokens
+        self.backoff_seconds = backoff_seconds
+
+    def _call(self, prompt: str, max_tokens: int) -> Dict:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return parse_json_reply(self.client.complete(prompt, max_tokens=max_tokens))
+            except (ChatAPIError, ValueError, KeyError, IndexError) as e:
+                if attempt == self.max_retries or (isinstance(e, ChatAPIError) and not e.retryable):
+                    raise
+                time.sleep(self.backoff_seconds * 2 ** attempt)
+
+    def analyze(self, text: str, contract_type: str) -> Dict:
+        chunks = chunk_contract(text, self.chunk_tokens)
+        if not chunks:
+            raise ValueError("Contract has no text to analyze")
+
+        prompts = [self.MAP_PROMPT.format(index=index + 1, total=len(chunks), contract_type=contract_type, chunk=chunk)
+                   for index, chunk in enumerate(chunks)]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            parts = list(pool.map(lambda prompt: self._call(prompt, 600), prompts))
+
+        merged = self._reduce(parts, contract_type)
+        return {key: merged.get(key, "") for key in ANALYSIS_KEYS}
+
+    def _reduce(self, parts: List[Dict], contract_type: str) -> Dict:
+        while len(parts) > 1:
+            groups, current, current_tokens = [], [], 0
+            for part in parts:
+                tokens = estimate_tokens(json.dumps(part))
+                if current and current_tokens + tokens > self.reduce_tokens:
+                    groups.append(current)
+                    current, current_tokens = [], 0
+                current.append(part)
+                current_tokens += tokens
+            groups.append(current)
+
+            if len(groups) == 1:
+                return self._merge(parts, contract_type)
+            if len(groups) == len(parts):
+                # No two neighbours fit together: merge adjacent pairs, each part cut to half the budget
+                half = self.reduce_tokens // 2
+                groups = [[_truncate_part(part, half) for part in parts[start:start + 2]] if start + 1 < len(parts)
+                          else [parts[start]] for start in range(0, len(parts), 2)]
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                parts = list(pool.map(
+                    lambda group: group[0] if len(group) == 1 else self._merge(group, contract_type), groups))
+        return parts[0]
+
+    def _merge(self, parts: List[Dict], contract_type: str) -> Dict:
+        prompt = self.REDUCE_PROMPT.format(
+            contract_type=contract_type,
+            parts="\n".join(f"Part {index + 1}: {json.dumps(part)}" for index, part in enumerate(parts))
+        )
+        return self._call(prompt, 1000)
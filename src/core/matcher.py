@@ -0,0 +1,94 @@
+from collections import deque
+from typing import Dict, List, NamedTuple, Tuple
+
+
+class PatternHit(NamedTuple):
+    group: str
+    category: str
+    pattern: str
+    start: int
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.pattern)
+
+
+class PatternMatcher:
+    """Aho-Corasick automaton compiled once from the analyzer keyword dictionaries.
+
+    ``dictionaries`` maps a group name (e.g. ``'clause'``) to a dict of
+    category -> patterns. Patterns are matched as plain substrings, exactly like
+    the ``keyword in text_lower`` checks they replace, so callers should scan the
+    lowercased text.
+    """
+
+    def __init__(self, dictionaries: Dict[str, Dict[str, List[str]]]):
+        self._transitions: List[Dict[str, int]] = [{}]
+        self._outputs: List[List[Tuple[str, str, str]]] = [[]]
+
+        for group, categories in dictionaries.items():
+            for category, patterns in categories.items():
+                for pattern in patterns:
+                    self._add(pattern, (group, category, pattern))
+
+        self._compile()
+
+    @property
+    def state_count(self) -> int:
+        return len(self._transitions)
+
+    def _add(self, pattern: str, output: Tuple[str, str, str]):
+        if not pattern:
+            return
+        state = 0
+        for char in pattern:
+            next_state = self._transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self._transitions)
+                self._transitions[state][char] = next_state
+                self._transitions.append({})
+                self._outputs.append([])
+            state = next_state
+        if output not in self._outputs[state]:
+            self._outputs[state].append(output)
+
+    def _compile(self):
+        """Resolve failure links into a full transition table (a DFA).
+
+        Scanning then costs one dict lookup per character with no failure-link
+        walking at match time.
+        """
+        trie = [dict(edges) for edges in self._transitions]
+        fail = [0] * len(trie)
+        queue = deque()
+
+        for state in trie[0].values():
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            self._outputs[state] = self._outputs[state] + [
+                output for output in self._outputs[fail[state]]
+                if output not in self._outputs[state]
+            ]
+            # Inherit every transition of the failure state that this state lacks
+            for char, target in self._transitions[fail[state]].items():
+                self._transitions[state].setdefault(char, target)
+            for char, child in trie[state].items():
+                fail[child] = self._transitions[fail[state]].get(char, 0)
+                queue.append(child)
+
+    def scan(self, text: str) -> List[PatternHit]:
+        """Return every (possibly overlapping) pattern occurrence in ``text``"""
+        hits = []
+        transitions = self._transitions
+        outputs = self._outputs
+        state = 0
+
+        for index, char in enumerate(text):
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                for group, category, pattern in outputs[state]:
+                    hits.append(PatternHit(group, category, pattern, index - len(pattern) + 1))
+
+        return hits
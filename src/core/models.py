@@ -0,0 +1,71 @@
+import os
+import threading
+from typing import Any, Callable, Dict
+
+
+class ModelRegistry:
+    """Process-wide cache of heavy models, each loaded lazily at most once.
+
+    Loaders are registered by name; the first ``get`` runs the loader under a
+    per-model lock and every later call (from any session or thread) reuses
+    the result. A loader that fails should return ``None`` so the failure is
+    cached too instead of being retried on every rerun.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        with self._registry_lock:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str) -> Any:
+        if name in self._models:
+            return self._models[name]
+
+        lock = self._locks.get(name)
+        if lock is None:
+            raise KeyError(f"No model registered under '{name}'")
+
+        with lock:
+            if name not in self._models:
+                self._models[name] = self._loaders[name]()
+        return self._models[name]
+
+    def is_loaded(self, name: str) -> bool:
+        return self._models.get(name) is not None
+
+    def status(self) -> Dict[str, bool]:
+        return {name: self.is_loaded(name) for name in self._loaders}
+
+    def preload(self):
+        for name in list(self._loaders):
+            self.get(name)
+
+    def unload(self, name: str):
+        with self._registry_lock:
+            self._models.pop(name, None)
+
+
+def _load_spacy():
+    try:
+        import spacy
+        from .ner import NER_UNUSED_COMPONENTS
+        return spacy.load(os.environ.get('SPACY_MODEL', 'en_core_web_sm'), exclude=NER_UNUSED_COMPONENTS)
+    except Exception as e:
+        print(f"spaCy loading failed: {e}")
+        return None
+
+
+def _load_llm():
+    from .simple_llm import SimpleLLM
+    return SimpleLLM()
+
+
+registry = ModelRegistry()
+registry.register('spacy', _load_spacy)
+registry.register('llm', _load_llm)
@@ -0,0 +1,150 @@
+import re
+from bisect import bisect_right
+from typing import Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Components of en_core_web_sm that entity extraction never reads. Its 'ner'
+# component embeds its own tok2vec, so the shared one can go as well.
+NER_UNUSED_COMPONENTS = ['tok2vec', 'tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'senter']
+
+
+MONTHS = [
+    # 'may' is left out: as a modal verb it would flag most obligation sentences
+    'january', 'february', 'march', 'april', 'june', 'july', 'august',
+    'september', 'october', 'november', 'december',
+    'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec'
+]
+
+CURRENCY_WORDS = ['rs', 'inr', 'usd', 'rupee', 'rupees', 'lakh', 'lakhs', 'crore', 'crores', 'dollars']
+
+JURISDICTIONS = [
+    'india', 'delhi', 'new delhi', 'mumbai', 'bangalore', 'bengaluru', 'chennai', 'kolkata',
+    'hyderabad', 'pune', 'ahmedabad', 'noida', 'gurgaon', 'gurugram', 'jaipur', 'lucknow',
+    'maharashtra', 'karnataka', 'tamil nadu', 'kerala', 'telangana', 'gujarat', 'rajasthan',
+    'uttar pradesh', 'west bengal', 'haryana', 'punjab', 'madhya pradesh', 'bihar', 'odisha',
+    'singapore', 'london', 'england', 'united kingdom', 'united states', 'new york',
+    'california', 'delaware', 'dubai'
+]
+
+
+class Entity(NamedTuple):
+    text: str
+    label: str
+    start: int
+    end: int
+
+
+class EntityPrefilter:
+    """Cheap pass selecting the sentences likely to contain an entity.
+
+    A sentence is a candidate when it has a digit, a currency symbol or word, a
+    month name, a known jurisdiction, or a capitalized word that does not open
+    the sentence. ``context_sentences`` is the recall safety margin: that many
+    neighbours on each side of every candidate are sent to NER as well, which
+    catches entities whose only cue landed in an adjacent '.'-split fragment
+    (e.g. "Rs. 5,000").
+    """
+
+    CASED_SIGNALS = re.compile(r"\d|[₹$€£]|[^\s.][ \t]+[A-Z]")
+
+    def __init__(self, context_sentences: int = 1, gazetteer: Optional[List[str]] = None):
+        self.context_sentences = context_sentences
+        words = MONTHS + CURRENCY_WORDS + (gazetteer if gazetteer is not None else JURISDICTIONS)
+        self.lower_signals = re.compile(r"\b(?:" + "|".join(
+            re.escape(word) for word in sorted(set(words), key=len, reverse=True)
+        ) + r")\b")
+
+    def select(self, doc) -> List[int]:
+        """Indices of the sentences to send to NER, in document order"""
+        starts = [sentence.start for sentence in doc.sentences]
+        hits: Set[int] = set()
+
+        for match in self.CASED_SIGNALS.finditer(doc.text):
+            hits.add(bisect_right(starts, match.start()) - 1)
+        for match in self.lower_signals.finditer(doc.lower):
+            hits.add(bisect_right(starts, match.start()) - 1)
+
+        selected = set()
+        last = len(starts) - 1
+        for index in hits:
+            low = max(index - self.context_sentences, 0)
+            high = min(index + self.context_sentences, last)
+            selected.update(range(low, high + 1))
+
+        return sorted(selected)
+
+
+class EntityExtractor:
+    """Run spaCy NER over a long contract in sentence-aligned chunks.
+
+    Chunks are built from the ParsedDocument sentence boundaries so no entity
+    is cut in half, kept well below ``nlp.max_length``, and streamed through
+    ``nlp.pipe``. Entity offsets are shifted back into document coordinates.
+    With a prefilter, only candidate sentences are sent to spaCy.
+    """
+
+    def __init__(self, nlp, chunk_chars: int = 20000, batch_size: int = 16, n_process: int = 1,
+                 prefilter: Optional[EntityPrefilter] = None):
+        self.nlp = nlp
+        self.chunk_chars = chunk_chars
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.prefilter = prefilter
+        self.chars_total = 0
+        self.chars_skipped = 0
+
+    @property
+    def skipped_fraction(self) -> float:
+        """Share of all text seen so far that the prefilter kept away from NER"""
+        return self.chars_skipped / self.chars_total if self.chars_total else 0.0
+
+    def chunk_spans(self, doc, sentence_indices: Optional[Iterable[int]] = None) -> List[Tuple[int, int]]:
+        spans = []
+        chunk_start = None
+        chunk_end = None
+
+        if sentence_indices is None:
+            sentences = doc.sentences
+        else:
+            sentences = [doc.sentences[index] for index in sentence_indices]
+
+        for sentence in sentences:
+            # Sentence ends exclude the '.', include it so the chunk text reads naturally
+            end = min(sentence.end + 1, len(doc.text))
+            gap = chunk_start is not None and sentence.start != chunk_end
+            if chunk_start is not None and (gap or end - chunk_start > self.chunk_chars):
+                spans.append((chunk_start, chunk_end))
+                chunk_start = None
+            if chunk_start is None:
+                chunk_start = sentence.start
+            chunk_end = end
+
+            # A single sentence longer than a chunk is split on whitespace
+            while chunk_end - chunk_start > self.chunk_chars:
+                cut = doc.text.rfind(' ', chunk_start, chunk_start + self.chunk_chars)
+                if cut <= chunk_start:
+                    cut = chunk_start + self.chunk_chars
+                spans.append((chunk_start, cut))
+                chunk_start = cut
+
+        if chunk_start is not None and chunk_end > chunk_start:
+            spans.append((chunk_start, chunk_end))
+        return spans
+
+    def extract(self, doc) -> List[Entity]:
+        candidates = self.prefilter.select(doc) if self.prefilter else None
+        spans = self.chunk_spans(doc, candidates)
+
+        self.chars_total += len(doc.text)
+        self.chars_skipped += len(doc.text) - sum(end - start for start, end in spans)
+        return self.extract_spans(doc.text, spans)
+
+    def extract_spans(self, text: str, spans: Iterable[Tuple[int, int]]) -> List[Entity]:
+        spans = list(spans)
+        texts = (text[start:end] for start, end in spans)
+        entities = []
+
+        for (offset, _), chunk in zip(spans, self.nlp.pipe(texts, batch_size=self.batch_size, n_process=self.n_process)):
+            for ent in chunk.ents:
+                entities.append(Entity(ent.text, ent.label_, offset + ent.start_char, offset + ent.end_char))
+
+        return entities
@@ -0,0 +1,119 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from typing import Callable, Dict, Optional
+from .document import ParsedDocument
+from .profiling import StageTimer
+
+# LLM stages get a deadline by default since the rule-based text is always there to fall back on
+DEFAULT_STAGE_TIMEOUTS = {'summary': 10.0, 'suggestions': 10.0}
+
+
+class StageTimeout(TimeoutError):
+    pass
+
+
+def parse_timeouts(spec: str) -> Dict[str, float]:
+    """Parse "summary=5,suggestions=5,entities=30" into a stage -> seconds dict"""
+    timeouts = {}
+    for item in spec.split(','):
+        if '=' in item:
+            name, seconds = item.split('=', 1)
+            timeouts[name.strip()] = float(seconds)
+    return timeouts
+
+
+class StageOrchestrator:
+    """Runs ContractAnalyzer's stages on a thread pool as soon as their inputs are ready.
+
+    The five rule stages that only need the parsed document start together;
+    the LLM summary starts once the contract type is known and the LLM
+    suggestions once risks are, so generation overlaps the remaining rule
+    work. ``timeouts`` maps stage names (the result keys) to seconds, counted
+    from when the stage was submitted. An LLM stage that misses its deadline
+    is replaced by the rule-based summary or suggestions; any other late stage
+    raises StageTimeout. The result dict is the same as the sequential path's.
+    """
+
+    def __init__(self, analyzer, max_workers: int = 6, timeouts: Optional[Dict[str, float]] = None):
+        self.analyzer = analyzer
+        self.timeouts = dict(DEFAULT_STAGE_TIMEOUTS if timeouts is None else timeouts)
+        self.max_workers = max_workers
+        self.timed_out = 0
+        self._pool = None
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='analysis-stage')
+        return self._pool
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def run(self, doc: ParsedDocument, progress: Optional[Callable[[str], None]] = None,
+            timer: Optional[StageTimer] = None) -> Dict:
+        analyzer = self.analyzer
+        timer = timer or StageTimer()
+        pending = {}
+
+        def result(name: str, fallback: Optional[Callable] = None):
+            value = self._result(name, pending, fallback)
+            if progress:
+                progress(name)
+            return value
+
+        def submit(name: str, fn: Callable, *args):
+            pending[name] = (self.pool.submit(timer.run, name, fn, *args), time.perf_counter())
+
+        submit('type', analyzer._classify_type, doc)
+        submit('entities', analyzer._extract_advanced_entities, doc)
+        submit('clauses', analyzer._extract_clauses_with_subclauses, doc)
+        submit('obligations', analyzer._identify_obligations_rights_prohibitions, doc)
+        submit('risks', analyzer._assess_comprehensive_risks, doc)
+        submit('ambiguities', analyzer._detect_ambiguities, doc)
+
+        contract_type = result('type')
+        submit('summary', analyzer._generate_llm_summary, doc, contract_type)
+
+        clauses = result('clauses')
+        submit('template_similarity', analyzer._match_template_similarity, doc, clauses, contract_type)
+        submit('clause_risk_scores', analyzer._calculate_clause_level_risks, clauses)
+
+        risks = result('risks')
+        submit('suggestions', analyzer._generate_llm_suggestions, risks, contract_type)
+
+        clause_risk_scores = result('clause_risk_scores')
+        composite_risk_score = timer.run('composite_risk_score', analyzer._calculate_composite_risk_score,
+                                         risks, clause_risk_scores)
+        if progress:
+            progress('composite_risk_score')
+
+        return {
+            'type': contract_type,
+            'entities': result('entities'),
+            'clauses': clauses,
+            'obligations': result('obligations'),
+            'risks': risks,
+            'ambiguities': result('ambiguities'),
+            'template_similarity': result('template_similarity'),
+            'clause_risk_scores': clause_risk_scores,
+            'summary': result('summary', fallback=lambda: analyzer._generate_summary(doc, contract_type)),
+            'composite_risk_score': composite_risk_score,
+            'suggestions': result('suggestions', fallback=lambda: analyzer._generate_suggestions(risks, contract_type))
+        }
+
+    def _result(self, name: str, pending: Dict[str, tuple], fallback: Optional[Callable] = None):
+        future, submitted = pending[name]
+        timeout = self.timeouts.get(name)
+        remaining = None if timeout is None else max(timeout - (time.perf_counter() - submitted), 0)
+        try:
+            return future.result(timeout=remaining)
+        except TimeoutError:
+            # A started stage cannot be interrupted; its thread finishes in the background
+            future.cancel()
+            self.timed_out += 1
+            if fallback is None:
+                raise StageTimeout(f"Stage '{name}' did not finish within {timeout}s")
+            return fallback()
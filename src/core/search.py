@@ -0,0 +1,251 @@
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+from .document import ParsedDocument
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    doc_id TEXT NOT NULL UNIQUE,
+    name TEXT,
+    contract_type TEXT,
+    composite_risk TEXT,
+    indexed_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS sentences USING fts5(
+    text, clause_type, risk_type, tags, risk_level UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+"""
+
+# A sentence's rowid is its document's id shifted left by this many bits plus
+# its position, so one document's rows are a rowid range FTS5 deletes cheaply
+ROWID_BITS = 20
+
+# bm25 column weights: text, clause_type, risk_type, tags
+BM25_WEIGHTS = (10.0, 2.0, 2.0, 1.0)
+
+# Matcher hit groups stored per sentence, and the column each one fills
+HIT_FIELDS = {'clause': 'clause_types', 'risk': 'risk_types', 'modality': 'tags', 'ambiguity': 'tags'}
+
+QUERY_TOKEN = re.compile(r'"[^"]*"|\(|\)|[^\s()"]+')
+
+
+def to_match_expression(query: str) -> str:
+    """Turn a free-text query into an FTS5 expression.
+
+    Words must all appear (in any order), "quoted phrases" must appear as
+    written and OR/AND/NOT and parentheses keep their meaning. Everything
+    else is quoted, so punctuation like 'auto-renewal' or 'Rs.' cannot
+    break the query syntax.
+    """
+    parts = []
+    for token in QUERY_TOKEN.findall(query):
+        if token in ('OR', 'AND', 'NOT', '(', ')'):
+            parts.append(token)
+        else:
+            phrase = token.strip('"').replace('"', '')
+            if phrase.strip():
+                parts.append(f'"{phrase}"')
+    return ' '.join(parts)
+
+
+def _any_of(column: str, values: Union[str, Sequence[str]]) -> str:
+    values = [values] if isinstance(values, str) else list(values)
+    # FTS5 strings escape an embedded double quote by doubling it
+    return f"{column} : (" + ' OR '.join('"' + value.replace('"', '""') + '"' for value in values) + ")"
+
+
+class ClauseIndex:
+    """Persistent BM25 search over the sentences of every analyzed contract.
+
+    ``add`` indexes one analyze_contract result: each sentence it reports
+    as a clause, risk instance, obligation, right, prohibition or ambiguity
+    becomes one row carrying its clause types, risk types and tags, so the
+    same sentence found by several stages is stored once. Given the parsed
+    document as well, every other sentence is indexed too, tagged with the
+    categories of its keyword hits. Stored in SQLite FTS5, on the same
+    single host as the job queue database.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> Optional['ClauseIndex']:
+        """The index at CLAUSE_INDEX_DB, or None when indexing is not configured"""
+        path = os.environ.get('CLAUSE_INDEX_DB')
+        return cls(path) if path else None
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def rows(result: Dict, document: Optional[ParsedDocument] = None) -> List[Dict]:
+        """One row per distinct sentence in an analysis result, or in ``document`` when given"""
+        rows: Dict[str, Dict] = {}
+        levels = {'Low': 1, 'Medium': 2, 'High': 3}
+
+        def tag(text: str, field: str, value: str, risk_level: Optional[str] = None):
+            entry = rows.setdefault(text, {'clause_types': [], 'risk_types': [], 'tags': [], 'risk_level': None})
+            if value not in entry[field]:
+                entry[field].append(value)
+            if risk_level and levels[risk_level] > levels.get(entry['risk_level'], 0):
+                entry['risk_level'] = risk_level
+
+        if document is not None:
+            for sentence in document.sentences:
+                text = sentence.text.strip()
+                if not text:
+                    continue
+                rows.setdefault(text, {'clause_types': [], 'risk_types': [], 'tags': [], 'risk_level': None})
+                for hit in sentence.hits:
+                    if hit.group in HIT_FIELDS:
+                        tag(text, HIT_FIELDS[hit.group], 'ambiguous' if hit.group == 'ambiguity' else hit.category)
+        for clause_type, clauses in result.get('clauses', {}).items():
+            for clause in clauses:
+                tag(clause['text'], 'clause_types', clause_type, clause.get('risk_level'))
+        for risk_type, risk in result.get('risks', {}).items():
+            for instance in risk.get('instances', []):
+                tag(instance, 'risk_types', risk_type, risk.get('level'))
+        for kind, sentences in result.get('obligations', {}).items():
+            for sentence in sentences:
+                # 'obligations' -> 'obligation'
+                tag(sentence, 'tags', kind[:-1])
+        for ambiguity in result.get('ambiguities', []):
+            tag(ambiguity['context'], 'tags', 'ambiguous')
+
+        return [dict(entry, text=text) for text, entry in rows.items()]
+
+    def add(self, doc_id: str, result: Dict, name: Optional[str] = None,
+            document: Optional[ParsedDocument] = None):
+        """Index (or re-index) one analyzed contract; re-indexing without a name keeps the old one.
+
+        ``document`` is the contract parsed with the analyzer's matcher
+        (``analyzer.parse(text)``); without it only the sentences the
+        result reports are searchable.
+        """
+        rows = self.rows(result, document)[:(1 << ROWID_BITS) - 1]
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                document = conn.execute("SELECT id FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()
+                if document:
+                    self._delete_sentences(conn, document['id'])
+                    conn.execute("UPDATE documents SET name = COALESCE(?, name), contract_type = ?, composite_risk = ?, indexed_at = ? "
+                                 "WHERE id = ?", (name, result.get('type'), result.get('composite_risk_score'),
+                                                  time.time(), document['id']))
+                    number = document['id']
+                else:
+                    number = conn.execute(
+                        "INSERT INTO documents (doc_id, name, contract_type, composite_risk, indexed_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (doc_id, name, result.get('type'), result.get('composite_risk_score'), time.time())
+                    ).lastrowid
+                conn.executemany(
+                    "INSERT INTO sentences (rowid, text, clause_type, risk_type, tags, risk_level) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [((number << ROWID_BITS) + index, row['text'], ' '.join(row['clause_types']),
+                      ' '.join(row['risk_types']), ' '.join(row['tags']), row['risk_level'])
+                     for index, row in enumerate(rows)]
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    @staticmethod
+    def _delete_sentences(conn: sqlite3.Connection, number: int):
+        conn.execute("DELETE FROM sentences WHERE rowid BETWEEN ? AND ?",
+                     (number << ROWID_BITS, ((number + 1) << ROWID_BITS) - 1))
+
+    def remove(self, doc_id: str):
+        with self._connect() as conn:
+            document = conn.execute("SELECT id FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()
+            if document:
+                self._delete_sentences(conn, document['id'])
+                conn.execute("DELETE FROM documents WHERE id = ?", (document['id'],))
+
+    def _match(self, query: Optional[str], clause_type, risk_type, tag) -> str:
+        terms = []
+        if query:
+            terms.append(f"text : ({to_match_expression(query)})")
+        if clause_type:
+            terms.append(_any_of('clause_type', clause_type))
+        if risk_type:
+            terms.append(_any_of('risk_type', risk_type))
+        if tag:
+            terms.append(_any_of('tags', tag))
+        if not terms:
+            raise ValueError("Give a query or at least one of clause_type, risk_type or tag")
+        return ' AND '.join(f"({term})" for term in terms)
+
+    def search(self, query: Optional[str] = None, clause_type: Union[str, Sequence[str], None] = None,
+               risk_type: Union[str, Sequence[str], None] = None, tag: Union[str, Sequence[str], None] = None,
+               contract_type: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """Best-matching sentences across the corpus, most relevant first.
+
+        ``clause_type``, ``risk_type`` and ``tag`` accept one value or a list
+        (any of them matches); ``contract_type`` restricts to documents the
+        analyzer classified as that type.
+        """
+        sql = (
+            "SELECT d.doc_id, d.name, d.contract_type, s.text, s.clause_type, s.risk_type, s.tags, s.risk_level, "
+            "snippet(sentences, 0, '[', ']', '…', 24) AS snippet, bm25(sentences, ?, ?, ?, ?) AS score "
+            f"FROM sentences s JOIN documents d ON d.id = s.rowid >> {ROWID_BITS} "
+            "WHERE sentences MATCH ?" + (" AND d.contract_type = ?" if contract_type else "") +
+            " ORDER BY score LIMIT ?"
+        )
+        params = [*BM25_WEIGHTS, self._match(query, clause_type, risk_type, tag)]
+        params += [contract_type] if contract_type else []
+        with self._connect() as conn:
+            rows = conn.execute(sql, params + [limit]).fetchall()
+        return [{
+            'doc_id': row['doc_id'],
+            'name': row['name'],
+            'contract_type': row['contract_type'],
+            'text': row['text'],
+            'snippet': row['snippet'],
+            'clause_types': row['clause_type'].split(),
+            'risk_types': row['risk_type'].split(),
+            'tags': row['tags'].split(),
+            'risk_level': row['risk_level'],
+            # bm25() is lower-is-better; flip it so callers can treat it as a relevance score
+            'score': round(-row['score'], 4)
+        } for row in rows]
+
+    def documents(self, query: Optional[str] = None, clause_type: Union[str, Sequence[str], None] = None,
+                  risk_type: Union[str, Sequence[str], None] = None, tag: Union[str, Sequence[str], None] = None,
+                  contract_type: Optional[str] = None, limit: int = 100) -> List[Dict]:
+        """Contracts with at least one matching sentence, ranked by their best match"""
+        # FTS5 auxiliary functions cannot be aggregated, so rank in a materialized CTE first
+        sql = (
+            "WITH s AS MATERIALIZED (SELECT rowid, bm25(sentences, ?, ?, ?, ?) AS score FROM sentences "
+            "WHERE sentences MATCH ?) "
+            "SELECT d.doc_id, d.name, d.contract_type, d.composite_risk, COUNT(*) AS matches, MIN(s.score) AS score "
+            f"FROM s JOIN documents d ON d.id = s.rowid >> {ROWID_BITS}" + (" WHERE d.contract_type = ?" if contract_type else "") +
+            " GROUP BY d.id ORDER BY score LIMIT ?"
+        )
+        params = [*BM25_WEIGHTS, self._match(query, clause_type, risk_type, tag)]
+        params += [contract_type] if contract_type else []
+        with self._connect() as conn:
+            rows = conn.execute(sql, params + [limit]).fetchall()
+        return [dict(row, score=round(-row['score'], 4)) for row in rows]
+
+    def document_count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
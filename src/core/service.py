@@ -0,0 +1,231 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Optional, Tuple
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+from utils.cache import AnalysisCache
+from utils.compliance import IndianComplianceChecker
+from utils.file_handler import FileHandler
+from utils.metrics import metrics
+from .batch import analyze_bytes
+from .models import registry
+from .profiling import PROFILE_MODES
+from .search import ClauseIndex
+from .templates import TemplateManager
+
+
+class ServiceState:
+    """Analyzer and cache for one server process, loaded in the background at startup"""
+
+    def __init__(self, analyzer_factory: Callable, cache_factory: Callable, preload: bool = True):
+        self.analyzer_factory = analyzer_factory
+        self.cache_factory = cache_factory
+        self.preload = preload
+        self.analyzer = None
+        self.cache = None
+        self.error: Optional[str] = None
+        self.ready = threading.Event()
+
+    def load(self):
+        try:
+            if self.preload:
+                registry.preload()
+            self.cache = self.cache_factory()
+            self.analyzer = self.analyzer_factory()
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            return
+        self.ready.set()
+
+
+class UploadError(Exception):
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _error(message: str, status_code: int) -> JSONResponse:
+    return JSONResponse({'error': message}, status_code=status_code)
+
+
+async def _read_document(request: Request, max_bytes: int) -> Tuple[bytes, str, Optional[str]]:
+    """Return (bytes, mime type, file name) from a multipart ``file`` field or a JSON {"text": ...} body"""
+    too_large = UploadError(f"Document is larger than {max_bytes // (1024 * 1024)} MB", 413)
+    content_type = request.headers.get('content-type', '')
+    if content_type.startswith('application/json'):
+        # The JSON wrapper only adds bytes, so a longer body cannot hold a text within the limit
+        if int(request.headers.get('content-length') or 0) > max_bytes + 1024:
+            raise too_large
+        try:
+            body = await request.json()
+        except ValueError:
+            raise UploadError("Body is not valid JSON")
+        if not isinstance(body, dict) or not isinstance(body.get('text'), str):
+            raise UploadError("JSON body must be an object with a 'text' string")
+        data = body['text'].encode('utf-8')
+        if len(data) > max_bytes:
+            raise too_large
+        return data, 'text/plain', body.get('name')
+
+    if not content_type.startswith('multipart/form-data'):
+        raise UploadError("Send a multipart 'file' upload or a JSON body with 'text'", 415)
+
+    form = await request.form()
+    upload = form.get('file')
+    if upload is None or isinstance(upload, str):
+        raise UploadError("Multipart body must include a 'file' field")
+    data = await upload.read()
+    if len(data) > max_bytes:
+        raise too_large
+
+    mime_type = upload.content_type
+    if mime_type not in FileHandler.MIME_TYPES.values():
+        # Browsers and curl often send application/octet-stream; fall back to the extension
+        mime_type = FileHandler.mime_type_for(upload.filename or '')
+    if not mime_type:
+        raise UploadError("Unsupported file type; upload PDF, DOCX or TXT", 415)
+    return data, mime_type, upload.filename
+
+
+def _search_filters(request: Request) -> Dict:
+    params = request.query_params
+    return {
+        'query': params.get('q'),
+        'clause_type': params.getlist('clause_type') or None,
+        'risk_type': params.getlist('risk_type') or None,
+        'tag': params.getlist('tag') or None,
+        'contract_type': params.get('contract_type')
+    }
+
+
+def create_app(analyzer_factory: Optional[Callable] = None, cache_factory: Optional[Callable] = None,
+               preload: bool = True, max_upload_mb: Optional[int] = None,
+               clause_index: Optional[ClauseIndex] = None) -> Starlette:
+    """Build the JSON API around ContractAnalyzer, TemplateManager and IndianComplianceChecker.
+
+    Models load in a background thread when the server starts, so /health
+    answers immediately and /ready turns 200 once analysis can be served.
+    With a clause index (``clause_index`` or CLAUSE_INDEX_DB) every analyzed
+    upload is added to it and /search queries it.
+    """
+    if analyzer_factory is None:
+        from .analyzer import ContractAnalyzer
+        analyzer_factory = ContractAnalyzer
+    state = ServiceState(analyzer_factory, cache_factory or AnalysisCache.from_env, preload)
+    max_bytes = (max_upload_mb or int(os.environ.get('SERVICE_MAX_UPLOAD_MB', 200))) * 1024 * 1024
+    templates = TemplateManager()
+    compliance = IndianComplianceChecker()
+    index = clause_index if clause_index is not None else ClauseIndex.from_env()
+
+    async def health(request: Request):
+        return JSONResponse({'status': 'ok'})
+
+    async def ready(request: Request):
+        body = {'ready': state.ready.is_set(), 'models': registry.status()}
+        if state.error:
+            body['error'] = state.error
+        if state.ready.is_set():
+            body['fingerprint'] = state.analyzer.fingerprint()
+        return JSONResponse(body, status_code=200 if state.ready.is_set() else 503)
+
+    def index_upload(data: bytes, mime_type: str, result: Dict, name: Optional[str]):
+        # The (possibly cached) result only holds the sentences it reports, so
+        # parse the text again to index every sentence of the contract
+        text = FileHandler().extract_bytes(data, mime_type)
+        document = state.analyzer.parse(text) if text else None
+        # Keyed by content so uploading the same contract again replaces its entry
+        index.add(hashlib.sha256(data).hexdigest()[:32], result, name, document)
+
+    async def analyze(request: Request):
+        if not state.ready.is_set():
+            return _error(state.error or "Models are still loading", 503)
+        profile = request.query_params.get('profile')
+        if profile is not None and profile not in PROFILE_MODES:
+            return _error(f"profile must be one of {', '.join(PROFILE_MODES)}", 400)
+        try:
+            data, mime_type, name = await _read_document(request, max_bytes)
+        except UploadError as e:
+            return _error(str(e), e.status_code)
+        # Analysis is CPU-bound and blocking, so keep it off the event loop
+        result = await run_in_threadpool(analyze_bytes, state.analyzer, data, mime_type, state.cache, None, profile)
+        if result is None:
+            return _error("Could not extract text from file", 422)
+        if index is not None:
+            await run_in_threadpool(index_upload, data, mime_type, result, name)
+        return JSONResponse(result)
+
+    async def search(request: Request):
+        if index is None:
+            return _error("Search index is not configured; set CLAUSE_INDEX_DB", 404)
+        try:
+            limit = int(request.query_params.get('limit', 20))
+            if request.url.path.endswith('/documents'):
+                return JSONResponse({'documents': index.documents(**_search_filters(request), limit=limit)})
+            return JSONResponse({'results': index.search(**_search_filters(request), limit=limit)})
+        except (ValueError, sqlite3.OperationalError) as e:
+            return _error(f"Invalid search: {e}", 400)
+
+    async def export_metrics(request: Request):
+        return PlainTextResponse(metrics.render(), media_type='text/plain; version=0.0.4')
+
+    async def check_compliance(request: Request):
+        try:
+            data, mime_type, _ = await _read_document(request, max_bytes)
+        except UploadError as e:
+            return _error(str(e), e.status_code)
+        text = await run_in_threadpool(FileHandler().extract_bytes, data, mime_type)
+        if not text:
+            return _error("Could not extract text from file", 422)
+        return JSONResponse(compliance.check_compliance(text))
+
+    async def list_templates(request: Request):
+        return JSONResponse(templates.get_all_templates())
+
+    async def get_template(request: Request):
+        template = templates.get_template(request.path_params['name'])
+        if not template:
+            return _error("Template not found", 404)
+        return JSONResponse(template)
+
+    async def render_template(request: Request):
+        name = request.path_params['name']
+        if not templates.get_template(name):
+            return _error("Template not found", 404)
+        try:
+            values = await request.json()
+        except ValueError:
+            values = None
+        if not isinstance(values, dict):
+            return _error("Body must be a JSON object of placeholder values", 400)
+        return JSONResponse({'content': templates.customize_template(name, values)})
+
+    @asynccontextmanager
+    async def lifespan(app):
+        threading.Thread(target=state.load, name='model-preload', daemon=True).start()
+        yield
+
+    app = Starlette(routes=[
+        Route('/health', health),
+        Route('/ready', ready),
+        Route('/metrics', export_metrics),
+        Route('/analyze', analyze, methods=['POST']),
+        Route('/compliance', check_compliance, methods=['POST']),
+        Route('/search', search),
+        Route('/search/documents', search),
+        Route('/templates', list_templates),
+        Route('/templates/{name}', get_template),
+        Route('/templates/{name}/render', render_template, methods=['POST'])
+    ], lifespan=lifespan)
+    app.state.service = state
+    return app
+
+
+def create_default_app() -> Starlette:
+    """Factory for ``uvicorn --factory``; each worker process builds and preloads its own app"""
+    return create_app()
@@ -0,0 +1,164 @@
+import glob
+import hashlib
+import importlib.util
+import os
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+from .templates import TemplateManager
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Template names in the three sources -> the contract types _classify_type returns
+TEMPLATE_TYPES = {
+    'service_agreement': 'service',
+    'employment': 'employment',
+    'employment_agreement': 'employment',
+    'vendor': 'vendor',
+    'vendor_agreement': 'vendor'
+}
+
+# Markdown headings and section keys that name the same section differently
+SECTION_ALIASES = {
+    'scope_of_services': 'scope',
+    'payment_terms': 'payment',
+    'liability_limitation': 'liability',
+    'intellectual_property': 'ip_rights',
+    'position_and_duties': 'position',
+    'probation_period': 'probation',
+    'non_compete_optional': 'non_compete'
+}
+
+PLACEHOLDER = re.compile(r'\[[A-Z_]+\]')
+
+
+def section_key(heading: str) -> str:
+    key = re.sub(r'[^a-z0-9]+', '_', heading.lower()).strip('_')
+    return SECTION_ALIASES.get(key, key)
+
+
+def _load_contract_templates():
+    # contract_templates.py lives at the repository root, outside the src package
+    path = os.path.join(ROOT, 'contract_templates.py')
+    if not os.path.exists(path):
+        return None
+    spec = importlib.util.spec_from_file_location('contract_templates', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.ContractTemplates()
+
+
+def collect_template_sections(template_dir: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+    """contract type -> section -> text, merged from TemplateManager, ContractTemplates and templates/*.md"""
+    sections: Dict[str, Dict[str, List[str]]] = {}
+
+    def add(name: str, section: str, text: str):
+        contract_type = TEMPLATE_TYPES.get(name)
+        text = PLACEHOLDER.sub(' ', text).strip()
+        if contract_type and text:
+            sections.setdefault(contract_type, {}).setdefault(section_key(section), []).append(text)
+
+    managers = [TemplateManager()]
+    try:
+        contract_templates = _load_contract_templates()
+    except Exception:
+        contract_templates = None
+    if contract_templates is not None:
+        managers.append(contract_templates)
+    for manager in managers:
+        for name, template in manager.get_all_templates().items():
+            for section, text in template.get('sections', {}).items():
+                add(name, section, text)
+
+    for path in sorted(glob.glob(os.path.join(template_dir or os.path.join(ROOT, 'templates'), '*.md'))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        with open(path, encoding='utf-8') as f:
+            for block in re.split(r'^## ', f.read(), flags=re.MULTILINE)[1:]:
+                heading, _, body = block.partition('\n')
+                add(name, heading, body)
+
+    return {contract_type: {section: "\n".join(texts) for section, texts in type_sections.items()}
+            for contract_type, type_sections in sections.items()}
+
+
+class TemplateSimilarity:
+    """Compare contracts with the standard templates by TF-IDF cosine similarity.
+
+    The vectorizer and the matrix of every template section are built once.
+    Scoring a contract is one sparse product of its sentence vectors with
+    the section matrix: a section counts as covered by its best-matching
+    sentence, sections below ``threshold`` are reported missing, and
+    detected clause types whose text matches no section of the template
+    above ``threshold`` are reported extra. ``score_many`` does the same for
+    a batch of contracts with a single product.
+    """
+
+    def __init__(self, sections: Optional[Dict[str, Dict[str, str]]] = None, threshold: float = 0.15):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        self.sections = sections if sections is not None else collect_template_sections()
+        self.threshold = threshold
+        # (contract type, section) per matrix row, and each type's row range
+        self.rows: List[Tuple[str, str]] = []
+        self.type_rows: Dict[str, Tuple[int, int]] = {}
+        texts = []
+        for contract_type in sorted(self.sections):
+            start = len(self.rows)
+            for section, text in self.sections[contract_type].items():
+                self.rows.append((contract_type, section))
+                texts.append(text)
+            self.type_rows[contract_type] = (start, len(self.rows))
+
+        self.vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2), sublinear_tf=True)
+        # Rows are L2-normalized, so a dot product is the cosine similarity
+        self.matrix = self.vectorizer.fit_transform(texts).T.tocsr()
+
+    @classmethod
+    def from_env(cls) -> 'TemplateSimilarity':
+        return cls(threshold=float(os.environ.get('TEMPLATE_SIMILARITY_THRESHOLD', 0.15)))
+
+    def fingerprint(self) -> str:
+        payload = repr((sorted((t, sorted(s.items())) for t, s in self.sections.items()), self.threshold))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+
+    def score(self, sentences: Sequence[str], clauses: Dict, contract_type: str) -> Dict:
+        return self.score_many([(sentences, clauses, contract_type)])[0]
+
+    def score_many(self, contracts: Sequence[Tuple[Sequence[str], Dict, str]]) -> List[Dict]:
+        """Score (sentences, clauses, contract type) triples against their type's template"""
+        import numpy as np
+
+        texts, spans = [], []
+        for sentences, clauses, _ in contracts:
+            clause_texts = [(clause_type, clause['text']) for clause_type, items in clauses.items() for clause in items]
+            start = len(texts)
+            texts.extend(sentences)
+            texts.extend(text for _, text in clause_texts)
+            spans.append((start, start + len(sentences), [clause_type for clause_type, _ in clause_texts]))
+
+        similarities = np.zeros((0, len(self.rows)))
+        if texts:
+            similarities = (self.vectorizer.transform(texts) @ self.matrix).toarray()
+
+        return [self._report(similarities, span, contract_type)
+                for span, (_, _, contract_type) in zip(spans, contracts)]
+
+    def _report(self, similarities, span: Tuple[int, int, List[str]], contract_type: str) -> Dict:
+        if contract_type not in self.type_rows:
+            return {'similarity_score': 0, 'missing_clauses': [], 'extra_clauses': [], 'section_scores': {}}
+
+        start, sentences_end, clause_types = span
+        low, high = self.type_rows[contract_type]
+        sections = [section for _, section in self.rows[low:high]]
+        sentence_scores = similarities[start:sentences_end, low:high]
+        coverage = sentence_scores.max(axis=0) if len(sentence_scores) else [0.0] * len(sections)
+
+        best_per_clause: Dict[str, float] = {}
+        for clause_type, row in zip(clause_types, similarities[sentences_end:sentences_end + len(clause_types), low:high]):
+            best_per_clause[clause_type] = max(best_per_clause.get(clause_type, 0.0), float(row.max()))
+
+        return {
+            'similarity_score': round(float(sum(coverage)) / len(sections) * 100, 1),
+            'missing_clauses': [section for section, value in zip(sections, coverage) if value < self.threshold],
+            'extra_clauses': [clause_type for clause_type, value in best_per_clause.items() if value < self.threshold],
+            'section_scores': {section: round(float(value), 3) for section, value in zip(sections, coverage)}
+        }
@@ -1,45 +1,163 @@
-import streamlit as st
-# from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM
-# import torch
+import os
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+from utils.cache import GenerationCache
+from .inference import BatchingInferenceWorker
 
 class SimpleLLM:
-    def __init__(self):
+    """Small local causal LM used for summary and suggestion text.
+
+    LLM_BACKEND selects how it runs: 'none' (the default) keeps the model
+    unloaded and every call returns "LLM not available", 'eager' loads the
+    fp32 transformers model and 'int8' additionally quantizes its linear
+    layers dynamically for faster CPU inference. LLM_THREADS pins the torch
+    thread count. Generation goes through a batching worker so concurrent
+    sessions share forward passes, and finished generations are memoized
+    (LLM_CACHE=0 disables this). LLM_DETERMINISTIC=1 switches to greedy
+    decoding so a cached answer is the one the model would give again.
+    """
+    
+    BACKENDS = ('none', 'eager', 'int8')
+    
+    def __init__(self, backend: Optional[str] = None, threads: Optional[int] = None,
+                 deterministic: Optional[bool] = None):
+        self.model_name = "distilgpt2"  # Lightweight model
+        self.backend = backend or os.environ.get('LLM_BACKEND', 'none')
+        if self.backend not in self.BACKENDS:
+            raise ValueError(f"Unknown LLM backend '{self.backend}', choose from {list(self.BACKENDS)}")
+        self.threads = threads or int(os.environ.get('LLM_THREADS', 0))
+        if deterministic is None:
+            deterministic = os.environ.get('LLM_DETERMINISTIC', '0') == '1'
+        self.deterministic = deterministic
         self.model = None
         self.tokenizer = None
-        self._load_model()
+        self.worker = None
+        self.cache = None
+        if self._load_model():
+            self.worker = BatchingInferenceWorker(
+                self.generate_batch,
+                max_batch_size=int(os.environ.get('LLM_MAX_BATCH_SIZE', 8)),
+                max_wait_ms=float(os.environ.get('LLM_MAX_WAIT_MS', 20))
+            )
+            if os.environ.get('LLM_CACHE', '1') != '0':
+                self.cache = GenerationCache.from_env()
     
-    @st.cache_resource
-    def _load_model(_self):
+    def _load_model(self) -> bool:
+        if self.backend == 'none':
+            return False
         try:
-            model_name = "distilgpt2"  # Lightweight model
-            _self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            _self.model = AutoModelForCausalLM.from_pretrained(model_name)
-            _self.tokenizer.pad_token = _self.tokenizer.eos_token
+            import torch
+            from transformers import AutoTokenizer, AutoModelForCausalLM
+            if self.threads:
+                torch.set_num_threads(self.threads)
+            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            self.model = AutoModelForCausalLM.from_pretrained(self.model_name)
+            self.model.eval()
+            if self.backend == 'int8':
+                self.model = quantize_int8(self.model)
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+            # Decoder-only models must be left-padded so every prompt ends where generation starts
+            self.tokenizer.padding_side = "left"
             return True
-        except:
+        except Exception:
+            self.model = None
             return False
     
-    def generate_text(self, prompt: str, max_length: int = 100) -> str:
-        if not self.model:
-            return "LLM not available"
+    @property
+    def model_id(self) -> str:
+        """Model plus backend, since quantized weights change the generated text"""
+        return f"{self.model_name}-{self.backend}"
+    
+    def decoding_params(self, max_length: int) -> Dict:
+        if self.deterministic:
+            return {'max_length': max_length, 'do_sample': False}
+        return {'max_length': max_length, 'do_sample': True, 'temperature': 0.7}
+    
+    def submit(self, prompt: str, max_length: int = 100) -> Future:
+        """Queue a prompt for the batching worker and return a Future of its text"""
+        if not self.worker:
+            future = Future()
+            future.set_result("LLM not available")
+            return future
+        if self.cache is None:
+            return self.worker.submit(prompt, max_length)
+        
+        key = self.cache.make_key(self.model_id, prompt, self.decoding_params(max_length))
+        cached = self.cache.get(key)
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
         
+        future = Future()
+        self.worker.submit(prompt, max_length).add_done_callback(lambda done: self._remember(key, done, future))
+        return future
+    
+    def _remember(self, key: str, done: Future, future: Future):
+        # Cache before resolving so a caller that waits and immediately repeats the prompt hits
+        if done.cancelled():
+            future.cancel()
+        elif done.exception() is not None:
+            future.set_exception(done.exception())
+        else:
+            self.cache.set(key, done.result())
+            future.set_result(done.result())
+    
+    def generate_text(self, prompt: str, max_length: int = 100) -> str:
         try:
-            inputs = self.tokenizer.encode(prompt, return_tensors="pt", truncate=True, max_length=50)
-            
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    inputs, 
-                    max_length=max_length,
-                    num_return_sequences=1,
-                    temperature=0.7,
-                    do_sample=True,
-                    pad_token_id=self.tokenizer.eos_token_id
-                )
-            
-            generated = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            return generated[len(prompt):].strip()
-        except:
+            return self.submit(prompt, max_length).result()
+        except Exception:
             return "Generation failed"
+    
+    def generate_batch(self, prompts: List[str], max_length: int = 100) -> List[str]:
+        import torch
+        
+        inputs = self.tokenizer(prompts, return_tensors="pt", padding=True, truncation=True, max_length=50)
+        prompt_length = inputs["input_ids"].shape[1]
+        params = self.decoding_params(max_length)
+        del params['max_length']
+        
+        with torch.no_grad():
+            outputs = self.model.generate(
+                **inputs,
+                max_new_tokens=max(max_length - prompt_length, 1),
+                num_return_sequences=1,
+                pad_token_id=self.tokenizer.eos_token_id,
+                **params
+            )
+        
+        return [
+            self.tokenizer.decode(output[prompt_length:], skip_special_tokens=True).strip()
+            for output in outputs
+        ]
+    
+    def stats(self) -> Dict:
+        stats = self.worker.stats() if self.worker else {}
+        if self.cache is not None:
+            stats.update(self.cache.stats())
+        return stats
+
+def quantize_int8(model):
+    """Dynamically quantize a transformers model's linear layers to int8.
+
+    GPT-2 style models keep their attention and MLP projections in
+    transformers' Conv1D, which quantize_dynamic does not recognise, so those
+    are first swapped for equivalent nn.Linear layers.
+    """
+    import torch
+    from transformers.pytorch_utils import Conv1D
+    
+    for parent in list(model.modules()):
+        for name, child in list(parent.named_children()):
+            if isinstance(child, Conv1D):
+                in_features, out_features = child.weight.shape
+                linear = torch.nn.Linear(in_features, out_features)
+                # Conv1D stores its weight transposed relative to nn.Linear
+                linear.weight.data = child.weight.data.t().contiguous()
+                linear.bias.data = child.bias.data
+                setattr(parent, name, linear)
+    
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
 
 # Legal-specific prompts
 LEGAL_PROMPTS = {
@@ -47,4 +165,4 @@ LEGAL_PROMPTS = {
     "risk_assessment": "The main legal risks are",
     "suggestions": "Legal recommendations:",
     "compliance": "For Indian law compliance"
-}
\ No newline at end of file
+}
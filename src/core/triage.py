@@ -0,0 +1,141 @@
+from typing import Dict, List, Optional, Sequence
+from utils.compliance import IndianComplianceChecker
+from .document import ParsedDocument
+
+
+class RuleTriage:
+    """Rule-based scores for many contracts at once, for bulk review.
+
+    Builds one sparse document x pattern count matrix over a fixed
+    vocabulary: the analyzer's contract type, specific risk and summary
+    risk keywords plus the IndianComplianceChecker terms. Every score then
+    comes from matrix products with 0/1 membership matrices, so the
+    per-document Python work is only the pattern counting itself. The
+    results equal the per-document rules: keyword type scores (as with
+    CONTRACT_TYPE_CLASSIFIER=keywords), specific risk levels, the summary
+    risk sentence and check_compliance. Those rules only test whether a
+    keyword occurs, so they use the binarized matrix; the mention counts
+    (how often each type's or risk's keywords occur) come from the counts
+    themselves. Risk instances, clauses and everything else that needs
+    sentences are left to analyze_contract.
+    """
+
+    def __init__(self, analyzer=None, checker: Optional[IndianComplianceChecker] = None):
+        import numpy as np
+
+        if analyzer is None:
+            from .analyzer import ContractAnalyzer
+            analyzer = ContractAnalyzer()
+        self.checker = checker or IndianComplianceChecker()
+        self.contract_types = list(analyzer.contract_patterns)
+        self.risk_types = list(analyzer.specific_risks)
+        self.compliance_items = list(self.checker.compliance_items)
+        self.high_risk_clauses = list(self.checker.high_risk_clauses)
+
+        groups = {
+            'type': analyzer.contract_patterns,
+            'risk': analyzer.specific_risks,
+            'summary_risk': analyzer.summary_risk_terms,
+            # An item counts as present when any of its words is, as in check_compliance
+            'compliance': {item: item.lower().split() for item in self.compliance_items},
+            'high_risk': {clause: [clause] for clause in self.high_risk_clauses}
+        }
+        # Every pattern once, in a fixed column order
+        self.vocabulary: List[str] = []
+        columns: Dict[str, int] = {}
+        for categories in groups.values():
+            for patterns in categories.values():
+                for pattern in patterns:
+                    if pattern not in columns:
+                        columns[pattern] = len(self.vocabulary)
+                        self.vocabulary.append(pattern)
+
+        # (vocabulary x categories) 0/1 matrix per rule group
+        self._membership = {}
+        for name, categories in groups.items():
+            matrix = np.zeros((len(self.vocabulary), len(categories)), dtype=np.int32)
+            for category, patterns in enumerate(categories.values()):
+                for pattern in patterns:
+                    matrix[columns[pattern], category] = 1
+            self._membership[name] = matrix
+        self._summary_groups = list(analyzer.summary_risk_terms)
+
+    def counts(self, texts: Sequence[str]):
+        """Sparse (documents x vocabulary) matrix of non-overlapping pattern occurrence counts.
+
+        The rules are substring tests ('pan' must match inside 'company', as
+        it does for check_compliance), which a token-based CountVectorizer
+        would not reproduce. So each pattern is counted with str.count: one
+        C-level pass over the text per vocabulary entry, i.e. time linear in
+        len(texts) x len(vocabulary) x average text length, and about 57
+        Python calls per document for the default vocabulary.
+        """
+        import numpy as np
+        from scipy.sparse import csr_matrix
+
+        indptr, indices, data = [0], [], []
+        for text in texts:
+            # Lowercased the way ParsedDocument does, so matches agree with the analyzer's
+            lower = ParsedDocument._lowercase(text)
+            for column, pattern in enumerate(self.vocabulary):
+                count = lower.count(pattern)
+                if count:
+                    indices.append(column)
+                    data.append(count)
+            indptr.append(len(indices))
+        return csr_matrix((np.array(data, dtype=np.int32), np.array(indices, dtype=np.int32), np.array(indptr)),
+                          shape=(len(texts), len(self.vocabulary)))
+
+    def score(self, texts: Sequence[str]) -> Dict:
+        """Column-wise scores for every document as NumPy arrays"""
+        import numpy as np
+
+        counts = self.counts(texts)
+        # The rules test presence, so they score the 0/1 matrix; the counts stay intact
+        present = (counts > 0).astype(np.int32)
+        type_scores = present @ self._membership['type']
+        risk_patterns = present @ self._membership['risk']
+        summary = (present @ self._membership['summary_risk']) > 0
+        compliance = (present @ self._membership['compliance']) > 0
+        return {
+            'counts': counts,
+            # Total keyword occurrences per contract type and per risk type
+            'type_mentions': counts @ self._membership['type'],
+            'risk_mentions': counts @ self._membership['risk'],
+            'type_scores': type_scores,
+            # np.argmax keeps the first of tied types, like max() over the keyword dict
+            'type': np.array(self.contract_types)[type_scores.argmax(axis=1)],
+            'risk_levels': np.where(risk_patterns > 1, 'High', np.where(risk_patterns == 1, 'Medium', '')),
+            'high_risk_terms': summary[:, self._summary_groups.index('high_risk')],
+            'protective_terms': summary[:, self._summary_groups.index('protective')],
+            'compliance_items': compliance,
+            'compliance_score': compliance.sum(axis=1),
+            'high_risks': (present @ self._membership['high_risk']) > 0
+        }
+
+    def triage(self, texts: Sequence[str]) -> List[Dict]:
+        """One dict per document in the shapes analyze_contract and check_compliance use"""
+        from .analyzer import SUMMARY_RISK_CONTEXT
+
+        scores = self.score(texts)
+        results = []
+        for row in range(len(texts)):
+            present = scores['compliance_items'][row]
+            results.append({
+                'type': str(scores['type'][row]),
+                'type_scores': dict(zip(self.contract_types, scores['type_scores'][row].tolist())),
+                'risk_levels': {risk_type: str(level) for risk_type, level in zip(self.risk_types, scores['risk_levels'][row])
+                                if level},
+                'risk_mentions': {risk_type: int(count) for risk_type, count in zip(self.risk_types, scores['risk_mentions'][row])
+                                  if count},
+                'summary_risk_context': SUMMARY_RISK_CONTEXT[bool(scores['high_risk_terms'][row]),
+                                                             bool(scores['protective_terms'][row])],
+                'compliance': {
+                    'compliance_score': f"{int(scores['compliance_score'][row])}/{len(self.compliance_items)}",
+                    'missing_items': [item for item, found in zip(self.compliance_items, present) if not found],
+                    'high_risks': [clause for clause, found in zip(self.high_risk_clauses, scores['high_risks'][row])
+                                   if found],
+                    'recommendations': list(self.checker.recommendations)
+                }
+            })
+        return results
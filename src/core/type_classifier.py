@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import random
+from typing import List, Optional, Sequence, Tuple
+from .similarity import ROOT, collect_template_sections
+
+MODEL_PATH = os.path.join(ROOT, 'data', 'contract_type_model.npz')
+EXAMPLES_PATH = os.path.join(ROOT, 'data', 'contract_type_examples.json')
+# Whole contracts written apart from the training sentences, never trained on
+EVAL_PATH = os.path.join(ROOT, 'data', 'contract_type_eval.json')
+
+N_FEATURES = 2 ** 16
+NGRAM_RANGE = (1, 1)
+# Contracts name their type in the title, recitals and first clauses, and
+# hashing the rest of a long document costs time without changing the answer
+MAX_CHARS = 4000
+
+
+def training_corpus(path: str = EXAMPLES_PATH, documents_per_type: int = 200,
+                    seed: int = 0) -> Tuple[List[str], List[str]]:
+    """(texts, labels) built from the labelled sentences and the bundled templates.
+
+    Besides every sentence and template section on its own, short documents
+    are assembled from random handfuls of the same type's sentences so the
+    model also sees the mixture a real contract contains.
+    """
+    with open(path, encoding='utf-8') as f:
+        sentences = json.load(f)
+    for contract_type, sections in collect_template_sections().items():
+        sentences.setdefault(contract_type, []).extend(sections.values())
+
+    rng = random.Random(seed)
+    texts, labels = [], []
+    for contract_type, examples in sentences.items():
+        texts.extend(examples)
+        labels.extend([contract_type] * len(examples))
+        for _ in range(documents_per_type):
+            texts.append(' '.join(rng.sample(examples, min(len(examples), rng.randint(3, 8)))))
+            labels.append(contract_type)
+    return texts, labels
+
+
+class ContractTypeClassifier:
+    """Linear contract type classifier over hashed word counts.
+
+    Hashing needs no vocabulary, so the whole model is the weight matrix
+    and the class names, saved as one compressed .npz. ``predict_batch``
+    vectorizes the first ``max_chars`` of every document in a list and
+    scores them with one sparse product; confidences are softmax
+    probabilities over the types.
+    """
+
+    def __init__(self, classes: Sequence[str], coef, intercept,
+                 n_features: int = N_FEATURES, ngram_range: Tuple[int, int] = NGRAM_RANGE,
+                 max_chars: int = MAX_CHARS):
+        import numpy as np
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.classes = list(classes)
+        self.coef = np.asarray(coef, dtype=np.float32)
+        self.intercept = np.asarray(intercept, dtype=np.float32)
+        self.max_chars = max_chars
+        self.vectorizer = HashingVectorizer(n_features=n_features, ngram_range=tuple(ngram_range),
+                                            alternate_sign=False, norm='l2')
+
+    @classmethod
+    def train(cls, texts: Sequence[str], labels: Sequence[str], C: float = 10.0,
+              n_features: int = N_FEATURES) -> 'ContractTypeClassifier':
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.linear_model import LogisticRegression
+
+        vectorizer = HashingVectorizer(n_features=n_features, ngram_range=NGRAM_RANGE, alternate_sign=False, norm='l2')
+        model = LogisticRegression(C=C, max_iter=1000).fit(vectorizer.transform(texts), labels)
+        return cls(model.classes_, model.coef_, model.intercept_, n_features=n_features)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> Optional['ContractTypeClassifier']:
+        """The model at ``path`` (default: CONTRACT_TYPE_MODEL or the bundled one), or None if unavailable"""
+        path = path or os.environ.get('CONTRACT_TYPE_MODEL', MODEL_PATH)
+        try:
+            import numpy as np
+            with np.load(path) as data:
+                return cls(data['classes'], data['coef'], data['intercept'],
+                           int(data['n_features']), tuple(data['ngram_range']), int(data['max_chars']))
+        except Exception as e:
+            print(f"Contract type model unavailable, using keywords: {e}")
+            return None
+
+    def save(self, path: str = MODEL_PATH):
+        import numpy as np
+        np.savez_compressed(path, classes=np.array(self.classes), coef=self.coef, intercept=self.intercept,
+                            n_features=self.vectorizer.n_features, ngram_range=np.array(self.vectorizer.ngram_range),
+                            max_chars=self.max_chars)
+
+    def fingerprint(self) -> str:
+        digest = hashlib.sha256(json.dumps([self.classes, self.max_chars]).encode('utf-8'))
+        digest.update(self.coef.tobytes())
+        digest.update(self.intercept.tobytes())
+        return digest.hexdigest()[:12]
+
+    def predict_batch(self, texts: Sequence[str]) -> List[Tuple[str, float]]:
+        """(contract type, confidence) per document"""
+        import numpy as np
+
+        if not texts:
+            return []
+        scores = self.vectorizer.transform([text[:self.max_chars] for text in texts]) @ self.coef.T + self.intercept
+        scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+        probabilities = scores / scores.sum(axis=1, keepdims=True)
+        best = probabilities.argmax(axis=1)
+        return [(self.classes[index], round(float(probabilities[row, index]), 3)) for row, index in enumerate(best)]
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        return self.predict_batch([text])[0]
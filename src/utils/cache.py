@@ -0,0 +1,281 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+
+class CacheBackend:
+    """Byte store behind AnalysisCache. Subclass to plug in a shared store."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes):
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """Bounded in-process LRU"""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskBackend(CacheBackend):
+    """One file per entry, evicting least recently used files past max_bytes"""
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._size = self._disk_usage()
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _entries(self):
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith('.json'):
+                yield entry
+
+    def _disk_usage(self) -> int:
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = f.read()
+            os.utime(path)
+            return value
+        except OSError:
+            return None
+
+    def set(self, key: str, value: bytes):
+        # Write-then-rename so readers (or other instances on a shared volume)
+        # never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(value)
+
+        path = self._path(key)
+        with self._lock:
+            try:
+                # Overwriting an entry replaces its bytes rather than adding to them
+                previous = os.stat(path).st_size
+            except OSError:
+                previous = 0
+            os.replace(tmp_path, path)
+            self._size += len(value) - previous
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        size = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if size <= self.max_bytes:
+                break
+            try:
+                entry_size = entry.stat().st_size
+                os.remove(entry.path)
+                size -= entry_size
+            except OSError:
+                pass
+        self._size = size
+
+
+class LocalBackend(CacheBackend):
+    """Unbounded dict store standing in for a shared backend in tests"""
+
+    def __init__(self):
+        self.store: Dict[str, bytes] = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.store.get(key)
+
+    def set(self, key: str, value: bytes):
+        self.store[key] = value
+
+
+class RedisBackend(CacheBackend):
+    """Shared store so several app instances reuse each other's analyses"""
+
+    def __init__(self, url: str, ttl_seconds: int = 7 * 24 * 3600, prefix: str = 'analysis:'):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("RedisBackend requires the 'redis' package: pip install redis")
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes):
+        self.client.set(self.prefix + key, value, ex=self.ttl_seconds)
+
+
+def backend_from_url(url: str) -> CacheBackend:
+    if url.startswith('redis://') or url.startswith('rediss://'):
+        return RedisBackend(url)
+    if url.startswith('file://'):
+        return DiskBackend(url[len('file://'):])
+    raise ValueError(f"Unsupported cache backend URL: {url}")
+
+
+class TieredCache:
+    """Lookups go through the tiers fastest first and hits are copied into the faster tiers"""
+
+    def __init__(self, tiers: List[CacheBackend]):
+        self.tiers = tiers
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        for index, tier in enumerate(self.tiers):
+            try:
+                value = tier.get(key)
+            except Exception:
+                continue
+            if value is not None:
+                for faster in self.tiers[:index]:
+                    try:
+                        faster.set(key, value)
+                    except Exception:
+                        pass
+                return value
+        return None
+
+    def set_bytes(self, key: str, value: bytes):
+        for tier in self.tiers:
+            try:
+                tier.set(key, value)
+            except Exception:
+                pass
+
+
+class AnalysisCache(TieredCache):
+    """Content-addressed cache of analysis results.
+
+    Entries are keyed by the SHA-256 of the uploaded file bytes plus the
+    analyzer fingerprint, so changing rules or models never serves stale
+    results. Lookups go memory -> disk -> shared backend and hits are copied
+    into the faster tiers.
+    """
+
+    def __init__(self, memory_entries: int = 128, disk_dir: Optional[str] = None,
+                 disk_max_bytes: int = 256 * 1024 * 1024, shared: Optional[CacheBackend] = None):
+        tiers = [MemoryBackend(memory_entries)]
+        if disk_dir:
+            tiers.append(DiskBackend(disk_dir, disk_max_bytes))
+        if shared is not None:
+            tiers.append(shared)
+        super().__init__(tiers)
+
+    @classmethod
+    def from_env(cls) -> 'AnalysisCache':
+        shared_url = os.environ.get('ANALYSIS_CACHE_URL')
+        return cls(
+            memory_entries=int(os.environ.get('ANALYSIS_CACHE_ENTRIES', 128)),
+            disk_dir=os.environ.get('ANALYSIS_CACHE_DIR', os.path.join('.cache', 'analysis')),
+            disk_max_bytes=int(os.environ.get('ANALYSIS_CACHE_MAX_MB', 256)) * 1024 * 1024,
+            shared=backend_from_url(shared_url) if shared_url else None
+        )
+
+    @staticmethod
+    def make_key(data: bytes, fingerprint: str) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        return hashlib.sha256(f"{digest}:{fingerprint}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        value = self.get_bytes(key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, result: Dict):
+        self.set_bytes(key, json.dumps(result).encode('utf-8'))
+
+    def get_or_compute(self, data: bytes, fingerprint: str, compute: Callable[[], Optional[Dict]]) -> Optional[Dict]:
+        key = self.make_key(data, fingerprint)
+        result = self.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        result = compute()
+        if result is not None:
+            self.set(key, result)
+        return result
+
+
+class GenerationCache(TieredCache):
+    """Memoized LLM generations keyed by model id, prompt and decoding parameters.
+
+    ContractAnalyzer's prompts come from a few contract types and risk
+    combinations, so most generations repeat. Memory is an LRU; a disk tier
+    keeps entries across restarts when ``disk_dir`` is set.
+    """
+
+    def __init__(self, max_entries: int = 256, disk_dir: Optional[str] = None,
+                 disk_max_bytes: int = 32 * 1024 * 1024):
+        tiers = [MemoryBackend(max_entries)]
+        if disk_dir:
+            tiers.append(DiskBackend(disk_dir, disk_max_bytes))
+        super().__init__(tiers)
+
+    @classmethod
+    def from_env(cls) -> 'GenerationCache':
+        return cls(
+            max_entries=int(os.environ.get('LLM_CACHE_ENTRIES', 256)),
+            disk_dir=os.environ.get('LLM_CACHE_DIR'),
+            disk_max_bytes=int(os.environ.get('LLM_CACHE_MAX_MB', 32)) * 1024 * 1024
+        )
+
+    @staticmethod
+    def make_key(model_id: str, prompt: str, params: Dict) -> str:
+        payload = json.dumps({'model': model_id, 'prompt': prompt, 'params': params}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.get_bytes(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)['text']
+
+    def set(self, key: str, text: str):
+        self.set_bytes(key, json.dumps({'text': text}).encode('utf-8'))
+
+    def stats(self) -> Dict:
+        return {'cache_hits': self.hits, 'cache_misses': self.misses, 'cache_hit_rate': self.hit_rate}
@@ -15,6 +15,12 @@ class IndianComplianceChecker:
             "automatic renewal",
             "exclusive dealing"
         ]
+        
+        self.recommendations = [
+            "Include GST registration details",
+            "Specify governing law as Indian law",
+            "Add dispute resolution mechanism"
+        ]
     
     def check_compliance(self, text: str) -> Dict:
         text_lower = text.lower()
@@ -34,9 +40,5 @@ class IndianComplianceChecker:
             "compliance_score": f"{compliance_score}/{len(self.compliance_items)}",
             "missing_items": missing_items,
             "high_risks": high_risks,
-            "recommendations": [
-                "Include GST registration details",
-                "Specify governing law as Indian law",
-                "Add dispute resolution mechanism"
-            ]
+            "recommendations": list(self.recommendations)
         }
\ No newline at end of file
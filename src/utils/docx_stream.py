@@ -0,0 +1,94 @@
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import IO, Iterator, List, Tuple
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+PARAGRAPH = W + 'p'
+TEXT = W + 't'
+BREAK = W + 'br'
+# Block-level containers dropped from the partial tree once fully read
+BLOCKS = {PARAGRAPH, W + 'tbl', W + 'sdt'}
+# Inline elements python-docx also renders as text
+INLINE_TEXT = {W + 'tab': '\t', W + 'ptab': '\t', W + 'cr': '\n', W + 'noBreakHyphen': '-'}
+
+DOCUMENT_PART = 'word/document.xml'
+HEADER_PART = re.compile(r'^word/header\d*\.xml$')
+FOOTER_PART = re.compile(r'^word/footer\d*\.xml$')
+
+
+def _part_number(name: str) -> int:
+    digits = re.findall(r'\d+', name)
+    return int(digits[-1]) if digits else 0
+
+
+def iter_part_paragraphs(stream: IO[bytes]) -> Iterator[Tuple[str, int]]:
+    """Yield (paragraph text, page breaks inside it) from one WordprocessingML part.
+
+    The part is parsed incrementally and each block is removed from the tree as
+    soon as it ends, so memory stays bounded by the largest single paragraph
+    or table row rather than the whole document. Paragraphs inside tables,
+    content controls and text boxes are included, in document order.
+    """
+    open_elements = []
+    paragraphs: List[List[str]] = []
+    page_breaks: List[int] = []
+
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            open_elements.append(elem)
+            if elem.tag == PARAGRAPH:
+                paragraphs.append([])
+                page_breaks.append(0)
+            continue
+
+        open_elements.pop()
+        tag = elem.tag
+        if paragraphs:
+            if tag == TEXT:
+                paragraphs[-1].append(elem.text or '')
+            elif tag == BREAK:
+                break_type = elem.get(W + 'type', 'textWrapping')
+                if break_type == 'textWrapping':
+                    paragraphs[-1].append('\n')
+                elif break_type == 'page':
+                    page_breaks[-1] += 1
+            elif tag in INLINE_TEXT:
+                paragraphs[-1].append(INLINE_TEXT[tag])
+
+        if tag == PARAGRAPH:
+            yield ''.join(paragraphs.pop()), page_breaks.pop()
+
+        if tag in BLOCKS:
+            elem.clear()
+            if open_elements:
+                open_elements[-1].remove(elem)
+
+
+def iter_docx(file: IO[bytes]) -> Iterator[Tuple[str, int]]:
+    """Yield (paragraph text + newline, page number) for a DOCX file.
+
+    Headers come first, then the body, then footers. Pages are counted from
+    explicit page breaks in the body.
+    """
+    with zipfile.ZipFile(file) as archive:
+        names = archive.namelist()
+        headers = sorted((name for name in names if HEADER_PART.match(name)), key=_part_number)
+        footers = sorted((name for name in names if FOOTER_PART.match(name)), key=_part_number)
+
+        page = 1
+        for name in headers:
+            with archive.open(name) as stream:
+                for text, _ in iter_part_paragraphs(stream):
+                    yield text + "\n", page
+
+        with archive.open(DOCUMENT_PART) as stream:
+            for text, breaks in iter_part_paragraphs(stream):
+                yield text + "\n", page
+                page += breaks
+
+        for name in footers:
+            with archive.open(name) as stream:
+                for text, _ in iter_part_paragraphs(stream):
+                    yield text + "\n", page
@@ -1,31 +1,136 @@
-import PyPDF2
-from docx import Document
-from typing import Optional
+import codecs
+import io
+import os
+import time
+from typing import Dict, Iterator, NamedTuple, Optional
+from .docx_stream import iter_docx
+from .metrics import metrics
+from .pdf_extraction import ParallelPdfExtractor, call_with_timeout, get_backend, timeout_enforceable
+
+EXTRACT_SECONDS = metrics.histogram('extraction_seconds', 'Seconds to extract text from an uploaded file', ['format'])
+EXTRACT_FAILURES = metrics.counter('extraction_failures_total', 'Files whose text could not be extracted', ['format'])
+
+class TextChunk(NamedTuple):
+    text: str
+    page: int
 
 class FileHandler:
+    MIME_TYPES = {
+        '.pdf': "application/pdf",
+        '.docx': "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        '.txt': "text/plain"
+    }
+
+    FORMATS = {mime_type: extension[1:] for extension, mime_type in MIME_TYPES.items()}
+
+    TEXT_BLOCK_SIZE = 64 * 1024
+    # Longer PDFs, and any PDF read off the main thread (where SIGALRM cannot
+    # enforce the page timeout), are extracted in worker processes
+    SERIAL_MAX_PAGES = 4
+
+    def __init__(self, pdf_backend: Optional[str] = None, pdf_workers: Optional[int] = None,
+                 page_timeout: Optional[float] = None):
+        self.pdf_backend = pdf_backend or os.environ.get('PDF_BACKEND', 'pypdf2')
+        self.pdf_workers = pdf_workers or int(os.environ.get('PDF_WORKERS', min(4, os.cpu_count() or 1)))
+        self.page_timeout = page_timeout or float(os.environ.get('PDF_PAGE_TIMEOUT', 30))
+        # 1-based page number -> reason, for PDF pages that failed or timed out
+        self.skipped_pages: Dict[int, str] = {}
+
     def extract_text(self, file) -> Optional[str]:
         """Extract text from uploaded file"""
-        try:
-            if file.type == "application/pdf":
-                return self._extract_pdf(file)
-            elif file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                return self._extract_docx(file)
-            elif file.type == "text/plain":
-                return str(file.read(), "utf-8")
+        return self._extract(file, file.type)
+
+    def extract_path(self, path: str) -> Optional[str]:
+        """Extract text from a file on disk, typed by its extension"""
+        mime_type = self.mime_type_for(path)
+        if not mime_type:
             return None
-        except Exception:
+        try:
+            with open(path, 'rb') as file:
+                return self._extract(file, mime_type)
+        except OSError:
             return None
+
+    def extract_bytes(self, data: bytes, mime_type: str) -> Optional[str]:
+        """Extract text from an upload received as raw bytes"""
+        return self._extract(io.BytesIO(data), mime_type)
     
-    def _extract_pdf(self, file) -> str:
-        pdf_reader = PyPDF2.PdfReader(file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return text
+    @classmethod
+    def mime_type_for(cls, filename: str) -> Optional[str]:
+        return cls.MIME_TYPES.get(os.path.splitext(filename)[1].lower())
     
-    def _extract_docx(self, file) -> str:
-        doc = Document(file)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
\ No newline at end of file
+    def iter_text(self, file, mime_type: Optional[str] = None) -> Iterator[TextChunk]:
+        """Yield the text of an uploaded file chunk by chunk, in document order.
+
+        PDFs yield one chunk per page, DOCX one per paragraph including
+        tables, headers and footers (pages counted from explicit page breaks)
+        and plain text fixed-size blocks on page 1.
+        Joining the chunks gives exactly what extract_text returns. Unlike
+        extract_text, parsing errors are raised to the caller.
+        """
+        mime_type = mime_type or file.type
+        if mime_type == "application/pdf":
+            return self._iter_pdf(file)
+        elif mime_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
+            return self._iter_docx(file)
+        elif mime_type == "text/plain":
+            return self._iter_txt(file)
+        return iter(())
+
+    def _extract(self, file, mime_type: str) -> Optional[str]:
+        if mime_type not in self.MIME_TYPES.values():
+            return None
+        file_format = self.FORMATS[mime_type]
+        start = time.perf_counter()
+        try:
+            return "".join(chunk.text for chunk in self.iter_text(file, mime_type))
+        except Exception:
+            EXTRACT_FAILURES.inc(file_format)
+            return None
+        finally:
+            EXTRACT_SECONDS.observe(time.perf_counter() - start, file_format)
+
+    def _iter_pdf(self, file) -> Iterator[TextChunk]:
+        backend = get_backend(self.pdf_backend)
+        if isinstance(file, io.BufferedReader) and isinstance(file.name, str):
+            # A file on disk: pass its path so pages are read as needed rather than all at once
+            source = file.name
+        else:
+            source = file.getvalue() if isinstance(file, io.BytesIO) else file.read()
+        document = backend.open(source)
+        page_count = backend.page_count(document)
+
+        if page_count > self.SERIAL_MAX_PAGES or not timeout_enforceable():
+            extractor = ParallelPdfExtractor(self.pdf_backend, self.pdf_workers, self.page_timeout)
+            extraction = extractor.extract(source, page_count)
+            for index, reason in extraction.failed_pages.items():
+                self.skipped_pages[index + 1] = reason
+            for index, text in enumerate(extraction.pages):
+                if text is not None:
+                    yield TextChunk(text, index + 1)
+            return
+
+        for index in range(page_count):
+            try:
+                text = call_with_timeout(lambda: backend.extract_page(document, index), self.page_timeout)
+            except Exception as e:
+                self.skipped_pages[index + 1] = f"{type(e).__name__}: {e}"
+                continue
+            yield TextChunk(text or "", index + 1)
+
+    def _iter_docx(self, file) -> Iterator[TextChunk]:
+        for text, page_number in iter_docx(file):
+            yield TextChunk(text, page_number)
+
+    def _iter_txt(self, file) -> Iterator[TextChunk]:
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        while True:
+            block = file.read(self.TEXT_BLOCK_SIZE)
+            if not block:
+                break
+            text = decoder.decode(block)
+            if text:
+                yield TextChunk(text, 1)
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield TextChunk(tail, 1)
@@ -0,0 +1,231 @@
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Seconds; covers a cached sub-millisecond stage up to LLM generation on CPU
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_text(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+        self.on_change: Optional[Callable[[], None]] = None
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        with self._lock:
+            self.values[label_values] = self.values.get(label_values, 0.0) + amount
+        if self.on_change:
+            self.on_change()
+
+    def state(self) -> Dict:
+        with self._lock:
+            values = [[list(label_values), value] for label_values, value in self.values.items()]
+        return {'kind': self.kind, 'help': self.help_text, 'labels': list(self.labels), 'values': values}
+
+    def add_state(self, state: Dict):
+        with self._lock:
+            for label_values, value in state['values']:
+                key = tuple(label_values)
+                self.values[key] = self.values.get(key, 0.0) + value
+
+    def value(self, *label_values: str) -> float:
+        return self.values.get(label_values, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_label_text(self.labels, label_values)} {value}")
+        return lines
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (per-bucket counts with a final +Inf slot, sum, count)
+        self.values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+        self.on_change: Optional[Callable[[], None]] = None
+
+    def observe(self, value: float, *label_values: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self.values.get(label_values)
+            if series is None:
+                series = self.values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+        if self.on_change:
+            self.on_change()
+
+    def state(self) -> Dict:
+        with self._lock:
+            values = [[list(label_values), list(counts), total, count]
+                      for label_values, (counts, total, count) in self.values.items()]
+        return {'kind': self.kind, 'help': self.help_text, 'labels': list(self.labels),
+                'buckets': list(self.buckets), 'values': values}
+
+    def add_state(self, state: Dict):
+        with self._lock:
+            for label_values, counts, total, count in state['values']:
+                series = self.values.setdefault(tuple(label_values), [[0] * (len(self.buckets) + 1), 0.0, 0])
+                series[0] = [mine + theirs for mine, theirs in zip(series[0], counts)]
+                series[1] += total
+                series[2] += count
+
+    def count(self, *label_values: str) -> int:
+        series = self.values.get(label_values)
+        return series[2] if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, (counts, total, count) in sorted(self.values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += bucket_count
+                    le = 'le="+Inf"' if bound == float('inf') else f'le="{bound}"'
+                    lines.append(f"{self.name}_bucket{_label_text(self.labels, label_values, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_label_text(self.labels, label_values)} {total}")
+                lines.append(f"{self.name}_count{_label_text(self.labels, label_values)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide counters and histograms rendered in the Prometheus text format.
+
+    Registering a name twice returns the existing metric, so modules can
+    declare what they record at import time without coordinating.
+
+    With several server processes each one only sees its own values, so a
+    scrape would land on a random worker. Given a ``directory`` (METRICS_DIR
+    for the module-level registry), updates only mark the registry dirty; a
+    background thread writes each process's values to a file of its own
+    there at most every ``flush_interval`` seconds (METRICS_FLUSH_SECONDS),
+    and ``render`` flushes its own process and sums the files of all of
+    them, so other workers' values may be up to one interval old. Files of
+    exited processes are kept so counters never go backwards; clear the
+    directory when the server starts.
+    """
+
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = 1.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self._path: Optional[str] = None
+        self._path_pid: Optional[int] = None
+        self._dirty = False
+        self._flusher_pid: Optional[int] = None
+
+    def _register(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+                if self.directory:
+                    metric.on_change = self._changed
+            return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, help_text, labels)
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help_text, labels, buckets)
+
+    def _file(self) -> str:
+        # A forked child must not keep writing to its parent's file
+        if self._path_pid != os.getpid():
+            self._path_pid = os.getpid()
+            self._path = os.path.join(self.directory, f"metrics-{os.getpid()}-{uuid.uuid4().hex[:8]}.json")
+        return self._path
+
+    def _changed(self):
+        self._dirty = True
+        # Threads do not survive a fork, so each process starts its own flusher
+        if self._flusher_pid != os.getpid():
+            with self._lock:
+                if self._flusher_pid != os.getpid():
+                    self._flusher_pid = os.getpid()
+                    threading.Thread(target=self._flush_periodically, name='metrics-flush', daemon=True).start()
+                    atexit.register(self.flush)
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(self.flush_interval)
+            if self._dirty:
+                self.flush()
+
+    def flush(self):
+        """Write this process's values to its file in ``directory``"""
+        with self._lock:
+            self._dirty = False
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._file()
+            states = {name: metric.state() for name, metric in self._metrics.items()}
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(states, f)
+            os.replace(path + '.tmp', path)
+
+    def _merged(self) -> Dict[str, object]:
+        self.flush()
+        merged: Dict[str, object] = {}
+        for path in sorted(glob.glob(os.path.join(self.directory, 'metrics-*.json'))):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    states = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for name, state in states.items():
+                metric = merged.get(name)
+                if metric is None:
+                    if state['kind'] == Histogram.kind:
+                        metric = Histogram(name, state['help'], state['labels'], state['buckets'])
+                    else:
+                        metric = Counter(name, state['help'], state['labels'])
+                    merged[name] = metric
+                metric.add_state(state)
+        return merged
+
+    def render(self) -> str:
+        current = self._merged() if self.directory else self._metrics
+        lines = []
+        for name in sorted(current):
+            lines.extend(current[name].render())
+        return "\n".join(lines) + "\n"
+
+
+def clear_directory(directory: str):
+    """Remove the per-process files a previous server run left in ``directory``"""
+    for path in glob.glob(os.path.join(directory, 'metrics-*.json*')):
+        os.remove(path)
+
+
+metrics = MetricsRegistry(os.environ.get('METRICS_DIR') or None, float(os.environ.get('METRICS_FLUSH_SECONDS', 1.0)))
@@ -0,0 +1,253 @@
+import io
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+# The PDF's bytes, or the path of a PDF on disk that is read as pages are needed
+PdfSource = Union[bytes, str]
+
+
+class PdfBackend:
+    """Page-level PDF text extractor. Subclass to add another library."""
+
+    name = ''
+    module = ''
+
+    def open(self, source: PdfSource):
+        raise NotImplementedError
+
+    def page_count(self, document) -> int:
+        raise NotImplementedError
+
+    def extract_page(self, document, index: int) -> str:
+        raise NotImplementedError
+
+
+class PyPDF2Backend(PdfBackend):
+    name = 'pypdf2'
+    module = 'PyPDF2'
+
+    def open(self, source: PdfSource):
+        import PyPDF2
+        # PdfReader reads an open file lazily but loads a path into memory whole
+        return PyPDF2.PdfReader(open(source, 'rb') if isinstance(source, str) else io.BytesIO(source))
+
+    def page_count(self, document) -> int:
+        return len(document.pages)
+
+    def extract_page(self, document, index: int) -> str:
+        return document.pages[index].extract_text()
+
+
+class PyMuPDFBackend(PdfBackend):
+    name = 'pymupdf'
+    module = 'fitz'
+
+    def open(self, source: PdfSource):
+        import fitz
+        return fitz.open(source) if isinstance(source, str) else fitz.open(stream=source, filetype='pdf')
+
+    def page_count(self, document) -> int:
+        return document.page_count
+
+    def extract_page(self, document, index: int) -> str:
+        return document.load_page(index).get_text()
+
+
+class PdfMinerBackend(PdfBackend):
+    name = 'pdfminer'
+    module = 'pdfminer'
+
+    def open(self, source: PdfSource):
+        return source
+
+    def page_count(self, document) -> int:
+        from pdfminer.pdfpage import PDFPage
+        if isinstance(document, str):
+            with open(document, 'rb') as f:
+                return sum(1 for _ in PDFPage.get_pages(f))
+        return sum(1 for _ in PDFPage.get_pages(io.BytesIO(document)))
+
+    def extract_page(self, document, index: int) -> str:
+        from pdfminer.high_level import extract_text
+        return extract_text(document if isinstance(document, str) else io.BytesIO(document), page_numbers=[index])
+
+
+BACKENDS = {backend.name: backend for backend in (PyPDF2Backend, PyMuPDFBackend, PdfMinerBackend)}
+
+
+def available_backends() -> List[str]:
+    names = []
+    for name, backend in BACKENDS.items():
+        try:
+            __import__(backend.module)
+            names.append(name)
+        except ImportError:
+            pass
+    return names
+
+
+def get_backend(name: str) -> PdfBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{name}', choose from {sorted(BACKENDS)}")
+    return BACKENDS[name]()
+
+
+class PageTimeout(Exception):
+    pass
+
+
+def timeout_enforceable() -> bool:
+    """Whether call_with_timeout can interrupt a call made from the current thread"""
+    return hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+
+
+def call_with_timeout(fn, timeout: Optional[float]):
+    """Run fn, raising PageTimeout after ``timeout`` seconds.
+
+    Uses SIGALRM, so it only applies in a process's main thread on Unix (pool
+    workers qualify); elsewhere fn simply runs without a limit.
+    """
+    if not timeout or not timeout_enforceable():
+        return fn()
+
+    def _expire(signum, frame):
+        raise PageTimeout(f"no result after {timeout}s")
+
+    previous = signal.signal(signal.SIGALRM, _expire)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return fn()
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class PdfExtraction(NamedTuple):
+    pages: List[Optional[str]]
+    failed_pages: Dict[int, str]
+
+    @property
+    def text(self) -> str:
+        return "".join(page for page in self.pages if page)
+
+
+_worker_backend = None
+_worker_document = None
+
+
+def _init_worker(backend_name: str, source: PdfSource, started):
+    global _worker_backend, _worker_document
+    # Tell the parent who to terminate if a page hangs this worker
+    started.put(os.getpid())
+    _worker_backend = get_backend(backend_name)
+    _worker_document = _worker_backend.open(source)
+
+
+def _extract_range(start: int, end: int, page_timeout: Optional[float]) -> List[Tuple[int, Optional[str], Optional[str]]]:
+    results = []
+    for index in range(start, end):
+        try:
+            text = call_with_timeout(lambda: _worker_backend.extract_page(_worker_document, index), page_timeout)
+            results.append((index, text or "", None))
+        except Exception as e:
+            results.append((index, None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+class ParallelPdfExtractor:
+    """Extract PDF pages across a process pool and reassemble them in order.
+
+    Pages are handed out in ranges of ``pages_per_task``. A page that raises
+    or exceeds ``page_timeout`` is skipped and reported in ``failed_pages``
+    instead of failing the upload. Ranges lost to a crashed worker, or to a
+    hang SIGALRM could not interrupt, are split in half and retried together
+    in one new pool per round until only the offending pages are dropped.
+    """
+
+    def __init__(self, backend: str = 'pypdf2', workers: int = 4,
+                 page_timeout: Optional[float] = 30.0, pages_per_task: int = 8):
+        self.backend = get_backend(backend)
+        self.workers = workers
+        self.page_timeout = page_timeout
+        self.pages_per_task = pages_per_task
+
+    def extract(self, source: PdfSource, page_count: Optional[int] = None) -> PdfExtraction:
+        """Extract every page of ``source``; a path is opened by each worker instead of copied to it"""
+        if page_count is None:
+            page_count = self.backend.page_count(self.backend.open(source))
+        pages: List[Optional[str]] = [None] * page_count
+        failed: Dict[int, str] = {}
+
+        ranges = [(start, min(start + self.pages_per_task, page_count))
+                  for start in range(0, page_count, self.pages_per_task)]
+        workers = self.workers
+        while ranges:
+            retry = []
+            for position, (start, end, reason) in enumerate(self._run(source, ranges, workers, pages, failed)):
+                if reason is None or (workers == 1 and position > 0):
+                    # Never ran, or (one worker runs ranges in order) only lost with the one before it
+                    retry.append((start, end))
+                elif end - start > 1:
+                    middle = (start + end) // 2
+                    retry += [(start, middle), (middle, end)]
+                elif workers == 1:
+                    failed[start] = reason
+                else:
+                    retry.append((start, end))
+            ranges = retry
+            if ranges and all(end - start == 1 for start, end in ranges):
+                # A crash takes down every page in flight, so single pages are
+                # finally run in order in one worker to tell which page did it
+                workers = 1
+
+        return PdfExtraction(pages, failed)
+
+    def _deadline(self, start: int, end: int) -> Optional[float]:
+        # Backstop for hangs inside C code that SIGALRM cannot interrupt
+        return self.page_timeout * (end - start) + 5 if self.page_timeout else None
+
+    def _run(self, source: PdfSource, ranges: List[Tuple[int, int]], workers: int,
+             pages: List[Optional[str]], failed: Dict[int, str]) -> List[Tuple[int, int, Optional[str]]]:
+        """Extract ranges into pages/failed; return (start, end, reason) for the ranges that yielded nothing.
+
+        The reason is None for ranges that never started because a worker hung.
+        """
+        lost = []
+        hung = False
+        started = multiprocessing.SimpleQueue()
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(self.backend.name, source, started))
+        try:
+            futures = [(start, end, pool.submit(_extract_range, start, end, self.page_timeout))
+                       for start, end in ranges]
+            for start, end, future in futures:
+                if hung and future.cancel():
+                    # Still queued behind the hung worker; retry it whole instead of waiting
+                    lost.append((start, end, None))
+                    continue
+                try:
+                    for index, text, error in future.result(timeout=self._deadline(start, end)):
+                        if error:
+                            failed[index] = error
+                        else:
+                            pages[index] = text
+                except TimeoutError:
+                    hung = True
+                    lost.append((start, end, "timed out"))
+                except BrokenProcessPool:
+                    lost.append((start, end, "extractor process crashed"))
+        finally:
+            pool.shutdown(wait=not hung, cancel_futures=True)
+            if hung:
+                while not started.empty():
+                    try:
+                        os.kill(started.get(), signal.SIGTERM)
+                    except OSError:
+                        pass
+            started.close()
+        return lost
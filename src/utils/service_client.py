@@ -0,0 +1,64 @@
+from typing import Dict, List, Optional
+import requests
+
+
+class ServiceError(Exception):
+    pass
+
+
+class AnalysisServiceClient:
+    """Client for the HTTP analysis service started by api_server.py"""
+
+    def __init__(self, base_url: str, timeout: float = 300.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        try:
+            return self.session.request(method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            raise ServiceError(f"Analysis service unreachable: {e}")
+
+    def _json(self, response: requests.Response) -> Dict:
+        if response.status_code >= 400:
+            try:
+                message = response.json().get('error', response.reason)
+            except ValueError:
+                message = response.reason
+            raise ServiceError(f"Analysis service returned {response.status_code}: {message}")
+        return response.json()
+
+    def ready(self) -> Dict:
+        return self._request('GET', '/ready').json()
+
+    def analyze(self, data: bytes, filename: str, mime_type: str) -> Optional[Dict]:
+        """Analysis result, or None when no text could be extracted from the file"""
+        response = self._request('POST', '/analyze', files={'file': (filename, data, mime_type)})
+        if response.status_code == 422:
+            return None
+        return self._json(response)
+
+    def check_compliance(self, data: bytes, filename: str, mime_type: str) -> Dict:
+        return self._json(self._request('POST', '/compliance', files={'file': (filename, data, mime_type)}))
+
+    def templates(self) -> Dict:
+        return self._json(self._request('GET', '/templates'))
+
+    def template(self, name: str) -> Dict:
+        response = self._request('GET', f"/templates/{name}")
+        if response.status_code == 404:
+            return {}
+        return self._json(response)
+
+    def render_template(self, name: str, values: Dict) -> str:
+        return self._json(self._request('POST', f"/templates/{name}/render", json=values))['content']
+
+    def search(self, query: Optional[str] = None, limit: int = 20, **filters) -> List[Dict]:
+        """Ranked sentence hits from the service's clause index; filters as in ClauseIndex.search"""
+        params = dict(filters, q=query, limit=limit)
+        return self._json(self._request('GET', '/search', params=params))['results']
+
+    def search_documents(self, query: Optional[str] = None, limit: int = 100, **filters) -> List[Dict]:
+        params = dict(filters, q=query, limit=limit)
+        return self._json(self._request('GET', '/search/documents', params=params))['documents']
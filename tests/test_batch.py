@@ -0,0 +1,26 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.analyzer import ContractAnalyzer
+from core.batch import BatchStats, analyze_many
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_contract.txt')
+
+def test_analyze_many_preserves_order_across_workers():
+    items = [
+        SAMPLE,
+        "The employee shall receive a monthly salary for the position.",
+        "The landlord may terminate the lease if rent is unpaid.",
+        os.path.join(os.path.dirname(__file__), 'missing.pdf'),
+    ]
+    analyzer = ContractAnalyzer()
+    stats = BatchStats()
+    
+    serial = list(analyze_many(items, workers=1, analyzer=analyzer, stats=stats))
+    parallel = list(analyzer.analyze_many(items, workers=2, chunksize=1))
+    
+    assert [result.get('type') for result in serial[:3]] == ['service', 'employment', 'lease']
+    assert 'error' in serial[3]
+    assert serial == parallel
+    assert (stats.documents, stats.errors) == (4, 1)
@@ -0,0 +1,76 @@
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.cache import AnalysisCache, CacheBackend, DiskBackend, LocalBackend, MemoryBackend, TieredCache
+
+def test_cache_computes_once_per_content_and_fingerprint():
+    cache = AnalysisCache(memory_entries=4)
+    calls = []
+    compute = lambda: calls.append(1) or {'type': 'service'}
+    
+    assert cache.get_or_compute(b"contract", "v1", compute) == {'type': 'service'}
+    assert cache.get_or_compute(b"contract", "v1", compute) == {'type': 'service'}
+    assert len(calls) == 1
+    
+    cache.get_or_compute(b"contract", "v2", compute)
+    assert len(calls) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_failed_extraction_is_not_cached():
+    cache = AnalysisCache()
+    assert cache.get_or_compute(b"scan.pdf", "v1", lambda: None) is None
+    assert cache.get_or_compute(b"scan.pdf", "v1", lambda: {'type': 'lease'}) == {'type': 'lease'}
+
+def test_shared_backend_is_reused_across_instances():
+    shared = LocalBackend()
+    first = AnalysisCache(shared=shared)
+    second = AnalysisCache(shared=shared)
+    
+    first.get_or_compute(b"msa", "v1", lambda: {'type': 'vendor'})
+    assert second.get_or_compute(b"msa", "v1", lambda: None) == {'type': 'vendor'}
+    # Promoted into the second instance's memory tier
+    assert len(second.tiers[0]) == 1
+
+def test_memory_tier_evicts_least_recently_used():
+    memory = MemoryBackend(max_entries=2)
+    memory.set('a', b'1')
+    memory.set('b', b'2')
+    memory.get('a')
+    memory.set('c', b'3')
+    assert memory.get('b') is None
+    assert memory.get('a') == b'1'
+
+def test_disk_tier_evicts_by_size(tmp_path):
+    disk = DiskBackend(str(tmp_path), max_bytes=250)
+    for name in ['a', 'b', 'c']:
+        disk.set(name, b'x' * 100)
+        time.sleep(0.01)
+    
+    assert disk.get('a') is None
+    assert disk.get('c') == b'x' * 100
+    assert disk._disk_usage() <= 250
+
+def test_disk_overwrite_does_not_grow_tracked_size(tmp_path):
+    disk = DiskBackend(str(tmp_path), max_bytes=1000)
+    for _ in range(5):
+        disk.set('a', b'x' * 100)
+    disk.set('b', b'y' * 100)
+    
+    # Counting every overwrite would report 600 and scan for evictions far too early
+    assert disk._size == disk._disk_usage() == 200
+    assert disk.get('a') == b'x' * 100
+
+class ReadOnlyBackend(CacheBackend):
+    def get(self, key):
+        return None
+    
+    def set(self, key, value):
+        raise OSError("read-only file system")
+
+def test_backfill_failure_still_returns_the_hit():
+    shared = LocalBackend()
+    shared.set('key', b'value')
+    cache = TieredCache([ReadOnlyBackend(), shared])
+    assert cache.get_bytes('key') == b'value'
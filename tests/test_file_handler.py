@@ -0,0 +1,179 @@
+import sys
+import os
+import io
+import signal
+import threading
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from docx import Document
+from docx.enum.text import WD_BREAK
+from utils.file_handler import FileHandler
+from utils.pdf_extraction import BACKENDS, ParallelPdfExtractor, PyPDF2Backend
+
+class Upload(io.BytesIO):
+    def __init__(self, data: bytes, type: str):
+        super().__init__(data)
+        self.type = type
+
+def make_pdf(pages) -> bytes:
+    """Minimal uncompressed PDF with one line of Helvetica text per page"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>"
+    
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+def make_docx() -> bytes:
+    doc = Document()
+    doc.add_paragraph("Payment is due within 30 days.")
+    doc.add_paragraph("Either party may terminate.").add_run().add_break(WD_BREAK.PAGE)
+    doc.add_paragraph("Governed by the laws of India.")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+def test_pdf_pages_stream_in_order():
+    upload = Upload(make_pdf(["Page one terms", "Page two terms"]), "application/pdf")
+    chunks = list(FileHandler().iter_text(upload))
+    
+    assert [chunk.page for chunk in chunks] == [1, 2]
+    assert "Page two terms" in chunks[1].text
+    upload.seek(0)
+    assert FileHandler().extract_text(upload) == "".join(chunk.text for chunk in chunks)
+
+def test_docx_paragraphs_track_page_breaks():
+    docx_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    chunks = list(FileHandler().iter_text(Upload(make_docx(), docx_type)))
+    
+    assert [chunk.page for chunk in chunks] == [1, 1, 2]
+    assert chunks[2].text == "Governed by the laws of India.\n"
+    assert FileHandler().extract_text(Upload(make_docx(), docx_type)).startswith("Payment is due")
+
+def test_text_blocks_decode_across_boundaries():
+    handler = FileHandler()
+    handler.TEXT_BLOCK_SIZE = 7
+    text = "Fee ₹5,00,000 payable in Mumbai"
+    
+    chunks = list(handler.iter_text(Upload(text.encode("utf-8"), "text/plain")))
+    assert len(chunks) > 1
+    assert "".join(chunk.text for chunk in chunks) == text
+    assert handler.extract_text(Upload(b"\xff\xfe", "text/plain")) is None
+    assert handler.extract_text(Upload(b"", "image/png")) is None
+
+class FlakyBackend(PyPDF2Backend):
+    """Raises on page 3 and hangs on page 5"""
+    name = 'flaky'
+    
+    def extract_page(self, document, index):
+        if index == 2:
+            raise ValueError("corrupt content stream")
+        if index == 4:
+            time.sleep(30)
+        return super().extract_page(document, index)
+
+def test_parallel_pdf_extraction_skips_bad_pages():
+    BACKENDS['flaky'] = FlakyBackend
+    try:
+        pages = [f"Clause {number} text" for number in range(1, 21)]
+        handler = FileHandler(pdf_backend='flaky', pdf_workers=2, page_timeout=0.5)
+        
+        chunks = list(handler.iter_text(Upload(make_pdf(pages), "application/pdf")))
+        
+        assert [chunk.page for chunk in chunks] == [page for page in range(1, 21) if page not in (3, 5)]
+        assert "Clause 20 text" in chunks[-1].text
+        assert sorted(handler.skipped_pages) == [3, 5]
+        assert "corrupt" in handler.skipped_pages[3]
+        
+        serial = FileHandler(pdf_backend='flaky', pdf_workers=1, page_timeout=0.5)
+        assert serial.extract_text(Upload(make_pdf(pages), "application/pdf")) == "".join(chunk.text for chunk in chunks)
+        assert sorted(serial.skipped_pages) == [3, 5]
+    finally:
+        del BACKENDS['flaky']
+
+def test_hanging_page_times_out_off_the_main_thread(tmp_path):
+    BACKENDS['flaky'] = FlakyBackend
+    try:
+        pages = [f"Clause {number} text" for number in range(1, 6)]
+        path = tmp_path / 'contract.pdf'
+        path.write_bytes(make_pdf(pages))
+        handler = FileHandler(pdf_backend='flaky', pdf_workers=1, page_timeout=0.5)
+        # Like Streamlit and the HTTP service, which extract outside the main thread
+        results = []
+        thread = threading.Thread(target=lambda: results.append(handler.extract_path(str(path))))
+        start = time.perf_counter()
+        thread.start()
+        thread.join(20)
+        
+        assert time.perf_counter() - start < 10
+        assert "Clause 4 text" in results[0] and "Clause 5" not in results[0]
+        assert sorted(handler.skipped_pages) == [3, 5]
+    finally:
+        del BACKENDS['flaky']
+
+class CrashingBackend(PyPDF2Backend):
+    """Kills its worker on page 7 and hangs past SIGALRM on page 13"""
+    name = 'crashing'
+    
+    def extract_page(self, document, index):
+        if index == 6:
+            os._exit(1)
+        if index == 12:
+            # Like a hang inside C code: the page timeout never fires
+            signal.signal(signal.SIGALRM, signal.SIG_IGN)
+            time.sleep(30)
+        return super().extract_page(document, index)
+
+class QuickDeadlineExtractor(ParallelPdfExtractor):
+    def _deadline(self, start, end):
+        return 1.0
+
+def test_parallel_pdf_extraction_isolates_crashed_and_hung_pages():
+    BACKENDS['crashing'] = CrashingBackend
+    try:
+        pages = [f"Clause {number} text" for number in range(1, 21)]
+        extraction = QuickDeadlineExtractor('crashing', workers=2, page_timeout=0.5).extract(make_pdf(pages))
+        
+        assert extraction.failed_pages == {6: "extractor process crashed", 12: "timed out"}
+        assert [index for index, page in enumerate(extraction.pages) if page is None] == [6, 12]
+        assert "Clause 20 text" in extraction.text
+    finally:
+        del BACKENDS['crashing']
+
+def test_docx_stream_includes_tables_headers_and_footers():
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Master Services Agreement"
+    doc.sections[0].footer.paragraphs[0].text = "Confidential"
+    doc.add_paragraph("Schedule of payments:")
+    table = doc.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Milestone"
+    table.cell(0, 1).text = "Fee"
+    table.cell(1, 0).text = "Delivery"
+    table.cell(1, 1).text = "₹2,00,000"
+    doc.add_paragraph("Late payment\tattracts interest.")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    
+    docx_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    text = FileHandler().extract_text(Upload(buffer.getvalue(), docx_type))
+    
+    assert text.splitlines() == [
+        "Master Services Agreement", "Schedule of payments:",
+        "Milestone", "Fee", "Delivery", "₹2,00,000",
+        "Late payment\tattracts interest.", "Confidential"
+    ]
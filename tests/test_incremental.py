@@ -0,0 +1,59 @@
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import spacy
+from core.analyzer import ContractAnalyzer
+from core.ner import EntityExtractor
+from core.incremental import IncrementalAnalyzer, RevisionSnapshot, diff_sentences
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_contract.txt')
+
+def test_revision_matches_full_analysis_and_reports_risk_delta():
+    with open(SAMPLE, encoding='utf-8') as f:
+        v1 = f.read()
+    analyzer = ContractAnalyzer()
+    incremental = IncrementalAnalyzer(analyzer)
+    
+    first, snapshot = incremental.analyze(v1)
+    assert first == analyzer.analyze_contract(v1)
+    
+    v2 = v1.replace('arbitration', 'mediation', 1) + "\nThe Vendor may terminate at will and pay liquidated damages."
+    # Snapshots survive a JSON round trip, e.g. through session state or a database
+    snapshot = RevisionSnapshot.from_dict(json.loads(json.dumps(snapshot.to_dict())))
+    second, _ = incremental.analyze(v2, snapshot)
+    revision = second.pop('revision')
+    
+    assert second == analyzer.analyze_contract(v2)
+    assert set(revision['risks']['added']) == {'penalty_clauses', 'unilateral_termination'}
+    assert revision['risks']['changed']['arbitration_jurisdiction']['after']['level'] == 'Medium'
+    assert 0 < revision['sentences']['reanalyzed'] < revision['sentences']['total'] // 2
+
+def test_diff_sentences_offsets_opcodes_past_shared_head():
+    old = ['a', 'b', 'c', 'd', 'e']
+    new = ['a', 'b', 'x', 'd', 'e', 'f']
+    assert diff_sentences(old, new) == [
+        ('equal', 0, 2, 0, 2), ('replace', 2, 3, 2, 3), ('equal', 3, 5, 3, 5), ('insert', 5, 5, 5, 6)
+    ]
+
+def test_reused_entities_shift_with_the_edit():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler").add_patterns([
+        {"label": "ORG", "pattern": "ABC Technologies"},
+        {"label": "GPE", "pattern": "Mumbai"},
+    ])
+    analyzer = ContractAnalyzer()
+    analyzer.ner = EntityExtractor(nlp)
+    incremental = IncrementalAnalyzer(analyzer)
+    
+    v1 = "ABC Technologies shall deliver the goods. Payment is due in Mumbai. Disputes go to arbitration."
+    _, snapshot = incremental.analyze(v1)
+    # Inserting a sentence up front moves every unchanged one to the right
+    v2 = "This agreement is signed in Mumbai today. " + v1
+    result, snapshot = incremental.analyze(v2, snapshot)
+    
+    assert result['revision']['sentences']['reused'] == 3
+    assert snapshot.entities == analyzer.ner.extract(analyzer.parse(v2))
+    assert [v2[ent.start:ent.end] for ent in snapshot.entities] == ['Mumbai', 'ABC Technologies', 'Mumbai']
+    assert result['entities'] == analyzer.analyze_contract(v2)['entities']
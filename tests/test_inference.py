@@ -0,0 +1,76 @@
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.inference import BatchingInferenceWorker
+from core.simple_llm import SimpleLLM
+from utils.cache import GenerationCache
+
+def test_concurrent_prompts_are_batched():
+    batch_sizes = []
+    
+    def generate_batch(prompts, max_length):
+        batch_sizes.append(len(prompts))
+        time.sleep(0.01)
+        return [f"{prompt}/{max_length}" for prompt in prompts]
+    
+    worker = BatchingInferenceWorker(generate_batch, max_batch_size=4, max_wait_ms=50)
+    futures = [worker.submit(f"prompt {index}", 80) for index in range(8)]
+    
+    assert [future.result(timeout=5) for future in futures] == [f"prompt {index}/80" for index in range(8)]
+    assert batch_sizes == [4, 4]
+    
+    stats = worker.stats()
+    assert stats['requests'] == 8 and stats['batches'] == 2
+    assert stats['mean_batch_size'] == 4
+    assert stats['requests_per_second'] > 0
+    worker.stop()
+
+def test_mixed_lengths_and_failures_resolve_every_future():
+    def generate_batch(prompts, max_length):
+        if max_length == 100:
+            raise RuntimeError("out of memory")
+        return [prompt.upper() for prompt in prompts]
+    
+    worker = BatchingInferenceWorker(generate_batch, max_batch_size=8, max_wait_ms=50)
+    summary = worker.submit("summary", 80)
+    suggestions = worker.submit("suggestions", 100)
+    
+    assert summary.result(timeout=5) == "SUMMARY"
+    assert isinstance(suggestions.exception(timeout=5), RuntimeError)
+    worker.stop()
+
+def test_llm_disabled_by_default():
+    llm = SimpleLLM(backend='none')
+    assert llm.generate_text("Legal advice for lease:") == "LLM not available"
+    assert llm.stats() == {}
+
+def test_unknown_backend_is_rejected():
+    try:
+        SimpleLLM(backend='fp16')
+        assert False, "expected ValueError"
+    except ValueError as e:
+        assert 'int8' in str(e)
+
+def test_repeated_prompts_are_served_from_generation_cache():
+    calls = []
+    
+    def generate_batch(prompts, max_length):
+        calls.extend(prompts)
+        return [f"advice {len(calls)}" for _ in prompts]
+    
+    llm = SimpleLLM(backend='none', deterministic=True)
+    llm.worker = BatchingInferenceWorker(generate_batch, max_wait_ms=1)
+    llm.cache = GenerationCache(max_entries=8)
+    
+    first = llm.generate_text("Legal advice for lease with auto_renewal:", 100)
+    assert llm.generate_text("Legal advice for lease with auto_renewal:", 100) == first
+    llm.generate_text("Legal advice for lease with auto_renewal:", 80)
+    
+    assert len(calls) == 2
+    stats = llm.stats()
+    assert (stats['cache_hits'], stats['cache_misses']) == (1, 2)
+    assert abs(stats['cache_hit_rate'] - 1 / 3) < 1e-9
+    llm.worker.stop()
@@ -0,0 +1,94 @@
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.analyzer import ContractAnalyzer
+from core.jobs import DONE, FAILED, JOB_STAGES, QUEUED, RUNNING, JobQueue, JobWorker, SQLiteJobBackend
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_contract.txt')
+
+def test_job_runs_with_stage_progress_and_result_by_id(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.db'))
+    with open(SAMPLE, 'rb') as f:
+        data = f.read()
+    job_id = queue.submit(data, 'text/plain', 'contract.txt')
+    assert queue.get(job_id)['status'] == QUEUED
+    
+    analyzer = ContractAnalyzer()
+    stages = []
+    worker = JobWorker(queue, analyzer=analyzer, worker_id='w1')
+    report_stage = queue.report_stage
+    queue.report_stage = lambda job, who, stage: (stages.append(queue.get(job)['progress']), report_stage(job, who, stage))
+    
+    assert worker.run_once()
+    assert not worker.run_once()
+    
+    job = queue.get(job_id)
+    assert (job['status'], job['progress']) == (DONE, 1.0)
+    assert job['result'] == analyzer.analyze_contract(data.decode('utf-8'))
+    assert len(stages) == len(JOB_STAGES) and stages == sorted(stages)
+    assert queue.get('missing') is None
+
+def test_unreadable_upload_fails_the_job(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.db'))
+    job_id = queue.submit(b'not a pdf', 'application/pdf', 'scan.pdf')
+    JobWorker(queue, analyzer=ContractAnalyzer()).run_once()
+    job = queue.get(job_id)
+    assert job['status'] == FAILED and 'extract' in job['error']
+
+def test_concurrent_workers_run_each_job_once(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.db'))
+    job_ids = [queue.submit(f"The tenant shall pay rent {index}.".encode(), 'text/plain') for index in range(12)]
+    analyzer = ContractAnalyzer()
+    stop = threading.Event()
+    workers = [JobWorker(JobQueue(queue.backend.path), analyzer=analyzer, poll_interval=0.01, worker_id=f"w{index}")
+               for index in range(3)]
+    threads = [threading.Thread(target=worker.run, args=(stop,)) for worker in workers]
+    for thread in threads:
+        thread.start()
+    
+    deadline = time.time() + 20
+    while queue.counts().get(DONE, 0) < len(job_ids) and time.time() < deadline:
+        time.sleep(0.05)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    
+    jobs = [queue.get(job_id) for job_id in job_ids]
+    assert all(job['status'] == DONE and job['attempts'] == 1 for job in jobs)
+
+def test_job_of_unresponsive_worker_is_requeued(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.db'), lease_seconds=0.05, max_attempts=2)
+    job_id = queue.submit(b"The landlord may terminate the lease.", 'text/plain')
+    assert queue.claim('crashed')['id'] == job_id
+    assert queue.get(job_id)['status'] == RUNNING
+    
+    time.sleep(0.1)
+    JobWorker(queue, analyzer=ContractAnalyzer(), worker_id='w2').run_once()
+    job = queue.get(job_id)
+    assert (job['status'], job['attempts']) == (DONE, 2)
+    assert job['result']['type'] == 'lease'
+
+def test_backend_is_chosen_by_url(tmp_path):
+    path = str(tmp_path / 'url.db')
+    queue = JobQueue(f"sqlite://{path}")
+    assert isinstance(queue.backend, SQLiteJobBackend) and queue.backend.path == path
+    job_id = queue.submit(b"The tenant shall pay rent.", 'text/plain')
+    assert JobQueue(path).get(job_id)['status'] == QUEUED
+    assert JobQueue(SQLiteJobBackend(path)).counts() == {QUEUED: 1}
+    
+    try:
+        JobQueue('mysql://db/jobs')
+        assert False, "unsupported URL accepted"
+    except ValueError:
+        pass
+    try:
+        import psycopg
+    except ImportError:
+        try:
+            JobQueue('postgresql://localhost/jobs')
+            assert False, "PostgreSQL backend built without psycopg"
+        except ImportError as e:
+            assert 'psycopg' in str(e)
@@ -0,0 +1,144 @@
+import sys
+import os
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.map_reduce import ChatAPIError, ChatClient, MapReduceAnalyzer, chunk_contract, estimate_tokens, split_clauses
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_contract.txt')
+
+class StubChatServer:
+    """Local stand-in for the chat completions API that records prompts"""
+    
+    def __init__(self, fail_first=0, status=500):
+        self.prompts = []
+        self.fail_first = fail_first
+        self.status = status
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                prompt = body['messages'][0]['content']
+                with stub.lock:
+                    stub.prompts.append(prompt)
+                    failing = len(stub.prompts) <= stub.fail_first
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    if failing:
+                        self.send_response(stub.status)
+                        self.end_headers()
+                        return
+                    if 'Combine them' in prompt:
+                        content = {'summary': 'whole', 'obligations': 'all', 'risks': 'merged',
+                                   'suggestions': 'review', 'risk_score': 'High'}
+                    else:
+                        content = {'summary': 'part', 'obligations': '', 'risks': '', 'suggestions': '', 'risk_score': 'Low'}
+                    reply = json.dumps({'choices': [{'message': {'content': json.dumps(content)}}]}).encode()
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(reply)))
+                    self.end_headers()
+                    self.wfile.write(reply)
+                finally:
+                    with stub.lock:
+                        stub.in_flight -= 1
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+    
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def sample_text(copies=1):
+    with open(SAMPLE, encoding='utf-8') as f:
+        return (f.read() + "\n\n") * copies
+
+def test_chunks_follow_clause_boundaries():
+    text = sample_text(5)
+    clauses = split_clauses(text)
+    assert any(clause.startswith("PAYMENT TERMS:") for clause in clauses)
+    
+    chunks = chunk_contract(text, max_tokens=400)
+    assert len(chunks) > 1
+    # Whole clauses only, so every clause survives intact in some chunk
+    assert all(any(clause in chunk for chunk in chunks) for clause in clauses)
+    assert all(estimate_tokens(chunk) <= 400 for chunk in chunks)
+    
+    # One clause many times the budget, with no sentence boundary to split on
+    oversized = chunk_contract("PAYMENT TERMS:\n" + "x" * 20000, max_tokens=400)
+    assert len(oversized) > 1
+    assert all(estimate_tokens(chunk) <= 400 for chunk in oversized)
+
+def test_full_contract_is_mapped_concurrently_then_reduced():
+    stub = StubChatServer()
+    try:
+        analyzer = MapReduceAnalyzer(ChatClient("test-key", base_url=stub.url), max_workers=3, chunk_tokens=400)
+        result = analyzer.analyze(sample_text(5), "service")
+    finally:
+        stub.close()
+    
+    map_prompts = [prompt for prompt in stub.prompts if 'Combine them' not in prompt]
+    assert len(map_prompts) == len(chunk_contract(sample_text(5), 400))
+    assert "GOVERNING LAW" in "".join(map_prompts)  # text past the first 3000 characters is analyzed
+    assert result == {'summary': 'whole', 'obligations': 'all', 'risks': 'merged',
+                      'suggestions': 'review', 'risk_score': 'High'}
+    assert stub.max_in_flight <= 3
+
+def test_server_errors_are_retried_but_client_errors_are_not():
+    stub = StubChatServer(fail_first=2, status=503)
+    try:
+        analyzer = MapReduceAnalyzer(ChatClient("test-key", base_url=stub.url), max_workers=1, backoff_seconds=0)
+        assert analyzer.analyze("Payment is due in 30 days.", "service")['summary'] == 'part'
+        assert len(stub.prompts) == 3
+    finally:
+        stub.close()
+    
+    stub = StubChatServer(fail_first=10, status=401)
+    try:
+        analyzer = MapReduceAnalyzer(ChatClient("bad-key", base_url=stub.url), backoff_seconds=0)
+        try:
+            analyzer.analyze("Payment is due in 30 days.", "service")
+            assert False, "expected ChatAPIError"
+        except ChatAPIError as e:
+            assert not e.retryable
+        assert len(stub.prompts) == 1
+    finally:
+        stub.close()
+
+class RecordingClient:
+    """Chat client stub whose merged replies are as long as the parts it gets"""
+    
+    def __init__(self):
+        self.prompts = []
+    
+    def complete(self, prompt, max_tokens=1000, temperature=0.3):
+        self.prompts.append(prompt)
+        return json.dumps({'summary': 'merged ' * 130, 'obligations': '', 'risks': '', 'suggestions': '',
+                           'risk_score': 'High'})
+
+def test_reduce_calls_stay_within_budget_when_parts_are_near_the_limit():
+    client = RecordingClient()
+    analyzer = MapReduceAnalyzer(client, reduce_tokens=200)
+    parts = [{'summary': f'part {index} ' * 100, 'obligations': '', 'risks': '', 'suggestions': '', 'risk_score': 'Low'}
+             for index in range(5)]
+    assert all(180 < estimate_tokens(json.dumps(part)) <= 200 for part in parts)
+    
+    assert analyzer._reduce(parts, "service")['risk_score'] == 'High'
+    assert len(client.prompts) == 4  # 5 -> 3 -> 2 -> 1, pairing neighbours
+    for prompt in client.prompts:
+        analyses = re.findall(r'^\s*Part \d+: (.*)$', prompt, re.MULTILINE)
+        assert len(analyses) == 2
+        assert sum(estimate_tokens(analysis) for analysis in analyses) <= 200
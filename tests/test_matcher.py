@@ -0,0 +1,32 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.matcher import PatternMatcher
+
+def test_matcher_finds_overlapping_hits():
+    matcher = PatternMatcher({
+        'modality': {'obligation': ['shall'], 'prohibition': ['shall not']},
+        'clause': {'termination': ['end'], 'payment': ['fee']}
+    })
+    
+    hits = matcher.scan("the vendor shall not charge a fee")
+    found = sorted((hit.group, hit.category, hit.pattern, hit.start) for hit in hits)
+    
+    assert found == [
+        ('clause', 'payment', 'fee', 30),
+        ('clause', 'termination', 'end', 5),
+        ('modality', 'obligation', 'shall', 11),
+        ('modality', 'prohibition', 'shall not', 11),
+    ]
+
+def test_matcher_agrees_with_substring_search():
+    patterns = ['he', 'she', 'his', 'hers', 'as needed', 'a']
+    matcher = PatternMatcher({'flags': {'all': patterns}})
+    text = "ushers as needed; she has his hersheys"
+    
+    expected = sorted(
+        (pattern, index) for pattern in patterns
+        for index in range(len(text)) if text.startswith(pattern, index)
+    )
+    assert sorted((hit.pattern, hit.start) for hit in matcher.scan(text)) == expected
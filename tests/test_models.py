@@ -0,0 +1,31 @@
+import sys
+import os
+import threading
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.models import ModelRegistry
+
+def test_registry_loads_each_model_once():
+    loads = []
+    registry = ModelRegistry()
+    registry.register('model', lambda: loads.append(1) or object())
+    
+    threads = [threading.Thread(target=registry.get, args=('model',)) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(loads) == 1
+    assert registry.get('model') is registry.get('model')
+    assert registry.status() == {'model': True}
+
+def test_failed_load_is_cached():
+    loads = []
+    registry = ModelRegistry()
+    registry.register('missing', lambda: loads.append(1))
+    
+    assert registry.get('missing') is None
+    assert registry.get('missing') is None
+    assert len(loads) == 1
+    assert not registry.is_loaded('missing')
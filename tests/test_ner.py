@@ -0,0 +1,52 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import spacy
+from core.document import ParsedDocument
+from core.ner import EntityExtractor, EntityPrefilter
+
+def _ruler_nlp():
+    nlp = spacy.blank("en")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns([
+        {"label": "ORG", "pattern": "ABC Technologies"},
+        {"label": "GPE", "pattern": "Mumbai"},
+    ])
+    return nlp
+
+def test_chunks_cover_text_on_sentence_boundaries():
+    doc = ParsedDocument("First clause here. Second clause is longer. Third. " * 20)
+    extractor = EntityExtractor(_ruler_nlp(), chunk_chars=100)
+    spans = extractor.chunk_spans(doc)
+    
+    assert spans[0][0] == 0 and spans[-1][1] == len(doc.text)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(spans, spans[1:]))
+    assert all(end - start <= 100 for start, end in spans)
+    assert all(doc.text[end - 1] == '.' for _, end in spans[:-1])
+
+def test_entity_offsets_are_in_document_coordinates():
+    text = "ABC Technologies shall deliver to Mumbai. " * 50
+    nlp = _ruler_nlp()
+    nlp.max_length = 500
+    doc = ParsedDocument(text)
+    entities = EntityExtractor(nlp, chunk_chars=300).extract(doc)
+    
+    assert len(entities) == 100
+    assert all(doc.text[ent.start:ent.end] == ent.text for ent in entities)
+    assert [ent.label for ent in entities[:2]] == ["ORG", "GPE"]
+
+def test_prefilter_skips_boilerplate_and_keeps_margin():
+    text = ("the parties shall act in good faith. "
+            "payment of Rs. 5,000 is due. "
+            "each party bears its own costs. "
+            "notices go to the registered office. "
+            "disputes are subject to courts in mumbai. ")
+    doc = ParsedDocument(text)
+    
+    assert EntityPrefilter(context_sentences=0).select(doc) == [1, 2, 5]
+    assert EntityPrefilter(context_sentences=1).select(doc) == [0, 1, 2, 3, 4, 5, 6]
+    
+    extractor = EntityExtractor(_ruler_nlp(), prefilter=EntityPrefilter(context_sentences=0))
+    extractor.extract(doc)
+    assert 0.3 < extractor.skipped_fraction < 0.6
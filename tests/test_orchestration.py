@@ -0,0 +1,71 @@
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.analyzer import ContractAnalyzer
+from core.orchestration import StageOrchestrator, StageTimeout, parse_timeouts
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_contract.txt')
+
+class SlowLLM:
+    def generate_text(self, prompt, max_length=100):
+        time.sleep(1.0)
+        return "generated"
+
+def test_threaded_run_matches_sequential():
+    with open(SAMPLE, encoding='utf-8') as f:
+        text = f.read()
+    analyzer = ContractAnalyzer()
+    orchestrator = StageOrchestrator(analyzer)
+    
+    assert orchestrator.run(analyzer.parse(text)) == analyzer.analyze_contract(text)
+    orchestrator.shutdown()
+
+def test_late_llm_stages_fall_back_to_rules():
+    analyzer = ContractAnalyzer()
+    analyzer.llm = SlowLLM()
+    orchestrator = StageOrchestrator(analyzer, timeouts={'summary': 0.1, 'suggestions': 0.1})
+    doc = analyzer.parse("The employee shall receive a salary. Disputes go to arbitration.")
+    
+    started = time.perf_counter()
+    result = orchestrator.run(doc)
+    
+    assert time.perf_counter() - started < 0.9
+    assert result['summary'] == analyzer._generate_summary(doc, result['type'])
+    assert result['suggestions'] == analyzer._generate_suggestions(result['risks'], result['type'])
+    assert orchestrator.timed_out == 2
+    orchestrator.shutdown()
+
+def test_late_rule_stage_raises():
+    analyzer = ContractAnalyzer()
+    analyzer._detect_ambiguities = lambda doc: time.sleep(0.5)
+    orchestrator = StageOrchestrator(analyzer, timeouts={'ambiguities': 0.05})
+    try:
+        orchestrator.run(analyzer.parse("The tenant shall pay rent."))
+        assert False, "expected StageTimeout"
+    except StageTimeout as e:
+        assert 'ambiguities' in str(e)
+    orchestrator.shutdown()
+
+def test_parse_timeouts():
+    assert parse_timeouts("summary=2.5, suggestions=4") == {'summary': 2.5, 'suggestions': 4.0}
+
+class CountingExtractor:
+    def __init__(self):
+        self.calls = []
+    
+    def extract(self, doc):
+        self.calls.append(threading.current_thread().name)
+        time.sleep(0.2)
+        return []
+
+def test_threaded_run_extracts_entities_once():
+    analyzer = ContractAnalyzer()
+    analyzer.ner = CountingExtractor()
+    orchestrator = StageOrchestrator(analyzer)
+    # With no LLM the summary stage builds the rule-based summary, which needs entities too
+    orchestrator.run(analyzer.parse("The employee shall receive a salary. Disputes go to arbitration."))
+    assert len(analyzer.ner.calls) == 1
+    orchestrator.shutdown()
@@ -0,0 +1,77 @@
+import sys
+import os
+import pstats
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.analyzer import ANALYSIS_STAGES, ContractAnalyzer
+from core.batch import analyze_bytes
+from core.orchestration import StageOrchestrator
+from core.profiling import STAGE_SECONDS, profile_mode
+from utils.metrics import metrics
+
+TEXT = "The employee shall receive a salary. Disputes go to arbitration in Mumbai."
+
+def test_profile_section_only_when_requested():
+    analyzer = ContractAnalyzer()
+    calls = STAGE_SECONDS.count('risks')
+    
+    plain = analyzer.analyze_contract(TEXT)
+    timed = analyzer.analyze_contract(TEXT, profile='timings')
+    
+    assert 'profile' not in plain
+    assert set(timed['profile']['stages']) == {'parse'} | set(ANALYSIS_STAGES)
+    assert timed['profile']['total_seconds'] >= sum(timed['profile']['stages'].values()) * 0.99
+    assert {key: value for key, value in timed.items() if key != 'profile'} == plain
+    # Stages are recorded in the histogram whether or not a profile is returned
+    assert STAGE_SECONDS.count('risks') == calls + 2
+    
+    orchestrator = StageOrchestrator(analyzer)
+    analyzer.orchestrator = orchestrator
+    assert set(analyzer.analyze_contract(TEXT, profile='timings')['profile']['stages']) == {'parse'} | set(ANALYSIS_STAGES)
+    orchestrator.shutdown()
+    
+    try:
+        profile_mode('everything')
+        assert False, "unknown profile mode should be rejected"
+    except ValueError:
+        pass
+
+def test_cprofile_dump_and_extraction_metrics():
+    analyzer = ContractAnalyzer()
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['ANALYZER_PROFILE_DIR'] = directory
+        try:
+            result = analyze_bytes(analyzer, TEXT.encode('utf-8'), 'text/plain', profile='cprofile')
+        finally:
+            del os.environ['ANALYZER_PROFILE_DIR']
+        
+        assert list(result['profile']['stages'])[:2] == ['extract', 'parse']
+        stats = pstats.Stats(result['profile']['cprofile'])
+        assert any(name == '_assess_comprehensive_risks' for _, _, name in stats.stats)
+    
+    exported = metrics.render()
+    assert 'extraction_seconds_count{format="txt"}' in exported
+    assert 'analysis_stage_seconds_bucket{stage="summary",le="+Inf"}' in exported
+    assert '# TYPE analysis_requests_total counter' in exported
+
+def test_metrics_directory_sums_every_process():
+    from utils.metrics import MetricsRegistry
+    
+    with tempfile.TemporaryDirectory() as directory:
+        # Two registries sharing a directory stand in for two server processes
+        first, second = MetricsRegistry(directory, flush_interval=0.05), MetricsRegistry(directory, flush_interval=0.05)
+        for registry, seconds in ((first, 0.002), (second, 0.3)):
+            registry.counter('requests_total', 'Requests', ['route']).inc('/analyze')
+            registry.histogram('stage_seconds', 'Stage time', ['stage']).observe(seconds, 'risks')
+        second.counter('requests_total', 'Requests', ['route']).inc('/analyze', amount=2)
+        # Updates stay in memory; the files are written in the background
+        assert os.listdir(directory) == []
+        time.sleep(0.3)
+        
+        for exported in (first.render(), second.render()):
+            assert 'requests_total{route="/analyze"} 4.0' in exported
+            assert 'stage_seconds_count{stage="risks"} 2' in exported
+            assert 'stage_seconds_bucket{stage="risks",le="0.005"} 1' in exported
+            assert 'stage_seconds_bucket{stage="risks",le="+Inf"} 2' in exported
@@ -0,0 +1,72 @@
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.analyzer import ContractAnalyzer
+from core.search import ClauseIndex, _any_of, to_match_expression
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_contract.txt')
+
+RISKY = ("This vendor agreement covers the supply of goods. The Supplier accepts unlimited liability for all damages. "
+         "This agreement shall automatically renew each year unless cancelled. "
+         "The Buyer may terminate at its sole discretion without notice.")
+
+def test_index_and_rank_sentences_across_contracts():
+    analyzer = ContractAnalyzer()
+    with open(SAMPLE, encoding='utf-8') as f:
+        sample = analyzer.analyze_contract(f.read())
+    risky = analyzer.analyze_contract(RISKY)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        index = ClauseIndex(os.path.join(directory, 'clauses.db'))
+        index.add('sample', sample, name='sample_contract.txt')
+        index.add('risky', risky, name='risky.txt')
+        index.add('risky', risky, name='risky.txt')
+        assert index.document_count() == 2
+        
+        hits = index.search('unlimited liability')
+        assert [hit['doc_id'] for hit in hits] == ['risky']
+        assert 'liability' in hits[0]['clause_types'] and '[unlimited]' in hits[0]['snippet']
+        
+        renewals = index.documents(risk_type='auto_renewal', contract_type=risky['type'])
+        assert [document['doc_id'] for document in renewals] == ['risky']
+        assert {hit['doc_id'] for hit in index.search('arbitration OR "sole discretion"')} == {'sample', 'risky'}
+        
+        index.remove('risky')
+        assert index.search('unlimited liability') == []
+        try:
+            index.search()
+            assert False, "a search needs a query or a filter"
+        except ValueError:
+            pass
+
+def test_match_expression_quotes_everything_but_operators():
+    assert to_match_expression('unlimited liability OR auto-renewal "sole discretion"') == \
+        '"unlimited" "liability" OR "auto-renewal" "sole discretion"'
+
+def test_every_parsed_sentence_is_indexed_with_its_hit_categories():
+    analyzer = ContractAnalyzer()
+    text = RISKY + " Fee: see Annex 2. Invoices are sent by post to the registered office."
+    result = analyzer.analyze_contract(text)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        index = ClauseIndex(os.path.join(directory, 'clauses.db'))
+        index.add('reported', result)
+        assert index.search('registered office') == []
+        
+        index.add('parsed', result, document=analyzer.parse(text))
+        hits = index.search('registered office')
+        assert [hit['doc_id'] for hit in hits] == ['parsed']
+        # Too short for a clause, but the 'fee' keyword still tags it
+        fees = index.search(clause_type='payment')
+        assert [(hit['doc_id'], hit['text']) for hit in fees] == [('parsed', 'Fee: see Annex 2')]
+        renewals = index.search(risk_type='auto_renewal')
+        assert {hit['doc_id'] for hit in renewals} == {'reported', 'parsed'}
+
+def test_filter_values_escape_double_quotes():
+    assert _any_of('tags', ['obligation', 'say "no"']) == 'tags : ("obligation" OR "say ""no""")'
+    with tempfile.TemporaryDirectory() as directory:
+        index = ClauseIndex(os.path.join(directory, 'clauses.db'))
+        index.add('risky', ContractAnalyzer().analyze_contract(RISKY))
+        assert index.search(clause_type='liab"ility') == []
@@ -0,0 +1,117 @@
+import sys
+import os
+import socket
+import tempfile
+import threading
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import uvicorn
+from core.analyzer import ContractAnalyzer
+from core.search import ClauseIndex
+from core.service import create_app
+from utils.cache import AnalysisCache
+from utils.service_client import AnalysisServiceClient
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_contract.txt')
+
+def start_server(app):
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='warning'))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, thread, f"http://127.0.0.1:{port}"
+
+def wait_ready(client, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if client.ready()['ready']:
+            return
+        time.sleep(0.05)
+    raise AssertionError("service never became ready")
+
+def test_service_endpoints_match_in_process_analysis():
+    analyzer = ContractAnalyzer()
+    index = ClauseIndex(os.path.join(tempfile.mkdtemp(), 'clauses.db'))
+    app = create_app(analyzer_factory=lambda: analyzer, cache_factory=lambda: AnalysisCache(), preload=False,
+                     clause_index=index)
+    server, thread, url = start_server(app)
+    client = AnalysisServiceClient(url, timeout=30)
+    try:
+        wait_ready(client)
+        status = client.ready()
+        assert status['fingerprint'] == analyzer.fingerprint()
+        assert set(status['models']) == {'spacy', 'llm'}
+        
+        with open(SAMPLE, 'rb') as f:
+            data = f.read()
+        result = client.analyze(data, 'contract.txt', 'application/octet-stream')
+        assert result == analyzer.analyze_contract(data.decode('utf-8'))
+        assert client.analyze(b"", 'empty.txt', 'text/plain') is None
+        
+        compliance = client.check_compliance(data, 'contract.txt', 'text/plain')
+        assert compliance['compliance_score'].endswith('/4')
+        
+        assert set(client.templates()) == {'service_agreement', 'employment', 'vendor'}
+        assert client.template('missing') == {}
+        assert "Agreement between Acme" in client.render_template('service_agreement', {'client': 'Acme'})
+        
+        response = client.session.post(f"{url}/analyze", files={'file': ('scan.png', b'x', 'image/png')})
+        assert response.status_code == 415
+        
+        profiled = client.session.post(f"{url}/analyze?profile=timings", json={'text': data.decode('utf-8')}).json()
+        assert 'extract' in profiled['profile']['stages']
+        assert 'analysis_stage_seconds_count{stage="risks"}' in client.session.get(f"{url}/metrics").text
+        
+        assert client.search('arbitration')[0]['risk_types'] == ['arbitration_jurisdiction']
+        assert [document['name'] for document in client.search_documents(risk_type='arbitration_jurisdiction')] == ['contract.txt']
+        assert client.session.get(f"{url}/search").status_code == 400
+    finally:
+        server.should_exit = True
+        thread.join(5)
+
+def test_analyze_is_refused_until_models_are_loaded():
+    loading = threading.Event()
+    
+    def slow_analyzer():
+        loading.wait(5)
+        return ContractAnalyzer()
+    
+    app = create_app(analyzer_factory=slow_analyzer, cache_factory=lambda: AnalysisCache(), preload=False)
+    server, thread, url = start_server(app)
+    client = AnalysisServiceClient(url, timeout=30)
+    try:
+        assert client.ready()['ready'] is False
+        response = client.session.post(f"{url}/analyze", json={'text': "The tenant shall pay rent."})
+        assert response.status_code == 503
+        
+        loading.set()
+        wait_ready(client)
+        response = client.session.post(f"{url}/analyze", json={'text': "The tenant shall pay rent."})
+        assert response.json()['type'] == 'lease'
+    finally:
+        server.should_exit = True
+        thread.join(5)
+
+def test_text_bodies_obey_the_upload_limit():
+    app = create_app(analyzer_factory=ContractAnalyzer, cache_factory=lambda: AnalysisCache(), preload=False,
+                     max_upload_mb=1)
+    server, thread, url = start_server(app)
+    client = AnalysisServiceClient(url, timeout=30)
+    try:
+        wait_ready(client)
+        text = "The tenant shall pay rent. " * 40000
+        response = client.session.post(f"{url}/analyze", json={'text': text})
+        assert response.status_code == 413
+        # Chunked, so there is no Content-Length to refuse it by up front
+        body = ('{"text": "%s"}' % text).encode('utf-8')
+        response = client.session.post(f"{url}/analyze", data=iter([body]), headers={'Content-Type': 'application/json'})
+        assert response.status_code == 413
+        assert client.session.post(f"{url}/analyze", json={'text': "The tenant shall pay rent."}).json()['type'] == 'lease'
+    finally:
+        server.should_exit = True
+        thread.join(5)
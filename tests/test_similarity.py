@@ -0,0 +1,37 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.analyzer import ContractAnalyzer
+from core.similarity import TemplateSimilarity, collect_template_sections
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_contract.txt')
+
+def test_template_sections_are_merged_from_every_source():
+    sections = collect_template_sections()
+    assert set(sections) == {'service', 'employment', 'vendor'}
+    # 'Scope of Services' in service_agreement.md joins TemplateManager's 'scope'
+    assert 'scope_of_services' not in sections['service']
+    assert 'The Service Provider agrees to provide' in sections['service']['scope']
+    assert '[' not in sections['service']['payment']
+
+def test_similarity_reports_sections_by_content_and_batches():
+    with open(SAMPLE, encoding='utf-8') as f:
+        text = f.read()
+    analyzer = ContractAnalyzer()
+    result = analyzer.analyze_contract(text)
+    similarity = result['template_similarity']
+    assert result['type'] == 'service'
+    assert 0 < similarity['similarity_score'] <= 100
+    assert set(similarity['section_scores']) == set(analyzer.template_similarity.sections['service'])
+    assert set(similarity['missing_clauses']) <= set(similarity['section_scores'])
+
+    engine = TemplateSimilarity({'service': {'payment': "Fees are payable monthly by bank transfer.",
+                                             'confidentiality': "Confidential information shall not be disclosed."}})
+    clauses = {'payment': [{'text': "Fees are payable monthly."}], 'warranty': [{'text': "Goods carry a warranty."}]}
+    single = engine.score(["The client pays fees monthly by bank transfer."], clauses, 'service')
+    assert single['missing_clauses'] == ['confidentiality']
+    assert single['extra_clauses'] == ['warranty']
+    assert engine.score_many([(["The client pays fees monthly by bank transfer."], clauses, 'service'),
+                              ([], {}, 'lease')]) == [single, engine.score([], {}, 'lease')]
+    assert engine.score([], {}, 'lease')['similarity_score'] == 0
@@ -0,0 +1,64 @@
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from core.analyzer import ContractAnalyzer
+from core.batch import triage_many
+from core.triage import RuleTriage
+from synthetic import make_contract
+from utils.compliance import IndianComplianceChecker
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_contract.txt')
+
+def test_batch_scores_equal_the_per_document_rules():
+    analyzer = ContractAnalyzer()
+    analyzer.type_classifier = None
+    checker = IndianComplianceChecker()
+    with open(SAMPLE, encoding='utf-8') as f:
+        texts = [f.read(), "The tenant shall pay rent.", ""] + [make_contract(4 * 1024, seed=seed) for seed in range(20)]
+    
+    results = RuleTriage(analyzer, checker).triage(texts)
+    for text, result in zip(texts, results):
+        doc = analyzer.parse(text)
+        assert result['type'] == analyzer._classify_type(doc)
+        assert result['risk_levels'] == {name: risk['level'] for name, risk in analyzer._assess_comprehensive_risks(doc).items()}
+        assert result['summary_risk_context'] == analyzer._get_summary_risk_context(doc)
+        assert result['compliance'] == checker.check_compliance(text)
+    assert RuleTriage(analyzer).triage([]) == []
+
+def test_triage_many_reads_paths_in_chunks_and_reports_failures():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'lease.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("The landlord may terminate the lease. Disputes go to arbitration.")
+        results = list(triage_many([path, os.path.join(directory, 'missing.pdf'), "The employee salary is paid monthly."],
+                                   chunk_size=2))
+    assert [result.get('type') for result in results] == ['lease', None, 'employment']
+    assert 'error' in results[1]
+    assert results[0]['risk_levels'] == {'arbitration_jurisdiction': 'Medium'}
+
+def test_triage_many_reads_files_across_workers():
+    with tempfile.TemporaryDirectory() as directory:
+        items = []
+        for number in range(6):
+            path = os.path.join(directory, f'contract{number}.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("The landlord may terminate the lease." if number % 2 else "The employee salary is paid monthly.")
+            items += [path, "The supplier delivers the goods to the buyer."]
+        serial = list(triage_many(items, chunk_size=5))
+        parallel = list(triage_many(items, chunk_size=5, workers=2, chunksize=1))
+    assert parallel == serial
+    assert [result['type'] for result in parallel[:4]] == ['employment', 'vendor', 'lease', 'vendor']
+
+def test_scores_keep_the_occurrence_counts():
+    triage = RuleTriage()
+    text = "Arbitration first. Arbitration again. Arbitration in Delhi under the jurisdiction of its courts."
+    scores = triage.score([text])
+    assert scores['counts'][0, triage.vocabulary.index('arbitration')] == 3
+    
+    result = triage.triage([text])[0]
+    # Presence still decides the level; the counts give the mentions
+    assert result['risk_levels'] == {'arbitration_jurisdiction': 'High'}
+    assert result['risk_mentions'] == {'arbitration_jurisdiction': 4}
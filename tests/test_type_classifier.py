@@ -0,0 +1,63 @@
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.analyzer import ContractAnalyzer
+from core.type_classifier import ContractTypeClassifier, training_corpus
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_contract.txt')
+
+def test_bundled_model_classifies_batches_with_confidence():
+    classifier = ContractTypeClassifier.load()
+    assert classifier is not None
+    with open(SAMPLE, encoding='utf-8') as f:
+        sample = f.read()
+    texts = [sample, "The tenant shall pay rent to the landlord.", "The employee's salary is paid monthly."]
+    predictions = classifier.predict_batch(texts)
+    assert [contract_type for contract_type, _ in predictions] == ['service', 'lease', 'employment']
+    # Only types the analyzer has rules and templates for
+    assert set(classifier.classes) == set(ContractAnalyzer().contract_patterns)
+    assert all(0 < confidence <= 1 for _, confidence in predictions)
+    assert classifier.predict_batch([]) == []
+    assert ContractTypeClassifier.load('/nonexistent/model.npz') is None
+
+def test_trained_model_round_trips_and_keywords_remain_the_fallback():
+    texts, labels = training_corpus(documents_per_type=20)
+    classifier = ContractTypeClassifier.train(texts, labels)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'model.npz')
+        classifier.save(path)
+        loaded = ContractTypeClassifier.load(path)
+    assert loaded.fingerprint() == classifier.fingerprint()
+    assert loaded.predict_batch(texts[:50]) == classifier.predict_batch(texts[:50])
+    
+    analyzer = ContractAnalyzer()
+    analyzer.type_classifier = None
+    assert analyzer.classify_types(["The employee's salary is paid monthly."]) == [('employment', None)]
+
+def test_bundled_model_holds_on_the_held_out_contracts():
+    import json
+    from core.type_classifier import EVAL_PATH
+
+    analyzer = ContractAnalyzer()
+    with open(EVAL_PATH, encoding='utf-8') as f:
+        labelled = json.load(f)
+    texts = [text for texts in labelled.values() for text in texts]
+    expected = [label for label, texts in labelled.items() for _ in texts]
+    model = [contract_type for contract_type, _ in analyzer.type_classifier.predict_batch(texts)]
+    assert sum(a == b for a, b in zip(model, expected)) >= 0.9 * len(texts)
+    classified = [contract_type for contract_type, _ in analyzer.classify_types(texts)]
+    assert sum(a == b for a, b in zip(classified, expected)) >= 0.9 * len(texts)
+
+def test_unsure_predictions_fall_back_to_keywords():
+    nda = ("NON-DISCLOSURE AGREEMENT\nThe Receiving Party shall keep the Confidential Information disclosed by the "
+           "Disclosing Party secret and use it only to evaluate the proposed transaction.")
+    analyzer = ContractAnalyzer()
+    contract_type, confidence = analyzer.type_classifier.predict(nda)
+    assert confidence < analyzer.type_min_confidence
+    assert analyzer.classify_types([nda]) == [(analyzer._classify_type_by_keywords(analyzer.parse(nda)), None)]
+    assert analyzer._classify_type(analyzer.parse(nda)) == analyzer._classify_type_by_keywords(analyzer.parse(nda))
+    
+    analyzer.type_min_confidence = 0.0
+    assert analyzer.classify_types([nda]) == [(contract_type, confidence)]
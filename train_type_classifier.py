@@ -0,0 +1,45 @@
+"""Retrain the contract type classifier from data/contract_type_examples.json and
+the bundled templates, and save it where ContractAnalyzer and LegalAssistant load it.
+
+    python train_type_classifier.py
+    python train_type_classifier.py --output /tmp/contract_type_model.npz
+"""
+import argparse
+import json
+import os
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.type_classifier import EVAL_PATH, MODEL_PATH, ContractTypeClassifier, training_corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the contract type classifier")
+    parser.add_argument('--output', default=MODEL_PATH, help="where the .npz model is written")
+    parser.add_argument('--documents-per-type', type=int, default=200,
+                        help="synthetic documents assembled from each type's example sentences")
+    parser.add_argument('--C', type=float, default=10.0, help="inverse regularization strength")
+    args = parser.parse_args()
+
+    texts, labels = training_corpus(documents_per_type=args.documents_per_type)
+    classifier = ContractTypeClassifier.train(texts, labels, C=args.C)
+    classifier.save(args.output)
+
+    start = time.perf_counter()
+    predicted = classifier.predict_batch(texts)
+    elapsed = time.perf_counter() - start
+    accuracy = sum(label == prediction for label, (prediction, _) in zip(labels, predicted)) / len(labels)
+    print(f"Trained on {len(texts)} texts ({', '.join(classifier.classes)}): training accuracy {accuracy:.3f}, "
+          f"{len(texts) / elapsed:,.0f} docs/sec")
+    with open(EVAL_PATH, encoding='utf-8') as f:
+        held_out = [(text, label) for label, texts in json.load(f).items() for text in texts]
+    predicted = classifier.predict_batch([text for text, _ in held_out])
+    correct = sum(label == prediction for (_, label), (prediction, _) in zip(held_out, predicted))
+    print(f"Held-out accuracy {correct / len(held_out):.3f} ({correct}/{len(held_out)} contracts in {EVAL_PATH})")
+    print(f"Saved {args.output} ({os.path.getsize(args.output):,} bytes)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())